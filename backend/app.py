@@ -1,10 +1,12 @@
-from flask import Flask, send_from_directory
+from flask import Flask, send_from_directory, jsonify, request
 from flask_cors import CORS
 from dotenv import load_dotenv
 import os
-from spotipy.oauth2 import SpotifyClientCredentials
-import spotipy
-from flask_cors import CORS
+
+# services 모듈이 import 시점에 환경변수를 읽으므로 Blueprint import 전에 로드
+load_dotenv()
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+load_dotenv(os.path.join(BASE_DIR, ".env"))
 
 from routes.auth import auth_bp
 from routes.notice import notice_bp
@@ -12,12 +14,17 @@ from routes.user import user_bp
 from routes.playlist import playlist_bp          
 from routes.music_list import music_list_bp   
 from routes.music import music_bp   
+from services import spotify
+import db
+import db_async
+from db import PoolTimeout, get_pool_stats
+import query_stats
+import migrate
+from model import genre as genre_model
+from services import music as music_service
+from services import popularity_refresh as popularity_refresh_service
 
 
-load_dotenv()
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-load_dotenv(os.path.join(BASE_DIR, ".env"))
-
 app = Flask(__name__)
 CORS(app, resources={
     r"/*": {
@@ -28,6 +35,9 @@ CORS(app, resources={
 })
 
 
+# 요청 단위 DB 트랜잭션 (요청 끝에서 한 번 commit/rollback)
+db.init_app(app)
+
 # Blueprint 등록
 app.register_blueprint(auth_bp)
 app.register_blueprint(notice_bp)
@@ -36,12 +46,29 @@ app.register_blueprint(playlist_bp)
 app.register_blueprint(music_list_bp) 
 app.register_blueprint(music_bp)
 
-# Spotify 인증
-client_credentials_manager = SpotifyClientCredentials(
-    client_id=os.getenv('SPOTIFY_CLIENT_ID'),
-    client_secret=os.getenv('SPOTIFY_CLIENT_SECRET')
-)
-sp = spotipy.Spotify(client_credentials_manager=client_credentials_manager)
+# DB 스키마 버전 확인 (DB_AUTO_MIGRATE=true면 적용 안 된 마이그레이션 적용)
+try:
+    migrate.check_schema_version(os.getenv("DB_AUTO_MIGRATE", "false").lower() == "true")
+except Exception as e:
+    print(f"❌ DB 스키마 버전 확인 실패: {e}")
+
+# 장르 사전 미리 로드 (실패 시 첫 조회 때 다시 로드)
+try:
+    genre_model.load_genres()
+except Exception as e:
+    print(f"❌ 장르 사전 로드 실패: {e}")
+
+# 글로벌 Top 50 스냅샷 주기 갱신
+if os.getenv("TOP50_SCHEDULER_ENABLED", "true").lower() == "true":
+    music_service.start_top50_scheduler()
+
+# music 인기도 주기 갱신 (POPULARITY_REFRESH_INTERVAL초, 0이면 POST /music/popularity-refresh로만 실행)
+popularity_refresh_service.start_scheduler()
+
+# DB 연결 대기 시간 초과 → 워커를 붙잡지 않고 바로 503
+@app.errorhandler(PoolTimeout)
+def handle_pool_timeout(e):
+    return jsonify({"success": False, "message": "서버가 혼잡합니다. 잠시 후 다시 시도해주세요."}), 503
 
 # 기본 라우트
 @app.route('/')
@@ -90,7 +117,10 @@ def health():
             return {
                 'status': 'healthy',
                 'database': 'connected',
-                'spotify': sp is not None,
+                'spotify': spotify.is_configured(),
+                'spotify_rate_limiter': spotify.get_rate_limiter_stats(),
+                'db_pool': get_pool_stats(),
+                'db_async_pool': db_async.get_pool_stats(),  # ASGI 모드(asgi.py)에서만 값이 있음
                 'version': version['VERSION()']
             }, 200
         except Exception as e:
@@ -107,6 +137,15 @@ def health():
             'database': 'disconnected'
         }, 500
 
+@app.route('/health/queries')
+def health_queries():
+    """쿼리별 실행 통계 (총 소요 시간 순), ?limit=50"""
+    limit = request.args.get('limit', 50, type=int)
+    return {
+        'slow_ms': query_stats.QUERY_SLOW_MS,
+        'queries': query_stats.get_stats(limit),
+    }, 200
+
 if __name__ == '__main__':
     print("Test: http://localhost:5001/test")
     print("Health: http://localhost:5001/health")
@@ -0,0 +1,112 @@
+# asgi.py - ASGI 서버로 실행 (선택, requirements-async.txt)
+#
+# 실행:
+#   pip install -r requirements-async.txt
+#   uvicorn asgi:application --host 0.0.0.0 --port 5001 --workers 4
+#
+# - GET /music/search는 이벤트 루프에서 async로 처리
+#   (aiomysql + httpx: DB/Spotify 응답을 기다리는 동안 스레드를 잡지 않아 프로세스당 동시 요청 수가 늘어남)
+# - 나머지 요청은 app.py의 Flask 앱(같은 Blueprint)을 WSGI → ASGI로 감싸서 스레드 풀에서 처리
+# - aiomysql/httpx가 없거나 ASGI_ASYNC_ROUTES=false면 모든 요청을 Flask 앱으로 처리
+import os
+from urllib.parse import parse_qsl
+
+from a2wsgi import WSGIMiddleware
+
+from app import app
+from controllers import music_async as music_async_controller
+from db import PoolTimeout
+import db_async
+import query_stats
+from services import spotify_async
+
+ASGI_ASYNC_ROUTES = os.getenv("ASGI_ASYNC_ROUTES", "true").lower() == "true"
+# Flask 앱(WSGI)을 실행할 스레드 수 (워커 프로세스당)
+ASGI_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", 10))
+
+# (method, path) → (endpoint 이름, async 핸들러) / endpoint 이름은 Flask와 같게 (QUERY_BUDGETS 공유)
+ASYNC_ROUTES = {
+    ("GET", "/music/search"): ("music.search_music", music_async_controller.search_music),
+}
+
+
+def _query_args(scope):
+    """쿼리 문자열 → dict (같은 이름이 여러 번이면 Flask request.args.get처럼 첫 번째 값)"""
+    args = {}
+    for name, value in parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True):
+        args.setdefault(name, value)
+    return args
+
+
+class ListifyASGI:
+    """async 라우트는 직접 처리하고 나머지는 Flask 앱으로 넘기는 ASGI 앱"""
+
+    def __init__(self, flask_app, async_routes):
+        self.flask_app = flask_app
+        self.wsgi = WSGIMiddleware(flask_app, workers=ASGI_WSGI_THREADS)
+        self.async_routes = async_routes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] == "http":
+            route = self.async_routes.get((scope["method"], scope["path"]))
+            if route is not None:
+                await self._handle(scope, send, *route)
+                return
+        await self.wsgi(scope, receive, send)
+
+    async def _handle(self, scope, send, endpoint, handler):
+        with query_stats.count_queries() as counter:
+            try:
+                body, status = await handler(_query_args(scope))
+            except PoolTimeout:
+                body, status = {"success": False, "message": "서버가 혼잡합니다. 잠시 후 다시 시도해주세요."}, 503
+            except Exception as e:
+                print(f"❌ {scope['method']} {scope['path']} 처리 실패: {e}")
+                body, status = {"success": False, "message": str(e)}, 500
+
+        query_stats.report_request(counter, scope["method"], scope["path"], status, endpoint)
+
+        # Flask jsonify와 같은 JSON 형식 (날짜 등 직렬화 규칙 포함)
+        payload = (self.flask_app.json.dumps(body) + "\n").encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode()),
+                (b"access-control-allow-origin", b"*"),
+                (b"x-db-queries", str(counter.queries).encode()),
+                (b"x-db-checkouts", str(counter.checkouts).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": payload})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                try:
+                    await db_async.AsyncDatabaseManager.close()
+                    await spotify_async.aclose()
+                except Exception as e:
+                    print(f"❌ ASGI 종료 정리 실패: {e}")
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def _async_routes():
+    if not ASGI_ASYNC_ROUTES:
+        return {}
+    if not db_async.is_available() or not spotify_async.is_available():
+        print("⚠️ aiomysql/httpx가 없어 모든 요청을 Flask(WSGI)로 처리합니다. (pip install -r requirements-async.txt)")
+        return {}
+    print(f"✅ ASGI async 라우트: {', '.join(f'{m} {p}' for m, p in ASYNC_ROUTES)}")
+    return ASYNC_ROUTES
+
+
+application = ListifyASGI(app, _async_routes())
@@ -0,0 +1,261 @@
+# bench_ingest.py - 가져오기 경로별 처리량 / 단계별 지연 측정 (Spotify 계정 불필요)
+#
+# fake_spotify.py 서버를 띄우고 실제 가져오기 코드(services/music.py, seed_music.py)를 그대로 실행
+# 실행 예:
+#   python bench_ingest.py --count 500 --latency-ms 80 --jitter-ms 40
+#   python bench_ingest.py --paths bulk,bulk-pipelined --rate-429 0.05 --retry-after 1
+#   python bench_ingest.py --no-db     # DB 대신 메모리에 저장 (Spotify 쪽 처리만 측정)
+import argparse
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+import fake_spotify
+
+PATHS = ["search", "bulk", "bulk-pipelined", "top50", "playlist", "seed"]
+
+
+class StageTimer:
+    """단계별 소요 시간 기록"""
+
+    def __init__(self):
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self._lock:
+            self.samples.setdefault(name, []).append(seconds * 1000)
+
+    def wrap(self, name, func):
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name(*args) if callable(name) else name, time.perf_counter() - started)
+        return wrapper
+
+    def reset(self):
+        with self._lock:
+            self.samples = {}
+
+    def summary(self):
+        result = {}
+        for name, values in sorted(self.samples.items()):
+            values = sorted(values)
+            result[name] = {
+                "count": len(values),
+                "avg_ms": round(sum(values) / len(values), 1),
+                "p50_ms": round(_percentile(values, 50), 1),
+                "p95_ms": round(_percentile(values, 95), 1),
+                "max_ms": round(values[-1], 1),
+            }
+        return result
+
+
+def _percentile(values, p):
+    index = min(len(values) - 1, max(0, math.ceil(len(values) * p / 100) - 1))
+    return values[index]
+
+
+def _endpoint_name(self, method, url, *args):
+    path = url.split("?")[0].strip("/")
+    parts = path.split("/")
+    name = parts[0]
+    if len(parts) > 2:
+        name += "/" + parts[2]
+    return f"spotify {name}"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="가져오기 경로별 처리량 벤치마크")
+    parser.add_argument("--paths", default=",".join(PATHS), help=f"측정할 경로 ({', '.join(PATHS)})")
+    parser.add_argument("--count", type=int, default=200, help="경로별 목표 곡 수")
+    parser.add_argument("--search-size", type=int, default=12, help="search 경로 페이지 크기")
+    parser.add_argument("--rate-limit", type=float, default=1000, help="Spotify 초당 요청 한도 (SPOTIFY_RATE_LIMIT)")
+    parser.add_argument("--rate-burst", type=int, default=1000, help="Spotify 순간 요청 한도 (SPOTIFY_RATE_BURST)")
+    parser.add_argument("--warm", action="store_true", help="경로마다 아티스트 장르 캐시를 비우지 않음")
+    parser.add_argument("--no-db", action="store_true", help="DB 대신 메모리에 저장")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    fake_spotify.add_arguments(parser)
+    return parser.parse_args()
+
+
+def _use_memory_store(music_model, genre_model):
+    """--no-db: music/genre 저장을 메모리로 대체"""
+    store = {}
+    genres = {}
+    lock = threading.Lock()
+
+    def find_by_spotify_urls(urls):
+        with lock:
+            return {u: dict(store[u]) for u in urls if u in store}
+
+    def find_by_spotify_url(url):
+        with lock:
+            return store.get(url)
+
+    def insert_music_bulk(musics):
+        result = {}
+        inserted = set()
+        with lock:
+            for m in musics:
+                if m["spotify_url"] not in store:
+                    store[m["spotify_url"]] = dict(m, music_no=len(store) + 1)
+                    inserted.add(m["spotify_url"])
+                result[m["spotify_url"]] = dict(store[m["spotify_url"]])
+        return result, inserted
+
+    def insert_music(m):
+        row = insert_music_bulk([m])[0].get(m["spotify_url"])
+        return row and row["music_no"]
+
+    def find_genre_no_by_name(name):
+        with lock:
+            return genres.setdefault(name, len(genres) + 1)
+
+    music_model.find_by_spotify_urls = find_by_spotify_urls
+    music_model.find_by_spotify_url = find_by_spotify_url
+    music_model.insert_music_bulk = insert_music_bulk
+    music_model.insert_music = insert_music
+    genre_model.find_genre_no_by_name = find_genre_no_by_name
+    return store
+
+
+def main():
+    args = parse_args()
+    paths = [p.strip() for p in args.paths.split(",") if p.strip()]
+    unknown = set(paths) - set(PATHS)
+    if unknown:
+        raise SystemExit(f"알 수 없는 경로: {', '.join(sorted(unknown))}")
+
+    config = fake_spotify.config_from_args(args)
+    server, base_url = fake_spotify.start_server(config)
+
+    # services 모듈은 import 시점에 환경변수를 읽으므로 import 전에 설정
+    os.environ["SPOTIFY_API_URL"] = f"{base_url}/v1/"
+    os.environ["SPOTIFY_TOKEN_URL"] = f"{base_url}/api/token"
+    os.environ["SPOTIFY_TOKEN_CACHE"] = os.path.join(tempfile.mkdtemp(), ".cache")
+    os.environ["SPOTIFY_RATE_LIMIT"] = str(args.rate_limit)
+    os.environ["SPOTIFY_RATE_BURST"] = str(args.rate_burst)
+    os.environ["SPOTIFY_RATE_LIMIT_BACKEND"] = "memory"
+    os.environ["TOP50_SCHEDULER_ENABLED"] = "false"
+    os.environ.setdefault("SPOTIFY_CLIENT_ID", "bench")
+    os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "bench")
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    from model import music as music_model
+    from model import genre as genre_model
+    from services import music as music_service
+    from services import music_common
+    from services import spotify as spotify_service
+    import seed_music
+
+    if args.no_db:
+        _use_memory_store(music_model, genre_model)
+
+    timer = StageTimer()
+    client_cls = spotify_service.RateLimitedSpotify
+    client_cls._internal_call = timer.wrap(_endpoint_name, client_cls._internal_call)
+    limiter = spotify_service.rate_limiter
+    limiter.acquire = timer.wrap("rate limit wait", limiter.acquire)
+    for name in ("find_by_spotify_urls", "insert_music_bulk", "find_by_spotify_url", "insert_music"):
+        setattr(music_model, name, timer.wrap(f"db {name}", getattr(music_model, name)))
+    music_service.resolve_artist_genres = timer.wrap("genre enrich", music_service.resolve_artist_genres)
+
+    run_id = uuid.uuid4().hex[:8]
+    count = args.count
+
+    def run_search():
+        tracks = 0
+        for i in range(math.ceil(count / args.search_size)):
+            musics, _ = music_service._search_spotify_and_save(
+                f"bench {run_id} search {i}", None, 1, args.search_size
+            )
+            tracks += len(musics)
+        return tracks
+
+    def run_bulk(pipelined):
+        musics, error = music_service.bulk_import_music(f"bench {run_id} bulk {pipelined}", count, pipelined)
+        if error:
+            raise RuntimeError(error)
+        return len(musics)
+
+    def run_top50():
+        tracks = 0
+        for _ in range(math.ceil(count / 50)):
+            snapshot, error = music_service.refresh_global_top_50(force=True)
+            if error:
+                raise RuntimeError(error)
+            tracks += len(snapshot["musics"])
+        return tracks
+
+    def run_playlist():
+        return sum(page["fetched"] for page in music_service.import_playlist(f"fake-{count}"))
+
+    def run_seed():
+        results = seed_music.seed(count, checkpoint_path=None, fresh=True, query_suffix=run_id)
+        return sum(results.values())
+
+    runners = {
+        "search": run_search,
+        "bulk": lambda: run_bulk(False),
+        "bulk-pipelined": lambda: run_bulk(True),
+        "top50": run_top50,
+        "playlist": run_playlist,
+        "seed": run_seed,
+    }
+
+    results = []
+    for path in paths:
+        if not args.warm:
+            music_common.artist_genre_cache.clear()
+        timer.reset()
+        requests_before, throttled_before = config.requests, config.throttled
+
+        started = time.perf_counter()
+        error = None
+        try:
+            tracks = runners[path]()
+        except Exception as e:
+            tracks, error = 0, str(e)
+        elapsed = time.perf_counter() - started
+
+        results.append({
+            "path": path,
+            "tracks": tracks,
+            "seconds": round(elapsed, 3),
+            "tracks_per_sec": round(tracks / elapsed, 1) if elapsed else 0,
+            "spotify_requests": config.requests - requests_before,
+            "spotify_429": config.throttled - throttled_before,
+            "error": error,
+            "stages": timer.summary(),
+        })
+
+    server.shutdown()
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"🎵 가져오기 벤치마크 (count={count}, latency={args.latency_ms}ms±{args.jitter_ms}ms,"
+          f" 429={args.rate_429}, db={'memory' if args.no_db else 'mysql'})")
+    for r in results:
+        print("\n" + "=" * 72)
+        status = f"❌ {r['error']}" if r["error"] else "✅"
+        print(f"{status} {r['path']}: {r['tracks']}곡 / {r['seconds']}s = {r['tracks_per_sec']} tracks/s"
+              f" (Spotify 요청 {r['spotify_requests']}회, 429 {r['spotify_429']}회)")
+        print(f"  {'stage':30} {'count':>6} {'avg':>9} {'p50':>9} {'p95':>9} {'max':>9}")
+        for name, s in r["stages"].items():
+            print(f"  {name:30} {s['count']:>6} {s['avg_ms']:>7}ms {s['p50_ms']:>7}ms"
+                  f" {s['p95_ms']:>7}ms {s['max_ms']:>7}ms")
+
+
+if __name__ == "__main__":
+    main()
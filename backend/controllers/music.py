@@ -1,29 +1,46 @@
-from flask import request, jsonify
+from flask import request, jsonify, make_response, Response, stream_with_context
 from services import music as music_service
+from services import import_job as import_job_service
+from services import popularity_refresh as popularity_refresh_service
+from services.spotify import SpotifyRateLimited
+from controllers.streaming import stream_format, stream_response
+import db
+import json
+import os
+
+# Top 50 응답 브라우저 캐시 시간(초)
+TOP50_MAX_AGE = int(os.getenv("TOP50_MAX_AGE", 300))
 
 
 def search_music():
     keyword = request.args.get('q')
     category = request.args.get('category')
+    source = request.args.get('source', 'auto')
 
     page = int(request.args.get('page', 1))
     size = int(request.args.get('size', 12))
 
     if not keyword:
         return jsonify({"success": False, "message": "검색어(q)가 필요합니다."}), 400
+    if source not in ("auto", "local", "spotify"):
+        return jsonify({"success": False, "message": "source는 auto, local, spotify 중 하나여야 합니다."}), 400
 
-    musics, total, error = music_service.search_and_save_music(
-        keyword, category, page, size
+    # Spotify 검색(요청 한도 대기 포함) 동안 DB 연결/트랜잭션을 잡고 있지 않도록 model 함수마다 commit
+    db.use_own_transactions()
+    musics, total, source, error = music_service.search_music(
+        keyword, category, page, size, source
     )
     if error:
-        return jsonify({"success": False, "message": error}), 500
+        status = 429 if isinstance(error, SpotifyRateLimited) else 500
+        return jsonify({"success": False, "message": str(error)}), status
 
     return jsonify({
         "success": True,
         "data": musics,
         "page": page,
         "size": size,
-        "total": total
+        "total": total,
+        "source": source
     }), 200
 
 
@@ -31,43 +48,132 @@ def get_music_list():
     category = request.args.get('category')
     value = request.args.get('value')
 
-    musics, error = music_service.get_music_list(category, value)
+    # ?stream=json|ndjson: 페이지 없이 전체 목록 스트리밍 (내보내기용)
+    fmt = stream_format()
+    if fmt:
+        return stream_response(music_service.iter_music_list(category, value), fmt)
+
+    cursor = request.args.get('cursor')
+    limit = request.args.get('limit')
+
+    musics, next_cursor, error = music_service.get_music_list(category, value, cursor, limit)
     if error:
         return jsonify({"success": False, "message": error}), 400
 
-    return jsonify({"success": True, "data": musics}), 200
+    return jsonify({"success": True, "data": musics, "next": next_cursor}), 200
 
 
 def get_global_top_50():
-    musics, error = music_service.get_global_top_50()
+    # 스냅샷이 없으면 이 요청에서 Spotify 조회 + 저장 (검색과 같은 이유로 model 함수마다 commit)
+    db.use_own_transactions()
+    snapshot, error = music_service.get_global_top_50()
     if error:
-        return jsonify({"success": False, "message": error}), 500
+        status = 429 if isinstance(error, SpotifyRateLimited) else 500
+        return jsonify({"success": False, "message": str(error)}), status
 
+    # 스냅샷이 바뀌지 않았으면 본문 없이 304
+    etag = snapshot["snapshot_id"]
+    cache_control = f"public, max-age={TOP50_MAX_AGE}"
+    if etag and request.if_none_match.contains_weak(etag):
+        response = make_response("", 304)
+        response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = cache_control
+        return response
+
+    musics = snapshot["musics"]
     new_count = sum(1 for m in musics if m.get('is_new'))
-    
-    return jsonify({
+
+    response = jsonify({
         "success": True,
         "message": f"총 {len(musics)}곡 (신규 {new_count}곡 저장)",
         "data": musics
-    }), 200
-    
+    })
+    if etag:
+        response.set_etag(etag, weak=True)
+    response.headers["Cache-Control"] = cache_control
+    return response, 200
+
+
 def bulk_import():
-    data = request.get_json()
-    query = data.get('query', 'kpop')
+    """대량 가져오기 작업 등록 → job_id 바로 반환 (진행 상황은 GET /music/bulk-import/<job_id>)"""
+    data = request.get_json(silent=True) or {}
+    queries = data.get('queries') or [data.get('query', 'kpop')]
     count = data.get('count', 100)
-    
-    if count > 200:
-        return jsonify({"success": False, "message": "최대 200개까지 가능합니다."}), 400
-    
-    musics, error = music_service.bulk_import_music(query, count)
+    pipelined = data.get('pipelined')
+
+    if isinstance(queries, str):
+        queries = [queries]
+    if not isinstance(count, int):
+        return jsonify({"success": False, "message": "count는 숫자여야 합니다."}), 400
+
+    job, error = import_job_service.submit_bulk_import(queries, count, pipelined)
     if error:
-        return jsonify({"success": False, "message": error}), 500
-    
-    new_count = sum(1 for m in musics if m.get('is_new'))
-    
+        return jsonify({"success": False, "message": error}), 400
+
     return jsonify({
         "success": True,
-        "message": f"총 {len(musics)}곡 가져옴 (신규 {new_count}곡 저장)",
-        "data": musics
-    }), 200
+        "message": f"가져오기 작업이 등록되었습니다. (최대 {count}곡)",
+        "data": job
+    }), 202
+
+
+def get_bulk_import_job(job_id):
+    job, error = import_job_service.get_job(job_id)
+    if error:
+        return jsonify({"success": False, "message": error}), 404
+
+    return jsonify({"success": True, "data": job}), 200
+
+
+def import_playlist(playlist_id):
+    """
+    Spotify 플레이리스트 가져오기
+    - 기본: 페이지마다 저장 결과/소요 시간을 NDJSON 한 줄씩 스트리밍
+    - ?mode=job: 백그라운드 작업으로 등록 (진행 상황은 GET /music/bulk-import/<job_id>)
+    """
+    if request.args.get('mode') == 'job':
+        job, error = import_job_service.submit_playlist_import(playlist_id)
+        if error:
+            return jsonify({"success": False, "message": error}), 400
+        return jsonify({"success": True, "data": job}), 202
+
+    # 페이지마다 바로 저장 (요청 끝까지 트랜잭션을 붙잡지 않음)
+    db.use_own_transactions()
+
+    def generate():
+        total = {"pages": 0, "fetched": 0, "new": 0, "duplicate": 0}
+        try:
+            for page in music_service.import_playlist(playlist_id):
+                total["pages"] += 1
+                for key in ("fetched", "new", "duplicate"):
+                    total[key] += page[key]
+                yield json.dumps(page, ensure_ascii=False) + "\n"
+        except Exception as e:
+            yield json.dumps({"success": False, "message": str(e), **total}, ensure_ascii=False) + "\n"
+            return
+        yield json.dumps({"success": True, **total}, ensure_ascii=False) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+def refresh_popularity():
+    """
+    인기도 갱신 작업 시작 → 바로 반환 (진행 상황은 GET /music/popularity-refresh)
+    - 중단된 작업이 있으면 체크포인트부터 이어서 실행 (resume=false면 처음부터)
+    """
+    data = request.get_json(silent=True) or {}
+    resume = data.get('resume', True) is not False
+
+    runs, error = popularity_refresh_service.submit_refresh(resume)
+    if error:
+        return jsonify({"success": False, "message": error}), 500
+
+    return jsonify({"success": True, "message": "인기도 갱신 작업이 등록되었습니다.", "data": runs}), 202
+
+
+def get_popularity_refresh_runs():
+    runs, error = popularity_refresh_service.get_runs()
+    if error:
+        return jsonify({"success": False, "message": error}), 500
 
+    return jsonify({"success": True, "data": runs}), 200
@@ -0,0 +1,34 @@
+# controllers.music 검색의 async 버전 (ASGI 모드, asgi.py에서 호출)
+# - Flask request 대신 쿼리 문자열 dict를 받고, (응답 body, 상태 코드)를 반환
+from services import music_async as music_service
+from services.spotify import SpotifyRateLimited
+
+
+async def search_music(args):
+    keyword = args.get('q')
+    category = args.get('category')
+    source = args.get('source', 'auto')
+
+    page = int(args.get('page', 1))
+    size = int(args.get('size', 12))
+
+    if not keyword:
+        return {"success": False, "message": "검색어(q)가 필요합니다."}, 400
+    if source not in ("auto", "local", "spotify"):
+        return {"success": False, "message": "source는 auto, local, spotify 중 하나여야 합니다."}, 400
+
+    musics, total, source, error = await music_service.search_music(
+        keyword, category, page, size, source
+    )
+    if error:
+        status = 429 if isinstance(error, SpotifyRateLimited) else 500
+        return {"success": False, "message": str(error)}, status
+
+    return {
+        "success": True,
+        "data": musics,
+        "page": page,
+        "size": size,
+        "total": total,
+        "source": source
+    }, 200
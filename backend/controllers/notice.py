@@ -1,5 +1,6 @@
 from flask import request, jsonify
 from services import notice as notice_svc
+from controllers.streaming import stream_format, stream_response
 from middleware.auth_utils import require_admin
 
 
@@ -80,6 +81,11 @@ def delete_notice(notice_no: int):
 # 공지사항 리스트 조회 (USER/ADMIN 모두)
 def get_notice_list():
     try:
+        # ?stream=json|ndjson: 전체 목록을 한 행씩 스트리밍
+        fmt = stream_format()
+        if fmt:
+            return stream_response(notice_svc.iter_notice_list(), fmt)
+
         notices, error = notice_svc.get_notice_list()
         if error:
             return jsonify({"success": False, "message": error}), 500
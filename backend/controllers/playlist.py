@@ -1,5 +1,6 @@
 from flask import request, jsonify
 from services import playlist as playlist_svc
+from controllers.streaming import stream_format, stream_response
 from middleware.auth_utils import require_auth
 
 
@@ -95,6 +96,11 @@ def delete_playlist(playlist_no: int):
 # 전체 플레이리스트 목록 조회
 def get_playlist_list():
     try:
+        # ?stream=json|ndjson: 전체 목록을 한 행씩 스트리밍
+        fmt = stream_format()
+        if fmt:
+            return stream_response(playlist_svc.iter_playlist_list(), fmt)
+
         playlists, error = playlist_svc.get_playlist_list()
         if error:
             return jsonify({"success": False, "message": error}), 500
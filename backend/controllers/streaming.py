@@ -0,0 +1,86 @@
+from flask import request, Response, stream_with_context
+import itertools
+import json
+import os
+
+# 한 번에 내보낼 최대 바이트 (행마다 보내면 chunk가 너무 잘게 쪼개짐)
+STREAM_CHUNK_BYTES = int(os.getenv("STREAM_CHUNK_BYTES", 32 * 1024))
+
+STREAM_FORMATS = ("json", "ndjson")
+
+
+def stream_format():
+    """?stream=json|ndjson (또는 Accept: application/x-ndjson), 스트리밍 요청이 아니면 None"""
+    fmt = request.args.get('stream')
+    if fmt in ("1", "true"):
+        fmt = "json"
+    if fmt is None and request.accept_mimetypes.best == "application/x-ndjson":
+        fmt = "ndjson"
+    return fmt if fmt in STREAM_FORMATS else None
+
+
+def _dumps(row):
+    return json.dumps(row, ensure_ascii=False, default=str)
+
+
+def _chunked(parts):
+    buffer = []
+    size = 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= STREAM_CHUNK_BYTES:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def _json_array(rows):
+    """
+    {"data": [...], "success": true} 형태로 한 행씩 출력
+    - 중간에 실패하면 배열을 닫고 "success": false와 메시지를 붙임 (이미 200으로 응답 중이므로)
+    """
+    yield '{"data": ['
+    count = 0
+    try:
+        for row in rows:
+            yield ("," if count else "") + _dumps(row)
+            count += 1
+    except Exception as e:
+        yield f'], "count": {count}, "success": false, "message": {_dumps(str(e))}}}'
+        return
+    yield f'], "count": {count}, "success": true}}'
+
+
+def _ndjson(rows):
+    """한 행에 한 줄, 마지막 줄은 {"success": ..., "count": ...}"""
+    count = 0
+    try:
+        for row in rows:
+            yield _dumps(row) + "\n"
+            count += 1
+    except Exception as e:
+        yield _dumps({"success": False, "count": count, "message": str(e)}) + "\n"
+        return
+    yield _dumps({"success": True, "count": count}) + "\n"
+
+
+def stream_response(rows, fmt="json"):
+    """
+    rows(generator)를 메모리에 모으지 않고 chunked 응답으로 출력
+    - json: 하나의 JSON 문서 (기존 목록 응답과 같은 data 배열)
+    - ndjson: 한 줄에 한 행
+    - 첫 행은 여기서 미리 읽음 (연결/쿼리 오류는 스트리밍 시작 전에 예외로 올라가 상태 코드로 응답)
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is not None:
+        rows = itertools.chain([first], rows)
+
+    if fmt == "ndjson":
+        body, mimetype = _ndjson(rows), "application/x-ndjson"
+    else:
+        body, mimetype = _json_array(rows), "application/json"
+    return Response(stream_with_context(_chunked(body)), mimetype=mimetype)
@@ -1,44 +1,455 @@
 import pymysql
 import os
+import threading
+import time
 from dotenv import load_dotenv
 from dbutils.pooled_db import PooledDB
+from flask import g, has_request_context, request
+import query_stats
+
+# Connection Pool 설정
+# - DB_POOL_MAX: 최대 연결 수 (워커 프로세스당)
+# - DB_POOL_MIN_CACHED / DB_POOL_MAX_CACHED: 미리 만들어 둘 / 최대로 보관할 유휴 연결 수
+# - DB_POOL_TIMEOUT: 모든 연결이 사용 중일 때 기다리는 최대 시간(초), 넘으면 PoolTimeout
+# - DB_POOL_PING: 연결을 꺼낼 때 ping으로 끊긴 연결을 다시 연결 (0: 안 함, 1: 꺼낼 때, 7: 항상)
+DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', 10))
+DB_POOL_MIN_CACHED = int(os.getenv('DB_POOL_MIN_CACHED', 2))
+DB_POOL_MAX_CACHED = int(os.getenv('DB_POOL_MAX_CACHED', 5))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 5))
+DB_POOL_PING = int(os.getenv('DB_POOL_PING', 1))
+
+# 읽기 전용 복제본 (DB_REPLICA_HOST가 없으면 모든 조회를 primary에서 처리)
+# - 포트/계정/DB 이름은 지정하지 않으면 primary 설정을 그대로 사용
+DB_REPLICA_HOST = os.getenv('DB_REPLICA_HOST')
+DB_REPLICA_POOL_MAX = int(os.getenv('DB_REPLICA_POOL_MAX', DB_POOL_MAX))
+
+
+class PoolTimeout(Exception):
+    """DB_POOL_TIMEOUT 안에 연결을 받지 못함"""
+
+
+class PoolStats:
+    """연결 대기 시간 / 사용 중 연결 수 / 타임아웃 횟수"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def checked_out(self, wait):
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def timed_out(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def returned(self):
+        with self._lock:
+            self.in_use -= 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "in_use": self.in_use,
+                "max_in_use": self.max_in_use,
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 2) if self.checkouts else 0,
+                "wait_max_ms": round(self.wait_max * 1000, 2),
+            }
+
+
+class PooledConnection:
+    """Pool 연결 래퍼: close() 할 때 사용 중 슬롯 반환 (두 번 호출해도 한 번만)"""
+
+    def __init__(self, conn, release):
+        self._conn = conn
+        self._release = release
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, caller=None):
+        """실행 시간/행 수가 기록되는 커서 (query_stats)"""
+        server_side = bool(args) and issubclass(args[0], pymysql.cursors.SSCursor)
+        return query_stats.InstrumentedCursor(self._conn.cursor(*args), self._conn, caller, server_side)
+
+    def close(self):
+        if self._release is None:
+            return
+        release, self._release = self._release, None
+        try:
+            self._conn.close()
+        finally:
+            release()
+
+    def __del__(self):
+        # close() 없이 버려진 연결도 슬롯 반환
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """PooledDB + 타임아웃 있는 대기 + 통계 (primary / replica 각각 하나씩)"""
+
+    def __init__(self, name, max_connections, **connect_kwargs):
+        self.name = name
+        self.max_connections = max_connections
+        self.connect_kwargs = connect_kwargs
+        self.stats = PoolStats()
+        self._pool = None
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+
+    def get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # 대기는 _slots에서 타임아웃과 함께 처리하므로 PooledDB 자체는 blocking=False
+                self._pool = PooledDB(
+                    creator=pymysql,
+                    maxconnections=self.max_connections,
+                    mincached=min(DB_POOL_MIN_CACHED, self.max_connections),
+                    maxcached=min(DB_POOL_MAX_CACHED, self.max_connections),
+                    blocking=False,
+                    ping=DB_POOL_PING,
+                    cursorclass=pymysql.cursors.DictCursor,
+                    autocommit=False,
+                    **self.connect_kwargs
+                )
+                print(f"✅ DB Connection Pool 생성 완료 ({self.name}, max={self.max_connections},"
+                      f" timeout={DB_POOL_TIMEOUT}s)")
+        return self._pool
+
+    def connection(self, timeout=None):
+        """
+        Pool에서 연결 가져오기
+        - 모든 연결이 사용 중이면 timeout(기본 DB_POOL_TIMEOUT)초까지 기다린 뒤 PoolTimeout
+        """
+        pool = self.get_pool()
+        timeout = DB_POOL_TIMEOUT if timeout is None else timeout
+
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=timeout):
+            self.stats.timed_out()
+            raise PoolTimeout(
+                f"DB 연결 대기 시간 초과 ({self.name}, {timeout}s, 최대 {self.max_connections}개 사용 중)"
+            )
+        try:
+            conn = pool.connection()
+        except Exception:
+            self._slots.release()
+            raise
+
+        self.stats.checked_out(time.perf_counter() - started)
+        query_stats.count_checkout()
+        return PooledConnection(conn, self._release)
+
+    def _release(self):
+        self.stats.returned()
+        self._slots.release()
+
+    def get_stats(self):
+        stats = self.stats.snapshot()
+        stats["max"] = self.max_connections
+        stats["idle"] = len(getattr(self._pool, "_idle_cache", None) or [])
+        return stats
+
 
 class DatabaseManager:
-    """싱글톤 패턴의 DB Connection Pool 관리자"""
-    _pool = None
-    _initialized = False
-    
+    """싱글톤 패턴의 DB Connection Pool 관리자 (primary + 선택적 replica)"""
+    _primary = None
+    _replica = None
+    _lock = threading.Lock()
+
     @classmethod
-    def get_pool(cls):
-        if cls._pool is None:
-            cls._pool = PooledDB(
-                creator=pymysql,
-                maxconnections=10,
-                mincached=2,
-                maxcached=5,
-                blocking=True,
+    def _create_pools(cls):
+        with cls._lock:
+            if cls._primary is not None:
+                return
+            primary = dict(
                 host=os.getenv('DB_HOST', 'localhost'),
                 port=int(os.getenv('DB_PORT', 3306)),
                 user=os.getenv('DB_USER', 'root'),
                 password=os.getenv('DB_PASSWORD', ''),
                 database=os.getenv('DB_DATABASE', 'listify'),
-                cursorclass=pymysql.cursors.DictCursor,
-                autocommit=False
             )
-            if not cls._initialized:
-                print("✅ DB Connection Pool 생성 완료")
-                cls._initialized = True
-        return cls._pool
-    
+            if DB_REPLICA_HOST:
+                cls._replica = ConnectionPool(
+                    "replica",
+                    DB_REPLICA_POOL_MAX,
+                    host=DB_REPLICA_HOST,
+                    port=int(os.getenv('DB_REPLICA_PORT', primary['port'])),
+                    user=os.getenv('DB_REPLICA_USER', primary['user']),
+                    password=os.getenv('DB_REPLICA_PASSWORD', primary['password']),
+                    database=os.getenv('DB_REPLICA_DATABASE', primary['database']),
+                )
+            cls._primary = ConnectionPool("primary", DB_POOL_MAX, **primary)
+
+    @classmethod
+    def get_pool(cls):
+        cls._create_pools()
+        return cls._primary.get_pool()
+
+    @classmethod
+    def get_connection(cls, timeout=None):
+        """Connection Pool(primary)에서 연결 가져오기"""
+        cls._create_pools()
+        return cls._primary.connection(timeout)
+
+    @classmethod
+    def has_replica(cls):
+        cls._create_pools()
+        return cls._replica is not None
+
     @classmethod
-    def get_connection(cls):
-        """Connection Pool에서 연결 가져오기"""
-        return cls.get_pool().connection()
+    def get_read_connection(cls, timeout=None):
+        """replica에서 연결 가져오기 (replica가 없거나 연결에 실패하면 primary)"""
+        cls._create_pools()
+        if cls._replica is None:
+            return cls._primary.connection(timeout)
+        try:
+            return cls._replica.connection(timeout)
+        except Exception as e:
+            print(f"❌ replica 연결 실패, primary 사용: {e}")
+            return cls._primary.connection(timeout)
+
+    @classmethod
+    def get_stats(cls):
+        cls._create_pools()
+        stats = cls._primary.get_stats()
+        if cls._replica is not None:
+            stats["replica"] = cls._replica.get_stats()
+        return stats
+
+
+class RolledBack(Exception):
+    """요청 중 model 함수가 rollback()해서 이 요청의 변경 사항이 저장되지 않음"""
+
+
+class UnitOfWork:
+    """
+    요청 단위 트랜잭션: 요청 안의 model 함수들이 연결 하나를 같이 사용
+    - 처음 get_connection() 할 때 Pool에서 꺼내고, 요청이 끝날 때 한 번 commit/rollback 후 반환
+    - model 함수 안의 commit()/close()는 아무 일도 하지 않음
+    - rollback()은 바로 rollback하고(앞서 한 변경도 같이 취소됨), 요청 끝에서 commit 대신 RolledBack
+    - after_commit 콜백은 commit이 성공한 뒤에만 실행
+    """
+
+    def __init__(self, checkout=None):
+        self.conn = None
+        self.rollback_only = False
+        self.after_commit = []
+        self._checkout = checkout or DatabaseManager.get_connection
+
+    def connection(self):
+        if self.conn is None:
+            self.conn = self._checkout()
+        return RequestConnection(self)
+
+    def finish(self, commit=True):
+        callbacks, self.after_commit = self.after_commit, []
+        if self.conn is None:
+            return
+        conn, self.conn = self.conn, None
+        try:
+            if commit and not self.rollback_only:
+                conn.commit()
+            else:
+                conn.rollback()
+        finally:
+            conn.close()
+        if commit and self.rollback_only:
+            raise RolledBack("요청 처리 중 저장이 취소되었습니다.")
+        if not commit:
+            return
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"❌ commit 후 처리 실패: {e}")
+
+
+class RequestConnection:
+    """UnitOfWork 연결을 model 함수에 넘겨줄 때 쓰는 래퍼"""
+
+    def __init__(self, unit):
+        self._unit = unit
+
+    def __getattr__(self, name):
+        return getattr(self._unit.conn, name)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self._unit.rollback_only = True
+        self._unit.conn.rollback()
+
+    def close(self):
+        pass
+
+
+def get_connection(read_only=False):
+    """
+    외부에서 사용할 통합 연결 함수
+    - Flask 요청 안에서는 요청 단위 연결(UnitOfWork), 그 밖(스크립트/백그라운드 작업)에서는 Pool 연결
+    - read_only=True: 조회만 하는 model 함수용, replica가 있으면 replica 사용
+      (같은 요청에서 이미 쓰기를 했으면 방금 쓴 내용이 보이도록 primary 사용)
+    """
+    if not has_request_context() or g.get("db_own_transactions"):
+        if read_only:
+            return DatabaseManager.get_read_connection()
+        return DatabaseManager.get_connection()
+
+    if read_only and DatabaseManager.has_replica() and not g.get("db_wrote"):
+        unit = g.get("db_read_unit")
+        if unit is None:
+            unit = g.db_read_unit = UnitOfWork(DatabaseManager.get_read_connection)
+        return unit.connection()
+
+    if not read_only:
+        g.db_wrote = True
+    unit = g.get("db_unit")
+    if unit is None:
+        unit = g.db_unit = UnitOfWork()
+    return unit.connection()
+
+
+def after_commit(callback):
+    """
+    지금까지의 쓰기가 commit된 뒤 callback 실행 (워커 메모리 캐시 반영 등)
+    - 요청 단위 연결(UnitOfWork)로 쓰는 중이면 요청 끝 commit이 성공한 뒤, rollback되면 실행하지 않음
+    - 그 밖(스크립트/백그라운드 작업, use_own_transactions)에서는 model 함수가 이미 commit했으므로 바로 실행
+    """
+    unit = None
+    if has_request_context() and not g.get("db_own_transactions"):
+        unit = g.get("db_unit")
+    if unit is None:
+        callback()
+    else:
+        unit.after_commit.append(callback)
+
+
+def stream_query(sql, params=None, read_only=True):
+    """
+    서버 측 커서(SSDictCursor)로 한 행씩 읽는 generator (대량 목록 스트리밍용)
+    - 결과 전체를 메모리에 올리지 않음
+    - 요청 단위 연결과 별도의 연결을 사용 (스트리밍 중에도 다른 쿼리를 실행할 수 있도록)
+    - 중간에 멈추면 남은 행을 읽어 버린 뒤 연결 반환
+    """
+    # 실제 실행은 나중에(응답을 보낼 때) 일어나므로 호출한 model 함수는 지금 기록
+    caller = query_stats.find_caller()
+    use_primary = not read_only or (has_request_context() and g.get("db_wrote"))
+    return _stream_rows(sql, params, use_primary, caller)
+
+
+def _stream_rows(sql, params, use_primary, caller):
+    if use_primary:
+        conn = DatabaseManager.get_connection()
+    else:
+        conn = DatabaseManager.get_read_connection()
+    try:
+        with conn.cursor(pymysql.cursors.SSDictCursor, caller=caller) as cursor:
+            cursor.execute(sql, params)
+            for row in cursor:
+                yield row
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+def use_own_transactions():
+    """
+    이 요청에서 UnitOfWork를 쓰지 않음 (model 함수마다 각자 commit)
+    - 스트리밍 응답처럼 오래 걸리면서 중간 결과를 바로 저장해야 하는 요청용
+    - Spotify 호출처럼 외부 응답을 기다리는 요청도 사용 (기다리는 동안 연결/트랜잭션을 잡고 있지 않도록)
+    - 그때까지 요청 단위 연결로 한 변경은 여기서 commit
+    """
+    finish_unit_of_work(commit=True)
+    g.db_own_transactions = True
+
+
+def finish_unit_of_work(commit=True):
+    read_unit = g.pop("db_read_unit", None)
+    unit = g.pop("db_unit", None)
+    try:
+        if unit is not None:
+            unit.finish(commit)
+    finally:
+        if read_unit is not None:
+            read_unit.finish(commit=False)
+
+
+def init_app(app):
+    """요청 단위 트랜잭션(UnitOfWork) commit/rollback, 요청별 쿼리 수 집계"""
+
+    @app.before_request
+    def _start_query_counter():
+        g.db_counter, g.db_counter_token = query_stats.start_counter()
+
+    # after_request는 등록 역순으로 실행: commit(실패 시 500으로 교체)이 먼저, 쿼리 수 헤더/집계는 최종 응답에
+    @app.after_request
+    def _report_query_count(response):
+        counter = g.get("db_counter")
+        if counter is None:
+            return response
+        response.headers["X-DB-Queries"] = str(counter.queries)
+        response.headers["X-DB-Checkouts"] = str(counter.checkouts)
+
+        query_stats.report_request(
+            counter, request.method, request.path, response.status_code, request.endpoint or request.path
+        )
+        return response
+
+    @app.after_request
+    def _commit_unit_of_work(response):
+        # 스트리밍 응답은 본문을 다 보낸 뒤(teardown) 처리
+        if response.is_streamed:
+            g.db_response_status = response.status_code
+            return response
+        try:
+            finish_unit_of_work(commit=response.status_code < 500)
+        except RolledBack:
+            # 이미 실패 응답(4xx)이면 model 함수의 rollback은 예상된 결과
+            if response.status_code >= 400:
+                return response
+            print(f"❌ 요청 트랜잭션 rollback됨: {request.method} {request.path}")
+            return app.make_response(({"success": False, "message": "저장 중 오류가 발생했습니다."}, 500))
+        except Exception as e:
+            print(f"❌ 요청 트랜잭션 commit 실패: {e}")
+            return app.make_response(({"success": False, "message": "저장 중 오류가 발생했습니다."}, 500))
+        return response
+
+    @app.teardown_request
+    def _close_unit_of_work(exc):
+        try:
+            finish_unit_of_work(commit=exc is None and g.get("db_response_status", 200) < 500)
+        except Exception as e:
+            print(f"❌ 요청 트랜잭션 정리 실패: {e}")
+        finally:
+            token = g.pop("db_counter_token", None)
+            if token is not None:
+                try:
+                    query_stats.stop_counter(token)
+                except ValueError:
+                    # 스트리밍 응답이 다른 context에서 끝난 경우
+                    pass
 
 
-def get_connection():
-    """외부에서 사용할 통합 연결 함수"""
-    return DatabaseManager.get_connection()
+def get_pool_stats():
+    """Connection Pool 상태 (/health 용)"""
+    return DatabaseManager.get_stats()
 
 
 # 기존 호환성 유지용 함수 (deprecated)
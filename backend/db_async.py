@@ -0,0 +1,203 @@
+# db_async.py - asyncio용 DB Connection Pool (aiomysql, 선택 설치: requirements-async.txt)
+#
+# ASGI 모드(asgi.py)의 async 엔드포인트에서 사용
+# - db.py와 같은 환경변수 (DB_HOST 등, DB_POOL_MAX, DB_POOL_TIMEOUT, DB_REPLICA_*)
+# - 연결 대기 시간 초과는 db.PoolTimeout (동기 모드와 같은 503 응답)
+# - 쿼리 실행 시간/횟수는 query_stats에 같이 기록
+# - 요청 단위 트랜잭션(UnitOfWork)은 없음: model 함수마다 연결을 받아 각자 commit
+import asyncio
+import os
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+
+from db import (
+    DB_POOL_MAX, DB_POOL_MIN_CACHED, DB_POOL_TIMEOUT, DB_REPLICA_HOST, DB_REPLICA_POOL_MAX,
+    PoolStats, PoolTimeout,
+)
+import query_stats
+
+try:
+    import aiomysql
+except ImportError:  # 동기 모드만 사용
+    aiomysql = None
+
+# 이 시간(초)보다 오래된 연결은 꺼낼 때 다시 연결 (MySQL wait_timeout보다 짧게)
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 3600))
+
+
+def is_available():
+    return aiomysql is not None
+
+
+class AsyncConnection:
+    """aiomysql 연결 래퍼: cursor()는 query_stats에 기록하는 DictCursor"""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, caller=None):
+        return query_stats.AsyncInstrumentedCursor(self._conn, caller)
+
+
+class AsyncConnectionPool:
+    """aiomysql Pool + 타임아웃 있는 대기 + 통계 (db.ConnectionPool과 같은 역할)"""
+
+    def __init__(self, name, max_connections, **connect_kwargs):
+        self.name = name
+        self.max_connections = max_connections
+        self.connect_kwargs = connect_kwargs
+        self.stats = PoolStats()
+        self._pool = None
+        self._lock = asyncio.Lock()
+
+    async def get_pool(self):
+        if self._pool is None:
+            async with self._lock:
+                if self._pool is None:
+                    self._pool = await aiomysql.create_pool(
+                        minsize=min(DB_POOL_MIN_CACHED, self.max_connections),
+                        maxsize=self.max_connections,
+                        pool_recycle=DB_POOL_RECYCLE,
+                        cursorclass=aiomysql.DictCursor,
+                        autocommit=False,
+                        **self.connect_kwargs
+                    )
+                    print(f"✅ DB Async Connection Pool 생성 완료 ({self.name}, max={self.max_connections},"
+                          f" timeout={DB_POOL_TIMEOUT}s)")
+        return self._pool
+
+    @asynccontextmanager
+    async def connection(self, timeout=None):
+        """
+        async with pool.connection() as conn: ...
+        - 모든 연결이 사용 중이면 timeout(기본 DB_POOL_TIMEOUT)초까지 기다린 뒤 PoolTimeout
+        - 반환할 때 끝나지 않은 트랜잭션은 rollback (commit은 호출한 쪽에서)
+        """
+        pool = await self.get_pool()
+        timeout = DB_POOL_TIMEOUT if timeout is None else timeout
+
+        started = time.perf_counter()
+        try:
+            conn = await asyncio.wait_for(pool.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self.stats.timed_out()
+            raise PoolTimeout(
+                f"DB 연결 대기 시간 초과 ({self.name}, {timeout}s, 최대 {self.max_connections}개 사용 중)"
+            )
+
+        self.stats.checked_out(time.perf_counter() - started)
+        query_stats.count_checkout()
+        try:
+            yield AsyncConnection(conn)
+        finally:
+            try:
+                # 트랜잭션 중인 연결은 aiomysql이 Pool에 돌려놓지 않고 닫아버림
+                if not conn.closed and conn.get_transaction_status():
+                    await conn.rollback()
+            except Exception:
+                conn.close()
+            finally:
+                self.stats.returned()
+                pool.release(conn)
+
+    def get_stats(self):
+        stats = self.stats.snapshot()
+        stats["max"] = self.max_connections
+        stats["idle"] = self._pool.freesize if self._pool is not None else 0
+        return stats
+
+    async def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+
+
+class AsyncDatabaseManager:
+    """asyncio용 Pool 관리자 (primary + 선택적 replica, db.DatabaseManager와 같은 설정)"""
+    _primary = None
+    _replica = None
+
+    @classmethod
+    def _create_pools(cls):
+        if cls._primary is not None:
+            return
+        if aiomysql is None:
+            raise RuntimeError("aiomysql이 설치되지 않았습니다. (pip install -r requirements-async.txt)")
+
+        primary = dict(
+            host=os.getenv('DB_HOST', 'localhost'),
+            port=int(os.getenv('DB_PORT', 3306)),
+            user=os.getenv('DB_USER', 'root'),
+            password=os.getenv('DB_PASSWORD', ''),
+            db=os.getenv('DB_DATABASE', 'listify'),
+        )
+        if DB_REPLICA_HOST:
+            cls._replica = AsyncConnectionPool(
+                "replica",
+                DB_REPLICA_POOL_MAX,
+                host=DB_REPLICA_HOST,
+                port=int(os.getenv('DB_REPLICA_PORT', primary['port'])),
+                user=os.getenv('DB_REPLICA_USER', primary['user']),
+                password=os.getenv('DB_REPLICA_PASSWORD', primary['password']),
+                db=os.getenv('DB_REPLICA_DATABASE', primary['db']),
+            )
+        cls._primary = AsyncConnectionPool("primary", DB_POOL_MAX, **primary)
+
+    @classmethod
+    def get_connection(cls, timeout=None):
+        """Pool(primary)에서 연결 가져오기 (async with)"""
+        cls._create_pools()
+        return cls._primary.connection(timeout)
+
+    @classmethod
+    @asynccontextmanager
+    async def get_read_connection(cls, timeout=None):
+        """replica에서 연결 가져오기 (replica가 없거나 연결에 실패하면 primary)"""
+        cls._create_pools()
+        async with AsyncExitStack() as stack:
+            conn = None
+            if cls._replica is not None:
+                try:
+                    conn = await stack.enter_async_context(cls._replica.connection(timeout))
+                except Exception as e:
+                    print(f"❌ replica 연결 실패, primary 사용: {e}")
+            if conn is None:
+                conn = await stack.enter_async_context(cls._primary.connection(timeout))
+            yield conn
+
+    @classmethod
+    def get_stats(cls):
+        if cls._primary is None:
+            return None
+        stats = cls._primary.get_stats()
+        if cls._replica is not None:
+            stats["replica"] = cls._replica.get_stats()
+        return stats
+
+    @classmethod
+    async def close(cls):
+        for pool in (cls._primary, cls._replica):
+            if pool is not None:
+                await pool.close()
+        cls._primary = None
+        cls._replica = None
+
+
+def get_connection(read_only=False):
+    """
+    async model 함수용 연결
+        async with db_async.get_connection(read_only=True) as conn:
+            async with conn.cursor() as c: ...
+    - read_only=True: replica가 있으면 replica 사용
+    """
+    if read_only:
+        return AsyncDatabaseManager.get_read_connection()
+    return AsyncDatabaseManager.get_connection()
+
+
+def get_pool_stats():
+    return AsyncDatabaseManager.get_stats()
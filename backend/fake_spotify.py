@@ -0,0 +1,294 @@
+# fake_spotify.py - 오프라인 Spotify API 대체 서버 (벤치마크/로컬 개발용)
+#
+# 실행: python fake_spotify.py --port 8765 --latency-ms 80 --jitter-ms 40 --rate-429 0.02
+# 백엔드에서 사용하려면 .env에 아래 설정
+#   SPOTIFY_API_URL=http://127.0.0.1:8765/v1/
+#   SPOTIFY_TOKEN_URL=http://127.0.0.1:8765/api/token
+#
+# 지원 API: search, artists/{id}, artists?ids=, tracks?ids=, playlists/{id}, playlists/{id}/tracks
+# - 모든 데이터는 id/검색어 기준으로 결정적으로 생성 (같은 요청 → 같은 응답)
+# - --fixtures 디렉터리를 주면 녹화된 응답(JSON)을 먼저 찾아서 반환
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# 아티스트 장르 (GENRE_MAP에 있는 장르 + 매핑되지 않는 장르)
+SPOTIFY_GENRES = [
+    ["k-pop"], ["korean pop", "k-pop"], ["dance pop", "pop"], ["pop"], ["hip hop"],
+    ["r&b"], ["jazz"], ["edm", "electronic"], ["rock"], ["metal"], ["indie"],
+    ["lo-fi beats"], [],
+]
+
+
+class FakeSpotifyConfig:
+    def __init__(self, latency_ms=0, jitter_ms=0, rate_429=0.0, retry_after=1,
+                 search_total=1000, artist_pool=500, snapshot_id="snapshot-1", fixtures=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.search_total = search_total
+        self.artist_pool = artist_pool
+        self.snapshot_id = snapshot_id
+        self.fixtures = fixtures
+        self.requests = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def count(self, throttled=False):
+        with self._lock:
+            self.requests += 1
+            if throttled:
+                self.throttled += 1
+
+
+def _hash(value):
+    return hashlib.md5(value.encode("utf-8")).hexdigest()
+
+
+def _artist(config, artist_no):
+    artist_id = f"fakeartist{artist_no:012d}"
+    return {
+        "id": artist_id,
+        "name": f"Artist {artist_no}",
+        "type": "artist",
+        "genres": SPOTIFY_GENRES[artist_no % len(SPOTIFY_GENRES)],
+        "popularity": artist_no % 100,
+    }
+
+
+def _artist_no(artist_id):
+    try:
+        return int(artist_id.replace("fakeartist", ""))
+    except ValueError:
+        return int(_hash(artist_id)[:8], 16)
+
+
+def _track(config, track_id):
+    h = int(_hash(track_id)[:12], 16)
+    artist = _artist(config, h % config.artist_pool)
+    return {
+        "id": track_id,
+        "type": "track",
+        "name": f"Track {track_id[:8]}",
+        "artists": [{"id": artist["id"], "name": artist["name"], "type": "artist"}],
+        "album": {
+            "name": f"Album {h % 10000}",
+            "images": [{"url": f"https://i.scdn.co/image/{track_id}", "width": 640, "height": 640}],
+        },
+        "duration_ms": 120000 + h % 180000,
+        "popularity": h % 101,
+        "external_urls": {"spotify": f"https://open.spotify.com/track/{track_id}"},
+        "preview_url": None,
+    }
+
+
+def _search_track_id(query, index):
+    return _hash(f"search:{query.lower()}:{index}")[:22]
+
+
+def _playlist_size(playlist_id):
+    # fake-5000 → 5000곡, 그 외 50곡
+    if playlist_id.startswith("fake-"):
+        try:
+            return int(playlist_id.split("-", 1)[1])
+        except ValueError:
+            pass
+    return 50
+
+
+def _page(items, href, limit, offset, total):
+    next_offset = offset + limit
+    return {
+        "href": href,
+        "items": items,
+        "limit": limit,
+        "offset": offset,
+        "total": total,
+        "next": f"{href}?offset={next_offset}&limit={limit}" if next_offset < total else None,
+        "previous": None,
+    }
+
+
+def handle_api(config, path, query):
+    """(status, body) 반환"""
+    parts = [p for p in path.split("/") if p]
+    if parts[:1] != ["v1"]:
+        return 404, {"error": {"status": 404, "message": "Not found"}}
+    parts = parts[1:]
+
+    def arg(name, default=None):
+        return (query.get(name) or [default])[0]
+
+    if parts == ["search"]:
+        q = arg("q", "")
+        limit = int(arg("limit", 10))
+        offset = int(arg("offset", 0))
+        if limit > 50 or offset > 1000:
+            return 400, {"error": {"status": 400, "message": "Invalid limit/offset"}}
+        total = config.search_total
+        end = min(offset + limit, total)
+        items = [_track(config, _search_track_id(q, i)) for i in range(offset, end)]
+        return 200, {"tracks": _page(items, "/v1/search", limit, offset, total)}
+
+    if parts == ["artists"]:
+        ids = [i for i in arg("ids", "").split(",") if i]
+        if len(ids) > 50:
+            return 400, {"error": {"status": 400, "message": "Too many ids requested"}}
+        return 200, {"artists": [_artist(config, _artist_no(i)) for i in ids]}
+
+    if len(parts) == 2 and parts[0] == "artists":
+        return 200, _artist(config, _artist_no(parts[1]))
+
+    if parts == ["tracks"]:
+        ids = [i for i in arg("ids", "").split(",") if i]
+        if len(ids) > 50:
+            return 400, {"error": {"status": 400, "message": "Too many ids requested"}}
+        return 200, {"tracks": [_track(config, i) for i in ids]}
+
+    if len(parts) == 2 and parts[0] == "playlists":
+        playlist_id = parts[1]
+        return 200, {"id": playlist_id, "snapshot_id": config.snapshot_id, "name": playlist_id}
+
+    if len(parts) == 3 and parts[0] == "playlists" and parts[2] == "tracks":
+        playlist_id = parts[1]
+        limit = int(arg("limit", 100))
+        offset = int(arg("offset", 0))
+        total = _playlist_size(playlist_id)
+        end = min(offset + limit, total)
+        items = [
+            {"track": _track(config, _hash(f"playlist:{playlist_id}:{i}")[:22])}
+            for i in range(offset, end)
+        ]
+        return 200, _page(items, f"/v1/playlists/{playlist_id}/tracks", limit, offset, total)
+
+    return 404, {"error": {"status": 404, "message": "Not found"}}
+
+
+def _fixture(config, path, query):
+    """녹화 응답: fixtures/<path를 __로 연결>[__<정렬된 쿼리 해시>].json"""
+    if not config.fixtures:
+        return None
+    name = path.strip("/").replace("/", "__")
+    candidates = []
+    if query:
+        qs = "&".join(f"{k}={','.join(v)}" for k, v in sorted(query.items()))
+        candidates.append(f"{name}__{_hash(qs)[:12]}.json")
+    candidates.append(f"{name}.json")
+    for candidate in candidates:
+        file_path = os.path.join(config.fixtures, candidate)
+        if os.path.exists(file_path):
+            with open(file_path, encoding="utf-8") as f:
+                return json.load(f)
+    return None
+
+
+def make_handler(config):
+    class FakeSpotifyHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, body, headers=None):
+            raw = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def _delay(self):
+            delay_ms = config.latency_ms + random.uniform(0, config.jitter_ms)
+            if delay_ms > 0:
+                time.sleep(delay_ms / 1000)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            self.rfile.read(length)
+            if urlparse(self.path).path == "/api/token":
+                self._send(200, {"access_token": "fake-token", "token_type": "Bearer", "expires_in": 3600})
+            else:
+                self._send(404, {"error": "not_found"})
+
+        def do_GET(self):
+            self._delay()
+            if config.rate_429 and random.random() < config.rate_429:
+                config.count(throttled=True)
+                self._send(429, {"error": {"status": 429, "message": "API rate limit exceeded"}},
+                           {"Retry-After": str(config.retry_after)})
+                return
+
+            config.count()
+            parsed = urlparse(self.path)
+            query = parse_qs(parsed.query)
+            body = _fixture(config, parsed.path, query)
+            if body is not None:
+                self._send(200, body)
+                return
+            status, body = handle_api(config, parsed.path, query)
+            self._send(status, body)
+
+    return FakeSpotifyHandler
+
+
+def start_server(config, host="127.0.0.1", port=0):
+    """백그라운드 스레드로 서버 시작, 반환: (server, base_url)"""
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def add_arguments(parser):
+    parser.add_argument("--latency-ms", type=float, default=0, help="응답 기본 지연(ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="추가 무작위 지연 최대값(ms)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--retry-after", type=int, default=1, help="429 응답의 Retry-After(초)")
+    parser.add_argument("--search-total", type=int, default=1000, help="검색어당 결과 수")
+    parser.add_argument("--artist-pool", type=int, default=500, help="아티스트 수 (작을수록 중복 아티스트 많음)")
+    parser.add_argument("--snapshot-id", default="snapshot-1", help="플레이리스트 snapshot_id")
+    parser.add_argument("--fixtures", help="녹화된 응답 JSON 디렉터리")
+
+
+def config_from_args(args):
+    return FakeSpotifyConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        retry_after=args.retry_after,
+        search_total=args.search_total,
+        artist_pool=args.artist_pool,
+        snapshot_id=args.snapshot_id,
+        fixtures=args.fixtures,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 Spotify API 대체 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(config_from_args(args)))
+    base_url = f"http://{args.host}:{args.port}"
+    print(f"🎵 Fake Spotify: {base_url}")
+    print(f"   SPOTIFY_API_URL={base_url}/v1/")
+    print(f"   SPOTIFY_TOKEN_URL={base_url}/api/token")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
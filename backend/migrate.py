@@ -0,0 +1,301 @@
+# migrate.py - DB 스키마 버전 관리 (인덱스/제약조건)
+#
+# 실행:
+#   python migrate.py            # 적용 안 된 버전 순서대로 적용
+#   python migrate.py --status   # 현재 버전 / 적용할 버전 확인
+#
+# - 적용한 버전은 schema_migrations 테이블에 기록
+# - 각 단계는 이미 같은 컬럼/인덱스가 있으면 건너뛰므로 여러 번 실행해도 안전
+#   (이름이 달라도 같은 컬럼 구성의 인덱스가 있으면 있는 것으로 봄)
+# - 서버 시작 시 check_schema_version()으로 버전 확인 (DB_AUTO_MIGRATE=true면 바로 적용)
+import argparse
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from db import DatabaseManager
+
+# 여러 워커가 동시에 시작해도 한 곳에서만 적용
+MIGRATION_LOCK_NAME = "listify_schema_migration"
+MIGRATION_LOCK_TIMEOUT = 60
+
+
+def _columns(c, table):
+    c.execute(
+        "SELECT COLUMN_NAME FROM information_schema.COLUMNS"
+        " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+        (table,)
+    )
+    return {row['COLUMN_NAME'] for row in c.fetchall()}
+
+
+def _indexes(c, table):
+    """{index_name: (컬럼 tuple, unique 여부, index_type)}"""
+    c.execute(
+        "SELECT INDEX_NAME, COLUMN_NAME, NON_UNIQUE, INDEX_TYPE FROM information_schema.STATISTICS"
+        " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+        " ORDER BY INDEX_NAME, SEQ_IN_INDEX",
+        (table,)
+    )
+    indexes = {}
+    for row in c.fetchall():
+        columns, unique, index_type = indexes.get(row['INDEX_NAME'], ((), not row['NON_UNIQUE'], row['INDEX_TYPE']))
+        indexes[row['INDEX_NAME']] = (columns + (row['COLUMN_NAME'],), unique, index_type)
+    return indexes
+
+
+def ensure_column(c, table, column, definition):
+    if column in _columns(c, table):
+        print(f"  ⏭️  {table}.{column} 이미 있음")
+        return
+    c.execute(f"ALTER TABLE `{table}` ADD COLUMN `{column}` {definition}")
+    print(f"  ✅ {table}.{column} 추가")
+
+
+def ensure_index(c, table, name, columns, unique=False, fulltext=False, parser=None):
+    """
+    같은 이름 또는 같은 컬럼 구성의 인덱스가 없을 때만 생성
+    - unique=True면 기존 인덱스도 UNIQUE여야 같은 것으로 봄 (PRIMARY 포함)
+    - parser: FULLTEXT 파서 (예: ngram)
+    """
+    columns = tuple(columns)
+    for index_name, (index_columns, index_unique, index_type) in _indexes(c, table).items():
+        if fulltext != (index_type == "FULLTEXT"):
+            continue
+        if index_name == name or (index_columns == columns and (index_unique or not unique)):
+            print(f"  ⏭️  {table}({', '.join(columns)}) 이미 있음: {index_name}")
+            return
+
+    kind = "FULLTEXT INDEX" if fulltext else "UNIQUE INDEX" if unique else "INDEX"
+    column_sql = ", ".join(f"`{col}`" for col in columns)
+    parser_sql = f" WITH PARSER {parser}" if parser else ""
+    c.execute(f"CREATE {kind} `{name}` ON `{table}` ({column_sql}){parser_sql}")
+    print(f"  ✅ {table}({', '.join(columns)}) {kind} 생성: {name}")
+
+
+def _music_columns(c):
+    # 저장 코드가 쓰는 컬럼 (예전 스키마에는 없을 수 있음)
+    ensure_column(c, "music", "preview_url", "VARCHAR(500) NULL")
+
+
+def _music_references(c):
+    """music_no 컬럼이 있는 다른 테이블 (music_list 등)"""
+    c.execute(
+        "SELECT col.TABLE_NAME FROM information_schema.COLUMNS col"
+        " JOIN information_schema.TABLES t"
+        "   ON t.TABLE_SCHEMA = col.TABLE_SCHEMA AND t.TABLE_NAME = col.TABLE_NAME"
+        " WHERE col.TABLE_SCHEMA = DATABASE() AND col.COLUMN_NAME = 'music_no'"
+        "   AND col.TABLE_NAME <> 'music' AND t.TABLE_TYPE = 'BASE TABLE'"
+    )
+    return sorted(row['TABLE_NAME'] for row in c.fetchall())
+
+
+def _music_spotify_url_unique(c):
+    """
+    spotify_url 중복 제거 후 UNIQUE 인덱스 (중복 체크 / ON DUPLICATE KEY 용)
+    - 같은 spotify_url 중 music_no가 가장 작은 곡만 남김
+    - music_no를 참조하는 테이블(music_list 등)은 남는 곡으로 옮김
+    - 남는 곡에 없는 spotify_track_id / preview_url은 삭제되는 곡의 값으로 채움
+    - 인기도 갱신 체크포인트(last_music_no)는 위치 기준(music_no > N)이라 삭제된 번호여도 그대로 동작
+    """
+    c.execute(
+        "SELECT m.music_no, m.spotify_track_id, m.preview_url, keep.music_no AS keep_no FROM music m"
+        " JOIN (SELECT spotify_url, MIN(music_no) AS music_no FROM music"
+        "       WHERE spotify_url IS NOT NULL GROUP BY spotify_url HAVING COUNT(*) > 1) keep"
+        " ON m.spotify_url = keep.spotify_url AND m.music_no <> keep.music_no"
+    )
+    duplicates = c.fetchall()
+    tables = _music_references(c) if duplicates else []
+    for row in duplicates:
+        for table in tables:
+            # 이미 남는 곡을 가진 행(UNIQUE 충돌)은 IGNORE로 건너뛰고 아래에서 삭제
+            c.execute(f"UPDATE IGNORE `{table}` SET music_no = %s WHERE music_no = %s",
+                      (row['keep_no'], row['music_no']))
+            c.execute(f"DELETE FROM `{table}` WHERE music_no = %s", (row['music_no'],))
+        # spotify_track_id도 UNIQUE일 수 있으므로 삭제한 뒤에 옮김
+        c.execute("DELETE FROM music WHERE music_no = %s", (row['music_no'],))
+        c.execute(
+            "UPDATE music SET spotify_track_id = COALESCE(spotify_track_id, %s),"
+            " preview_url = COALESCE(preview_url, %s) WHERE music_no = %s",
+            (row['spotify_track_id'], row['preview_url'], row['keep_no'])
+        )
+    if duplicates:
+        print(f"  🧹 spotify_url 중복 {len(duplicates)}곡 정리 (참조 테이블: {', '.join(tables) or '없음'})")
+
+    ensure_index(c, "music", "uk_music_spotify_url", ["spotify_url"], unique=True)
+
+
+def _music_listing_indexes(c):
+    # 인기순 keyset 페이지 (find_page, genre_ranking)
+    ensure_index(c, "music", "idx_music_genre_popularity", ["genre_no", "popularity", "music_no"])
+    ensure_index(c, "music", "idx_music_popularity", ["popularity", "music_no"])
+
+
+# 로컬 검색 (search_local) FULLTEXT 인덱스
+# - 기본 파서는 공백 단위 + 3글자 이상(innodb_ft_min_token_size)만 색인해서 한글 곡/아티스트명이 거의 안 잡힘
+# - ngram 파서(MySQL 5.7.6+)는 ngram_token_size(기본 2)글자 단위로 색인
+MUSIC_FULLTEXT_COLUMNS = ["track_name", "artist_name", "album_name"]
+
+
+def _music_fulltext(c):
+    ensure_index(c, "music", "ft_music_search", MUSIC_FULLTEXT_COLUMNS, fulltext=True, parser="ngram")
+
+
+def _music_fulltext_ngram(c):
+    """버전 4를 ngram 파서 없이 적용한 DB: 기본 파서 FULLTEXT 인덱스를 ngram으로 다시 생성"""
+    columns = tuple(MUSIC_FULLTEXT_COLUMNS)
+    names = [
+        index_name for index_name, (index_columns, _, index_type) in _indexes(c, "music").items()
+        if index_type == "FULLTEXT" and index_columns == columns
+    ]
+    if names:
+        # 파서는 information_schema에 없어서 SHOW CREATE TABLE의 해당 인덱스 정의에서만 확인
+        c.execute("SHOW CREATE TABLE music")
+        definitions = {
+            line.split("`")[1]: line
+            for line in (raw.strip() for raw in c.fetchone()['Create Table'].splitlines())
+            if line.startswith("FULLTEXT KEY")
+        }
+        for index_name in names:
+            if "ngram" in definitions.get(index_name, ""):
+                print(f"  ⏭️  music FULLTEXT 인덱스 이미 ngram 파서 사용: {index_name}")
+                return
+            c.execute(f"ALTER TABLE music DROP INDEX `{index_name}`")
+            print(f"  🧹 기본 파서 FULLTEXT 인덱스 삭제: {index_name}")
+    _music_fulltext(c)
+
+
+def _list_indexes(c):
+    # music_list(playlist_no, music_no)는 PRIMARY KEY가 이미 같은 구성이면 건너뜀
+    ensure_index(c, "music_list", "uk_music_list_playlist_music", ["playlist_no", "music_no"], unique=True)
+    ensure_index(c, "music_list", "idx_music_list_music", ["music_no"])
+    ensure_index(c, "playlist", "idx_playlist_user_created", ["user_no", "created_at"])
+    ensure_index(c, "notice", "idx_notice_created", ["created_at"])
+
+
+def _music_popularity_not_null(c):
+    """popularity NULL → 0, 이후 NOT NULL DEFAULT 0 (NULL 행은 인기순 keyset 조건에 걸리지 않음)"""
+    c.execute("UPDATE music SET popularity = 0 WHERE popularity IS NULL")
+    if c.rowcount:
+        print(f"  🧹 popularity NULL {c.rowcount}곡 → 0")
+    c.execute(
+        "SELECT COLUMN_TYPE, IS_NULLABLE FROM information_schema.COLUMNS"
+        " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'music' AND COLUMN_NAME = 'popularity'"
+    )
+    column = c.fetchone()
+    if column['IS_NULLABLE'] == 'NO':
+        print("  ⏭️  music.popularity 이미 NOT NULL")
+        return
+    c.execute(f"ALTER TABLE music MODIFY COLUMN popularity {column['COLUMN_TYPE']} NOT NULL DEFAULT 0")
+    print("  ✅ music.popularity NOT NULL DEFAULT 0")
+
+
+# (버전, 설명, 함수) - 이미 배포된 버전은 수정하지 말고 새 버전으로 추가
+MIGRATIONS = [
+    (1, "music 컬럼 보정 (preview_url)", _music_columns),
+    (2, "music.spotify_url UNIQUE", _music_spotify_url_unique),
+    (3, "music 인기순 목록 인덱스", _music_listing_indexes),
+    (4, "music FULLTEXT 검색 인덱스", _music_fulltext),
+    (5, "music_list / playlist / notice 목록 인덱스", _list_indexes),
+    (6, "music.popularity NOT NULL DEFAULT 0", _music_popularity_not_null),
+    (7, "music FULLTEXT 인덱스 ngram 파서로 재생성", _music_fulltext_ngram),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def _ensure_migrations_table(c):
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " version INT PRIMARY KEY,"
+        " description VARCHAR(200) NOT NULL,"
+        " applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP"
+        ")"
+    )
+
+
+def _applied_versions(c):
+    c.execute("SELECT version FROM schema_migrations")
+    return {row['version'] for row in c.fetchall()}
+
+
+def get_schema_version():
+    """반환: (현재 적용된 최고 버전, 적용 안 된 버전 목록)"""
+    conn = DatabaseManager.get_connection()
+    try:
+        with conn.cursor() as c:
+            _ensure_migrations_table(c)
+            applied = _applied_versions(c)
+            conn.commit()
+        pending = [version for version, _, _ in MIGRATIONS if version not in applied]
+        return max(applied, default=0), pending
+    finally:
+        conn.close()
+
+
+def migrate():
+    """적용 안 된 버전을 순서대로 적용, 반환: 이번에 적용한 버전 목록"""
+    conn = DatabaseManager.get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute("SELECT GET_LOCK(%s, %s) AS locked", (MIGRATION_LOCK_NAME, MIGRATION_LOCK_TIMEOUT))
+            if not c.fetchone()['locked']:
+                raise RuntimeError("다른 곳에서 마이그레이션 중입니다.")
+            try:
+                _ensure_migrations_table(c)
+                applied = _applied_versions(c)
+                done = []
+                for version, description, step in MIGRATIONS:
+                    if version in applied:
+                        continue
+                    print(f"🔧 [{version}] {description}")
+                    # DDL은 바로 commit되므로 중간에 실패해도 다시 실행하면 남은 부분만 적용
+                    step(c)
+                    c.execute(
+                        "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                        (version, description)
+                    )
+                    conn.commit()
+                    done.append(version)
+                return done
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                c.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK_NAME,))
+    finally:
+        conn.close()
+
+
+def check_schema_version(auto_migrate=False):
+    """서버 시작 시 스키마 버전 확인, 반환: 현재 버전"""
+    version, pending = get_schema_version()
+    if not pending:
+        print(f"✅ DB 스키마 버전 {version}")
+        return version
+    if auto_migrate:
+        migrate()
+        return LATEST_VERSION
+    print(f"⚠️ DB 스키마 버전 {version} (최신 {LATEST_VERSION}), 적용 안 된 버전: {pending}"
+          f" → python migrate.py 실행 필요")
+    return version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DB 스키마 마이그레이션")
+    parser.add_argument("--status", action="store_true", help="적용 상태만 출력")
+    args = parser.parse_args()
+
+    version, pending = get_schema_version()
+    print(f"현재 버전: {version} / 최신 버전: {LATEST_VERSION}")
+    for v, description, _ in MIGRATIONS:
+        print(f"  {'⏳' if v in pending else '✅'} [{v}] {description}")
+    if args.status or not pending:
+        return
+
+    done = migrate()
+    print(f"🎉 적용 완료: {done}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,61 @@
 from db import get_connection
+import threading
+import time
+import os
+
+# 프로세스 단위 장르 사전 (genre 테이블은 작고 거의 바뀌지 않음)
+# - 다른 워커에서 추가된 장르는 GENRE_RELOAD_INTERVAL초 후 반영
+GENRE_RELOAD_INTERVAL = int(os.getenv("GENRE_RELOAD_INTERVAL", 600))
+
+_by_name = {}
+_by_no = {}
+_loaded_at = None
+_lock = threading.Lock()
+
+
+def load_genres():
+    """genre 테이블 전체를 읽어 사전 갱신"""
+    global _by_name, _by_no, _loaded_at
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute("SELECT genre_no, name FROM genre")
+            rows = c.fetchall()
+    finally:
+        conn.close()
+
+    with _lock:
+        # genre.name 비교는 MySQL collation처럼 대소문자 구분 없이 (k-pop == K-Pop)
+        _by_name = {row["name"].casefold(): row["genre_no"] for row in rows}
+        _by_no = {row["genre_no"]: row["name"] for row in rows}
+        _loaded_at = time.monotonic()
+
+
+def _ensure_loaded():
+    if _loaded_at is None or time.monotonic() - _loaded_at > GENRE_RELOAD_INTERVAL:
+        load_genres()
 
 
 def find_genre_no_by_name(name):
+    _ensure_loaded()
+    return _by_name.get((name or "").casefold())
+
+
+def find_name_by_genre_no(genre_no):
+    _ensure_loaded()
+    return _by_no.get(genre_no)
+
+
+def insert_genre(name):
+    """장르 생성 후 사전 다시 로드, 생성된 genre_no 반환"""
     conn = get_connection()
     try:
         with conn.cursor() as c:
-            c.execute("SELECT genre_no FROM genre WHERE name = %s", (name,))
-            row = c.fetchone()
-            return row["genre_no"] if row else None
+            c.execute("INSERT INTO genre (name) VALUES (%s)", (name,))
+            conn.commit()
+            genre_no = c.lastrowid
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+    load_genres()
+    return genre_no
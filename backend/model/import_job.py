@@ -0,0 +1,74 @@
+import json
+
+from model.local_db import get_local_connection
+
+
+def _to_dict(row):
+    job = dict(row)
+    job["queries"] = json.loads(job["queries"])
+    job["errors"] = json.loads(job["errors"])
+    return job
+
+
+def insert_job(job_id, queries, requested):
+    conn = get_local_connection()
+    try:
+        conn.execute(
+            "INSERT INTO import_job (job_id, status, queries, requested) VALUES (?, 'queued', ?, ?)",
+            (job_id, json.dumps(queries, ensure_ascii=False), requested)
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def find_by_job_id(job_id):
+    conn = get_local_connection()
+    try:
+        row = conn.execute("SELECT * FROM import_job WHERE job_id = ?", (job_id,)).fetchone()
+        return _to_dict(row) if row else None
+    finally:
+        conn.close()
+
+
+def update_status(job_id, status):
+    conn = get_local_connection()
+    try:
+        conn.execute(
+            "UPDATE import_job SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE job_id = ?",
+            (status, job_id)
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def add_progress(job_id, fetched, new_count, duplicate_count):
+    """진행 상황 누적 (여러 스레드에서 동시에 호출 가능)"""
+    conn = get_local_connection()
+    try:
+        conn.execute(
+            "UPDATE import_job"
+            " SET fetched = fetched + ?, new_count = new_count + ?,"
+            " duplicate_count = duplicate_count + ?, updated_at = CURRENT_TIMESTAMP"
+            " WHERE job_id = ?",
+            (fetched, new_count, duplicate_count, job_id)
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def add_error(job_id, message):
+    conn = get_local_connection()
+    try:
+        with conn:
+            row = conn.execute("SELECT errors FROM import_job WHERE job_id = ?", (job_id,)).fetchone()
+            errors = json.loads(row["errors"]) if row else []
+            errors.append(message)
+            conn.execute(
+                "UPDATE import_job SET errors = ?, updated_at = CURRENT_TIMESTAMP WHERE job_id = ?",
+                (json.dumps(errors, ensure_ascii=False), job_id)
+            )
+    finally:
+        conn.close()
@@ -0,0 +1,52 @@
+import os
+import sqlite3
+
+# 서버 로컬 상태 저장소 (SQLite): 가져오기 작업, 인기도 갱신 체크포인트
+# - 같은 서버의 워커끼리 공유 (WAL 모드)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOCAL_DB_PATH = os.getenv("IMPORT_JOB_DB", os.path.join(BASE_DIR, "import_jobs.sqlite3"))
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS import_job (
+        job_id          TEXT PRIMARY KEY,
+        status          TEXT NOT NULL,
+        queries         TEXT NOT NULL,
+        requested       INTEGER NOT NULL,
+        fetched         INTEGER NOT NULL DEFAULT 0,
+        new_count       INTEGER NOT NULL DEFAULT 0,
+        duplicate_count INTEGER NOT NULL DEFAULT 0,
+        errors          TEXT NOT NULL DEFAULT '[]',
+        created_at      TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        updated_at      TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS popularity_refresh_run (
+        run_id          INTEGER PRIMARY KEY AUTOINCREMENT,
+        status          TEXT NOT NULL,
+        last_music_no   INTEGER NOT NULL DEFAULT 0,
+        scanned         INTEGER NOT NULL DEFAULT 0,
+        changed         INTEGER NOT NULL DEFAULT 0,
+        error           TEXT,
+        started_at      TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        updated_at      TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        finished_at     TEXT
+    )
+    """,
+]
+
+_initialized = False
+
+
+def get_local_connection():
+    global _initialized
+    conn = sqlite3.connect(LOCAL_DB_PATH, timeout=10)
+    conn.row_factory = sqlite3.Row
+    if not _initialized:
+        conn.execute("PRAGMA journal_mode=WAL")
+        for sql in SCHEMA:
+            conn.execute(sql)
+        conn.commit()
+        _initialized = True
+    return conn
@@ -1,4 +1,10 @@
-from db import get_connection
+from db import get_connection, stream_query
+from model import genre as genre_model
+import pymysql
+import re
+
+# FULLTEXT 인덱스가 없을 때 MySQL 에러 코드 (Can't find FULLTEXT index matching the column list)
+ER_FT_MATCHING_KEY_NOT_FOUND = 1191
 
 
 def find_by_spotify_url(spotify_url):
@@ -12,6 +18,94 @@ def find_by_spotify_url(spotify_url):
         conn.close()
 
 
+def by_spotify_urls_sql(count, columns="*"):
+    placeholders = ",".join(["%s"] * count)
+    return f"SELECT {columns} FROM music WHERE spotify_url IN ({placeholders})"
+
+
+def find_by_spotify_urls(spotify_urls):
+    """spotify_url 목록 일괄 중복 체크, 반환: {spotify_url: row}"""
+    spotify_urls = list(dict.fromkeys(u for u in spotify_urls if u))
+    if not spotify_urls:
+        return {}
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(by_spotify_urls_sql(len(spotify_urls)), spotify_urls)
+            return {row['spotify_url']: row for row in c.fetchall()}
+    finally:
+        conn.close()
+
+
+def music_params(m):
+    return (
+        m['track_name'],
+        m['artist_name'],
+        m['album_name'],
+        m['album_image_url'],
+        m['duration_ms'],
+        m.get('popularity') or 0,  # NULL이면 인기순 keyset 페이지에서 빠짐
+        m['spotify_url'],
+        m.get('spotify_track_id'),
+        m['genre_no'],
+        m.get('preview_url')
+    )
+
+
+def insert_bulk_sql(count):
+    values = ",".join(["(%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)"] * count)
+    return f"""
+    INSERT INTO music
+    (track_name, artist_name, album_name, album_image_url,
+     duration_ms, popularity, spotify_url, spotify_track_id, genre_no, preview_url)
+    VALUES {values}
+    ON DUPLICATE KEY UPDATE music_no = music_no
+    """
+
+
+def insert_music_bulk(musics):
+    """
+    여러 곡을 한 트랜잭션에서 multi-row INSERT
+    - spotify_url / spotify_track_id (UNIQUE, migrate.py) 중복은 ON DUPLICATE KEY UPDATE로 무시
+    - 반환: ({spotify_url: 저장된 행}, 이번에 새로 저장한 spotify_url set) (실패 시 ({}, set()))
+    """
+    musics = list({m['spotify_url']: m for m in musics}.values())
+    if not musics:
+        return {}, set()
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute("SAVEPOINT insert_music_bulk")
+            c.execute(insert_bulk_sql(len(musics)), [p for m in musics for p in music_params(m)])
+            if c.rowcount == len(musics):
+                inserted = {m['spotify_url'] for m in musics}
+            else:
+                # 중복 확인 이후 다른 요청이 같은 곡을 저장함 (중복 행은 rowcount 0)
+                # → 한 곡씩 다시 INSERT해서 이번에 새로 저장한 곡만 구분
+                c.execute("ROLLBACK TO SAVEPOINT insert_music_bulk")
+                inserted = set()
+                for m in musics:
+                    c.execute(insert_bulk_sql(1), music_params(m))
+                    if c.rowcount == 1:
+                        inserted.add(m['spotify_url'])
+
+            # 저장된 행 조회 (auto_increment 연속성에 의존하지 않음, music_no 포함)
+            urls = [m['spotify_url'] for m in musics]
+            c.execute(by_spotify_urls_sql(len(urls)), urls)
+            saved = {row['spotify_url']: row for row in c.fetchall()}
+            conn.commit()
+            print(f"  ✅ 일괄 저장: {len(inserted)}곡")
+            return saved, inserted
+    except Exception as e:
+        conn.rollback()
+        print(f"  ❌ 일괄 저장 실패: {len(musics)}곡 - {e}")
+        return {}, set()
+    finally:
+        conn.close()
+
+
 def insert_music(m):
     conn = get_connection()
     try:
@@ -19,24 +113,16 @@ def insert_music(m):
             sql = """
             INSERT INTO music
             (track_name, artist_name, album_name, album_image_url,
-             duration_ms, popularity, spotify_url, genre_no, preview_url)
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
+             duration_ms, popularity, spotify_url, spotify_track_id, genre_no, preview_url)
+            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
             """
-            c.execute(sql, (
-                m['track_name'],
-                m['artist_name'],
-                m['album_name'],
-                m['album_image_url'],
-                m['duration_ms'],
-                m['popularity'],
-                m['spotify_url'],
-                m['genre_no'],
-                m.get('preview_url')
-            ))
+            c.execute(sql, music_params(m))
             conn.commit()
             print(f"  ✅ 저장: {m['track_name']}")
             return c.lastrowid
     except Exception as e:
+        # 요청 단위 트랜잭션이면 요청의 다른 변경도 commit되지 않음 (db.UnitOfWork)
+        conn.rollback()
         print(f"  ❌ 저장 실패: {m['track_name']} - {e}")
         return None
     finally:
@@ -44,56 +130,234 @@ def insert_music(m):
 
 
 def find_all(category=None, value=None):
+    if category == "genre":
+        return find_by_genre(value)
+
+    conn = get_connection(read_only=True)
+    try:
+        with conn.cursor() as c:
+            c.execute("SELECT * FROM music ORDER BY popularity DESC")
+            return c.fetchall()
+    finally:
+        conn.close()
+
+
+def iter_all(category=None, value=None):
+    """find_all과 같은 결과를 서버 측 커서로 한 행씩 반환 (전체 목록 스트리밍용)"""
+    if category == "genre":
+        genre_no = genre_model.find_genre_no_by_name(value)
+        if genre_no is None:
+            return iter(())
+        return stream_query(
+            "SELECT * FROM music WHERE genre_no = %s ORDER BY popularity DESC", (genre_no,)
+        )
+    return stream_query("SELECT * FROM music ORDER BY popularity DESC")
+
+
+def find_page(genre_no=None, after=None, limit=50):
+    """
+    인기순 keyset 페이지 조회 (ORDER BY popularity DESC, music_no DESC)
+    - after: 이전 페이지 마지막 행의 (popularity, music_no), 없으면 첫 페이지
+    - genre_no 지정 시 해당 장르만
+    - 인덱스: music(popularity, music_no), music(genre_no, popularity, music_no)
+    """
+    conditions = []
+    params = []
+    if genre_no is not None:
+        conditions.append("genre_no = %s")
+        params.append(genre_no)
+    if after is not None:
+        popularity, music_no = after
+        conditions.append("(popularity < %s OR (popularity = %s AND music_no < %s))")
+        params.extend([popularity, popularity, music_no])
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    conn = get_connection(read_only=True)
+    try:
+        with conn.cursor() as c:
+            c.execute(
+                f"""
+                SELECT *
+                FROM music
+                {where}
+                ORDER BY popularity DESC, music_no DESC
+                LIMIT %s
+                """,
+                params + [limit]
+            )
+            return c.fetchall()
+    finally:
+        conn.close()
+
+
+def find_batch_after(music_no, limit=50):
+    """
+    music_no 순서로 다음 묶음 조회 (PK 범위 스캔, 인기도 갱신 작업용)
+    - music_no보다 큰 행부터 limit개
+    """
     conn = get_connection()
     try:
         with conn.cursor() as c:
-            if category == "genre":
-                sql = """
-                SELECT m.*
-                FROM music m
-                JOIN genre g ON m.genre_no = g.genre_no
-                WHERE g.name = %s
-                ORDER BY m.popularity DESC
+            c.execute(
                 """
-                c.execute(sql, (value,))
-            else:
-                c.execute("SELECT * FROM music ORDER BY popularity DESC")
+                SELECT music_no, spotify_url, spotify_track_id, genre_no, popularity
+                FROM music
+                WHERE music_no > %s
+                ORDER BY music_no
+                LIMIT %s
+                """,
+                (music_no, limit)
+            )
             return c.fetchall()
     finally:
         conn.close()
 
 
-def find_by_genre(genre_name):
+def update_popularity_bulk(changes):
+    """
+    인기도 일괄 수정 (UPDATE ... CASE 한 문장, 한 트랜잭션)
+    - changes: [(music_no, popularity), ...]
+    - 반환: 실제로 바뀐 행 수
+    """
+    if not changes:
+        return 0
+
     conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            cases = " ".join(["WHEN %s THEN %s"] * len(changes))
+            placeholders = ",".join(["%s"] * len(changes))
+            params = [p for change in changes for p in change] + [music_no for music_no, _ in changes]
+            c.execute(
+                f"UPDATE music SET popularity = CASE music_no {cases} END"
+                f" WHERE music_no IN ({placeholders})",
+                params
+            )
+            changed = c.rowcount
+            conn.commit()
+            return changed
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def find_by_genre(genre_name):
+    # 장르 사전에서 genre_no를 찾아 genre JOIN 없이 조회
+    genre_no = genre_model.find_genre_no_by_name(genre_name)
+    if genre_no is None:
+        return []
+    return find_by_genre_no(genre_no)
+
+
+def find_by_genre_no(genre_no):
+    conn = get_connection(read_only=True)
     try:
         with conn.cursor() as c:
             sql = """
-            SELECT m.*
-            FROM music m
-            JOIN genre g ON m.genre_no = g.genre_no
-            WHERE g.name = %s
-            ORDER BY m.popularity DESC
+            SELECT *
+            FROM music
+            WHERE genre_no = %s
+            ORDER BY popularity DESC
             """
-            c.execute(sql, (genre_name,))
+            c.execute(sql, (genre_no,))
             return c.fetchall()
     finally:
         conn.close()
 
 
-def find_genre_no_by_name(name):
-    conn = get_connection()
+# ngram FULLTEXT 인덱스(migrate.py)의 토큰 길이 (MySQL ngram_token_size)
+NGRAM_TOKEN_SIZE = 2
+
+
+def _fulltext_query(keyword):
+    """
+    검색어 → BOOLEAN MODE 검색식 (모든 단어 포함)
+    - ngram 인덱스에서는 단어가 ngram 구문 검색으로 바뀌어 부분 일치
+    - 토큰보다 짧은 단어(한 글자)만 접두어 검색(*)
+    """
+    words = re.sub(r'[+\-<>()~*"@]', " ", keyword).split()
+    return " ".join(f"+{w}*" if len(w) < NGRAM_TOKEN_SIZE else f"+{w}" for w in words)
+
+
+def _like_pattern(keyword):
+    """검색어 → 부분 일치 LIKE 패턴 (검색어의 %, _는 글자 그대로)"""
+    escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def search_local_queries(keyword, category=None, limit=12, offset=0, fulltext=True):
+    """
+    search_local()에서 실행하는 쿼리, 반환: ((COUNT sql, params), (목록 sql, params))
+    - fulltext=False: FULLTEXT 인덱스가 없을 때 쓰는 LIKE 검색
+    """
+    like = _like_pattern(keyword)
+    artist_filter = " AND artist_name LIKE %s" if category == "artist" else ""
+    artist_params = (like,) if category == "artist" else ()
+
+    if fulltext:
+        ft_query = _fulltext_query(keyword)
+        where = "MATCH(track_name, artist_name, album_name) AGAINST (%s IN BOOLEAN MODE)" + artist_filter
+        params = (ft_query,) + artist_params
+        select_sql = f"""
+            SELECT *, MATCH(track_name, artist_name, album_name)
+                      AGAINST (%s IN BOOLEAN MODE) AS score
+            FROM music
+            WHERE {where}
+            ORDER BY score DESC, popularity DESC
+            LIMIT %s OFFSET %s
+            """
+        select_params = (ft_query,) + params + (limit, offset)
+    else:
+        where = "(track_name LIKE %s OR artist_name LIKE %s OR album_name LIKE %s)" + artist_filter
+        params = (like, like, like) + artist_params
+        select_sql = f"SELECT * FROM music WHERE {where} ORDER BY popularity DESC LIMIT %s OFFSET %s"
+        select_params = params + (limit, offset)
+
+    return (f"SELECT COUNT(*) AS total FROM music WHERE {where}", params), (select_sql, select_params)
+
+
+def search_local(keyword, category=None, limit=12, offset=0):
+    """
+    music 테이블에서 곡/아티스트/앨범 검색
+    - FULLTEXT(track_name, artist_name, album_name) 인덱스 사용, 관련도 → 인기순 정렬
+    - 인덱스가 없으면 LIKE 검색으로 대체
+    - category=artist: artist_name에 검색어가 포함된 곡만
+    - 반환: (rows, total)
+    """
+    if not _fulltext_query(keyword):
+        return [], 0
+
+    conn = get_connection(read_only=True)
     try:
         with conn.cursor() as c:
-            c.execute(
-                "SELECT genre_no FROM genre WHERE name = %s",
-                (name,)
-            )
-            row = c.fetchone()
-            return row['genre_no'] if row else None
+            try:
+                count_query, select_query = search_local_queries(keyword, category, limit, offset)
+                c.execute(*count_query)
+                total = c.fetchone()['total']
+                c.execute(*select_query)
+            except pymysql.MySQLError as e:
+                if e.args[0] != ER_FT_MATCHING_KEY_NOT_FOUND:
+                    raise
+                count_query, select_query = search_local_queries(keyword, category, limit, offset, fulltext=False)
+                c.execute(*count_query)
+                total = c.fetchone()['total']
+                c.execute(*select_query)
+
+            rows = c.fetchall()
+            for row in rows:
+                row.pop('score', None)
+            return rows, total
     finally:
         conn.close()
 
 
+def find_genre_no_by_name(name):
+    return genre_model.find_genre_no_by_name(name)
+
+
 def find_by_spotify_track_id(track_id):
     conn = get_connection()
     try:
@@ -0,0 +1,86 @@
+# model.music의 async 버전 (ASGI 모드 검색용, 함수 이름/인자/반환값 동일)
+# - SQL은 model.music과 같은 함수로 만들어서 두 버전이 어긋나지 않게 함
+from db_async import get_connection
+from model.music import (
+    ER_FT_MATCHING_KEY_NOT_FOUND, by_spotify_urls_sql, insert_bulk_sql, music_params,
+    search_local_queries, _fulltext_query,
+)
+import pymysql
+
+
+async def find_by_spotify_urls(spotify_urls):
+    """spotify_url 목록 일괄 중복 체크, 반환: {spotify_url: row}"""
+    spotify_urls = list(dict.fromkeys(u for u in spotify_urls if u))
+    if not spotify_urls:
+        return {}
+
+    async with get_connection() as conn:
+        async with conn.cursor() as c:
+            await c.execute(by_spotify_urls_sql(len(spotify_urls)), spotify_urls)
+            return {row['spotify_url']: row for row in await c.fetchall()}
+
+
+async def insert_music_bulk(musics):
+    """
+    여러 곡을 한 트랜잭션에서 multi-row INSERT
+    - 반환: ({spotify_url: 저장된 행}, 이번에 새로 저장한 spotify_url set) (실패 시 ({}, set()))
+    """
+    musics = list({m['spotify_url']: m for m in musics}.values())
+    if not musics:
+        return {}, set()
+
+    async with get_connection() as conn:
+        try:
+            async with conn.cursor() as c:
+                await c.execute("SAVEPOINT insert_music_bulk")
+                await c.execute(insert_bulk_sql(len(musics)), [p for m in musics for p in music_params(m)])
+                if c.rowcount == len(musics):
+                    inserted = {m['spotify_url'] for m in musics}
+                else:
+                    # 중복 확인 이후 다른 요청이 같은 곡을 저장함 → 한 곡씩 다시 INSERT해서 구분
+                    await c.execute("ROLLBACK TO SAVEPOINT insert_music_bulk")
+                    inserted = set()
+                    for m in musics:
+                        await c.execute(insert_bulk_sql(1), music_params(m))
+                        if c.rowcount == 1:
+                            inserted.add(m['spotify_url'])
+
+                urls = [m['spotify_url'] for m in musics]
+                await c.execute(by_spotify_urls_sql(len(urls)), urls)
+                saved = {row['spotify_url']: row for row in await c.fetchall()}
+                await conn.commit()
+                print(f"  ✅ 일괄 저장: {len(inserted)}곡")
+                return saved, inserted
+        except Exception as e:
+            await conn.rollback()
+            print(f"  ❌ 일괄 저장 실패: {len(musics)}곡 - {e}")
+            return {}, set()
+
+
+async def search_local(keyword, category=None, limit=12, offset=0):
+    """
+    music 테이블에서 곡/아티스트/앨범 검색 (FULLTEXT, 인덱스가 없으면 LIKE)
+    - 반환: (rows, total)
+    """
+    if not _fulltext_query(keyword):
+        return [], 0
+
+    async with get_connection(read_only=True) as conn:
+        async with conn.cursor() as c:
+            try:
+                count_query, select_query = search_local_queries(keyword, category, limit, offset)
+                await c.execute(*count_query)
+                total = (await c.fetchone())['total']
+                await c.execute(*select_query)
+            except pymysql.MySQLError as e:
+                if e.args[0] != ER_FT_MATCHING_KEY_NOT_FOUND:
+                    raise
+                count_query, select_query = search_local_queries(keyword, category, limit, offset, fulltext=False)
+                await c.execute(*count_query)
+                total = (await c.fetchone())['total']
+                await c.execute(*select_query)
+
+            rows = await c.fetchall()
+            for row in rows:
+                row.pop('score', None)
+            return rows, total
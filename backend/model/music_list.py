@@ -12,6 +12,7 @@ def insert_music_to_playlist(playlist_no: int, music_no: int) -> bool:
             conn.commit()
             return True
     except Exception:
+        conn.rollback()
         return False
     finally:
         conn.close()
@@ -45,7 +46,7 @@ def delete_all_music_from_playlist(playlist_no: int) -> bool:
 
 def find_by_playlist_no(playlist_no: int):
     """플레이리스트의 음악 목록 조회"""
-    conn = get_connection()
+    conn = get_connection(read_only=True)
     try:
         with conn.cursor() as cursor:
             sql = """
@@ -63,7 +64,7 @@ def find_by_playlist_no(playlist_no: int):
 
 def find_by_music_no(music_no: int):
     """특정 음악이 포함된 플레이리스트 목록 조회"""
-    conn = get_connection()
+    conn = get_connection(read_only=True)
     try:
         with conn.cursor() as cursor:
             sql = """
@@ -92,7 +93,7 @@ def exists(playlist_no: int, music_no: int) -> bool:
 
 def count_by_playlist_no(playlist_no: int) -> int:
     """플레이리스트의 음악 개수 조회"""
-    conn = get_connection()
+    conn = get_connection(read_only=True)
     try:
         with conn.cursor() as cursor:
             sql = "SELECT COUNT(*) as count FROM music_list WHERE playlist_no = %s"
@@ -1,4 +1,4 @@
-from db import get_connection
+from db import get_connection, stream_query
 from db import connect_to_mysql
 import os
 
@@ -57,25 +57,30 @@ def find_by_notice_no(notice_no: int):
     finally:
         conn.close()
 
+LIST_WITH_USER_SQL = (
+    "SELECT n.notice_no, n.user_no, n.title,"
+    " n.created_at, n.updated_at, u.nickname"
+    " FROM notice n LEFT JOIN user u ON n.user_no = u.user_no"
+    " ORDER BY n.created_at DESC"
+)
+
 # 리스트 조회(작성자 닉네임 포함) 
 def list_all_with_user():
-    conn = get_connection()
+    conn = get_connection(read_only=True)
     try:
         with conn.cursor() as cursor:
-            sql = (
-                "SELECT n.notice_no, n.user_no, n.title,"
-                " n.created_at, n.updated_at, u.nickname"
-                " FROM notice n LEFT JOIN user u ON n.user_no = u.user_no"
-                " ORDER BY n.created_at DESC"
-            )
-            cursor.execute(sql)
+            cursor.execute(LIST_WITH_USER_SQL)
             return cursor.fetchall()
     finally:
         conn.close()
 
+# 리스트 조회 스트리밍 (서버 측 커서로 한 행씩)
+def iter_all_with_user():
+    return stream_query(LIST_WITH_USER_SQL)
+
 # 상세 조회(작성자 닉네임 포함)
 def find_detail_with_user(notice_no: int):
-    conn = get_connection()
+    conn = get_connection(read_only=True)
     try:
         with conn.cursor() as cursor:
             sql = (
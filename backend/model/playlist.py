@@ -1,4 +1,4 @@
-from db import get_connection
+from db import get_connection, stream_query
 
 
 def insert_playlist(user_no: int, title: str, content: str = None) -> int:
@@ -58,26 +58,33 @@ def find_by_playlist_no(playlist_no: int):
         conn.close()
 
 
+LIST_WITH_USER_SQL = (
+    "SELECT p.playlist_no, p.user_no, p.title, p.content,"
+    " p.created_at, p.updated_at, u.nickname"
+    " FROM playlist p LEFT JOIN user u ON p.user_no = u.user_no"
+    " ORDER BY p.created_at DESC"
+)
+
+
 def list_all_with_user():
     """전체 리스트 조회 (작성자 닉네임 포함)"""
-    conn = get_connection()
+    conn = get_connection(read_only=True)
     try:
         with conn.cursor() as cursor:
-            sql = (
-                "SELECT p.playlist_no, p.user_no, p.title, p.content,"
-                " p.created_at, p.updated_at, u.nickname"
-                " FROM playlist p LEFT JOIN user u ON p.user_no = u.user_no"
-                " ORDER BY p.created_at DESC"
-            )
-            cursor.execute(sql)
+            cursor.execute(LIST_WITH_USER_SQL)
             return cursor.fetchall()
     finally:
         conn.close()
 
 
+def iter_all_with_user():
+    """전체 리스트 스트리밍 (서버 측 커서로 한 행씩)"""
+    return stream_query(LIST_WITH_USER_SQL)
+
+
 def list_by_user_no(user_no: int):
     """특정 유저의 플레이리스트 목록 조회"""
-    conn = get_connection()
+    conn = get_connection(read_only=True)
     try:
         with conn.cursor() as cursor:
             sql = (
@@ -93,7 +100,7 @@ def list_by_user_no(user_no: int):
 
 def find_detail_with_user(playlist_no: int):
     """상세 조회 (작성자 닉네임 포함)"""
-    conn = get_connection()
+    conn = get_connection(read_only=True)
     try:
         with conn.cursor() as cursor:
             sql = (
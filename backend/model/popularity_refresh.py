@@ -0,0 +1,105 @@
+from model.local_db import get_local_connection
+
+# 실행 중(running) 기록이 이 시간(초) 동안 갱신되지 않으면 중단된 것으로 보고 이어받음
+RUN_STALE_SECONDS = 300
+
+
+def claim_run(resume=True):
+    """
+    갱신 작업 시작 (다른 워커/프로세스와 동시에 실행하지 않음)
+    - 다른 곳에서 실행 중이면 None
+    - resume=True면 끝나지 않은 마지막 기록(중단/실패/paused)을 체크포인트부터 이어서 실행
+    - 반환: run dict
+    """
+    conn = get_local_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        running = conn.execute(
+            "SELECT run_id FROM popularity_refresh_run"
+            " WHERE status = 'running' AND updated_at > datetime('now', ?)",
+            (f"-{RUN_STALE_SECONDS} seconds",)
+        ).fetchone()
+        if running:
+            conn.rollback()
+            return None
+
+        row = None
+        if resume:
+            row = conn.execute(
+                "SELECT * FROM popularity_refresh_run"
+                " WHERE status IN ('running', 'failed', 'paused') ORDER BY run_id DESC LIMIT 1"
+            ).fetchone()
+
+        if row:
+            run_id = row["run_id"]
+            conn.execute(
+                "UPDATE popularity_refresh_run"
+                " SET status = 'running', error = NULL, finished_at = NULL, updated_at = CURRENT_TIMESTAMP"
+                " WHERE run_id = ?",
+                (run_id,)
+            )
+        else:
+            run_id = conn.execute(
+                "INSERT INTO popularity_refresh_run (status) VALUES ('running')"
+            ).lastrowid
+
+        # 이전 미완료 기록은 이어받지 않으므로 정리
+        conn.execute(
+            "UPDATE popularity_refresh_run SET status = 'abandoned'"
+            " WHERE status IN ('running', 'failed', 'paused') AND run_id != ?",
+            (run_id,)
+        )
+        conn.commit()
+        return find_by_run_id(run_id)
+    finally:
+        conn.close()
+
+
+def find_by_run_id(run_id):
+    conn = get_local_connection()
+    try:
+        row = conn.execute("SELECT * FROM popularity_refresh_run WHERE run_id = ?", (run_id,)).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
+
+
+def find_recent(limit=10):
+    conn = get_local_connection()
+    try:
+        rows = conn.execute(
+            "SELECT * FROM popularity_refresh_run ORDER BY run_id DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+    finally:
+        conn.close()
+
+
+def save_checkpoint(run_id, last_music_no, scanned, changed):
+    """묶음 하나 처리 후 체크포인트 저장 (누적값)"""
+    conn = get_local_connection()
+    try:
+        conn.execute(
+            "UPDATE popularity_refresh_run"
+            " SET last_music_no = ?, scanned = scanned + ?, changed = changed + ?,"
+            " updated_at = CURRENT_TIMESTAMP"
+            " WHERE run_id = ?",
+            (last_music_no, scanned, changed, run_id)
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def finish_run(run_id, status, error=None):
+    conn = get_local_connection()
+    try:
+        conn.execute(
+            "UPDATE popularity_refresh_run"
+            " SET status = ?, error = ?, updated_at = CURRENT_TIMESTAMP, finished_at = CURRENT_TIMESTAMP"
+            " WHERE run_id = ?",
+            (status, error, run_id)
+        )
+        conn.commit()
+    finally:
+        conn.close()
@@ -0,0 +1,375 @@
+# query_stats.py - model 계층 SQL 실행 시간 측정 / 느린 쿼리 로그
+#
+# db.py가 돌려주는 모든 커서의 execute()를 감싸서 기록
+# - (호출한 model 함수, 정규화한 SQL)별 지연 히스토그램, 반환/변경 행 수
+# - QUERY_SLOW_MS 이상 걸린 쿼리는 느린 쿼리 로그에 한 줄(JSON)씩 기록
+#   QUERY_EXPLAIN=true면 SELECT의 EXPLAIN 결과도 같이 기록
+# - 조회: GET /health/queries
+# - 요청/테스트 단위 쿼리 수 세기: count_queries(), assert_max_queries()
+# - db_async.py(aiomysql) 커서도 AsyncInstrumentedCursor로 같은 통계에 기록
+from collections import Counter
+from contextlib import contextmanager
+import contextvars
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "true").lower() == "true"
+QUERY_SLOW_MS = float(os.getenv("QUERY_SLOW_MS", 200))
+QUERY_EXPLAIN = os.getenv("QUERY_EXPLAIN", "false").lower() == "true"
+# 비워두면 콘솔에 출력
+QUERY_SLOW_LOG = os.getenv(
+    "QUERY_SLOW_LOG", os.path.join(os.path.dirname(os.path.abspath(__file__)), "slow_queries.log")
+)
+
+# 히스토그램 구간 상한(ms), 마지막 구간은 그 이상 전부
+LATENCY_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+
+# 요청당 쿼리 수 예산 (넘으면 경고), 엔드포인트별 예산: "music.search_music=20,playlist.get_playlist_list=3"
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", 10))
+QUERY_BUDGETS = {
+    name.strip(): int(n)
+    for name, _, n in (item.partition("=") for item in os.getenv("QUERY_BUDGETS", "").split(","))
+    if name.strip() and n.strip().isdigit()
+}
+# 한 요청에서 같은 쿼리가 이 횟수 이상 실행되면 N+1 의심으로 경고
+QUERY_REPEAT_WARN = int(os.getenv("QUERY_REPEAT_WARN", 5))
+# 요청마다 쿼리 수를 로그로 출력
+QUERY_COUNT_LOG = os.getenv("QUERY_COUNT_LOG", "false").lower() == "true"
+
+# 호출 위치를 찾을 때 건너뛸 모듈
+_SKIP_MODULES = ("db", "db_async", "query_stats", "dbutils", "pymysql", "aiomysql")
+
+_stats = {}
+_lock = threading.Lock()
+_log_lock = threading.Lock()
+
+
+def normalize(sql):
+    """같은 모양의 쿼리를 하나로 묶음 (공백 정리, IN 목록 / multi-row VALUES 축약)"""
+    sql = " ".join(sql.split())
+    sql = re.sub(r"IN \((?:%s,\s*)+%s\)", "IN (...)", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"VALUES (\([^()]*\))(?:,\s*\([^()]*\))+", r"VALUES \1, ...", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"(?:WHEN %s THEN %s\s*)+", "WHEN ... ", sql, flags=re.IGNORECASE)
+    return sql
+
+
+def find_caller():
+    """db/pymysql 밖에서 처음 만나는 함수 (예: model.music.find_page)"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.split(".")[0] not in _SKIP_MODULES:
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+def _bucket_index(elapsed_ms):
+    for i, limit in enumerate(LATENCY_BUCKETS_MS):
+        if elapsed_ms <= limit:
+            return i
+    return len(LATENCY_BUCKETS_MS)
+
+
+def record(caller, sql, elapsed, rows):
+    elapsed_ms = elapsed * 1000
+    key = (caller, normalize(sql))
+    with _lock:
+        entry = _stats.get(key)
+        if entry is None:
+            entry = _stats[key] = {
+                "count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0, "slow": 0,
+                "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+            }
+        entry["count"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        entry["rows"] += rows or 0
+        entry["buckets"][_bucket_index(elapsed_ms)] += 1
+        if elapsed_ms >= QUERY_SLOW_MS:
+            entry["slow"] += 1
+
+
+def log_slow(caller, sql, elapsed, rows, explain=None):
+    line = {
+        "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "caller": caller,
+        "ms": round(elapsed * 1000, 1),
+        "rows": rows,
+        "sql": normalize(sql),
+    }
+    if explain is not None:
+        line["explain"] = explain
+    text = json.dumps(line, ensure_ascii=False, default=str)
+
+    if not QUERY_SLOW_LOG:
+        print(f"🐢 느린 쿼리 {text}")
+        return
+    with _log_lock:
+        with open(QUERY_SLOW_LOG, "a", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+def get_stats(limit=50):
+    """총 소요 시간이 큰 순서로 반환"""
+    with _lock:
+        items = [(key, dict(entry, buckets=list(entry["buckets"]))) for key, entry in _stats.items()]
+
+    result = []
+    for (caller, sql), entry in sorted(items, key=lambda item: -item[1]["total_ms"])[:limit]:
+        labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        result.append({
+            "caller": caller,
+            "sql": sql,
+            "count": entry["count"],
+            "avg_ms": round(entry["total_ms"] / entry["count"], 2),
+            "max_ms": round(entry["max_ms"], 2),
+            "total_ms": round(entry["total_ms"], 1),
+            "avg_rows": round(entry["rows"] / entry["count"], 1),
+            "slow": entry["slow"],
+            "histogram": {label: n for label, n in zip(labels, entry["buckets"]) if n},
+        })
+    return result
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+class QueryCounter:
+    """Pool 연결 수 / 실행한 쿼리 수 (요청 또는 테스트 블록 단위, 바깥 카운터에도 같이 더함)"""
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.checkouts = 0
+        self.queries = 0
+        self.statements = Counter()
+
+    def add_checkout(self):
+        counter = self
+        while counter is not None:
+            counter.checkouts += 1
+            counter = counter.parent
+
+    def add_query(self, caller, sql):
+        key = (caller, normalize(sql))
+        counter = self
+        while counter is not None:
+            counter.queries += 1
+            counter.statements[key] += 1
+            counter = counter.parent
+
+    def repeated(self, threshold=QUERY_REPEAT_WARN):
+        """threshold번 이상 반복된 쿼리 [(caller, sql, 횟수)] (N+1 의심)"""
+        return [(caller, sql, n) for (caller, sql), n in self.statements.most_common() if n >= threshold]
+
+    def summary(self):
+        lines = [f"checkouts={self.checkouts} queries={self.queries}"]
+        for (caller, sql), n in self.statements.most_common():
+            lines.append(f"  {n}x {caller}: {sql}")
+        return "\n".join(lines)
+
+
+_counter = contextvars.ContextVar("query_counter", default=None)
+
+
+def start_counter():
+    """반환: (counter, token), 끝나면 stop_counter(token)"""
+    counter = QueryCounter(_counter.get())
+    return counter, _counter.set(counter)
+
+
+def stop_counter(token):
+    _counter.reset(token)
+
+
+def count_checkout():
+    counter = _counter.get()
+    if counter is not None:
+        counter.add_checkout()
+
+
+def budget_for(endpoint):
+    return QUERY_BUDGETS.get(endpoint, QUERY_BUDGET)
+
+
+def report_request(counter, method, path, status, endpoint):
+    """요청 하나의 쿼리 수 로그 (QUERY_COUNT_LOG), 예산 초과 / N+1 의심 경고"""
+    log = f"[db] {method} {path} {status} endpoint={endpoint}" \
+          f" queries={counter.queries} checkouts={counter.checkouts}"
+    if QUERY_COUNT_LOG:
+        print(log)
+
+    budget = budget_for(endpoint)
+    if counter.queries > budget:
+        print(f"⚠️ 쿼리 예산 초과 (budget={budget}) {log}\n{counter.summary()}")
+    for caller, sql, n in counter.repeated():
+        print(f"⚠️ N+1 의심: {endpoint}에서 {caller} 쿼리 {n}회 반복 - {sql}")
+
+
+@contextmanager
+def count_queries():
+    """
+    블록 안에서 실행된 쿼리 수 세기
+        with query_stats.count_queries() as counter:
+            client.get('/playlist')
+        print(counter.queries, counter.checkouts)
+    """
+    counter, token = start_counter()
+    try:
+        yield counter
+    finally:
+        stop_counter(token)
+
+
+@contextmanager
+def assert_max_queries(max_queries, max_checkouts=None):
+    """
+    블록 안의 쿼리 수가 max_queries(연결 수가 max_checkouts)를 넘으면 AssertionError
+        with query_stats.assert_max_queries(3, max_checkouts=1):
+            client.post(f'/playlist/{playlist_no}/music', json={'music_no': 1})
+    """
+    with count_queries() as counter:
+        yield counter
+    if counter.queries > max_queries or (max_checkouts is not None and counter.checkouts > max_checkouts):
+        raise AssertionError(
+            f"쿼리 수 초과 (허용 queries={max_queries}, checkouts={max_checkouts})\n{counter.summary()}"
+        )
+
+
+class InstrumentedCursor:
+    """
+    커서 래퍼: execute()/executemany() 시간과 행 수 기록
+    - caller를 지정하지 않으면 실행 시점의 호출 위치 사용
+    - 서버 측 커서(SSCursor)는 첫 행이 준비될 때까지의 시간만 기록 (행 수는 알 수 없음)
+    """
+
+    def __init__(self, cursor, raw_conn, caller=None, server_side=False):
+        self._cursor = cursor
+        self._raw_conn = raw_conn
+        self.caller = caller
+        self.server_side = server_side
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+    def execute(self, query, args=None):
+        return self._timed(self._cursor.execute, query, args)
+
+    def executemany(self, query, args):
+        return self._timed(self._cursor.executemany, query, args)
+
+    def _timed(self, func, query, args):
+        caller = _count_query(self.caller, query)
+        if caller is None or not QUERY_STATS_ENABLED:
+            return func(query, args)
+
+        started = time.perf_counter()
+        try:
+            return func(query, args)
+        finally:
+            elapsed = time.perf_counter() - started
+            rows = _rows(self._cursor)
+            if _record(caller, query, elapsed, rows):
+                log_slow(caller, query, elapsed, rows, self._explain(query, args))
+
+    def _explain(self, query, args):
+        """QUERY_EXPLAIN=true이고 SELECT이면 EXPLAIN 결과 (서버 측 커서는 결과를 다 읽기 전이라 생략)"""
+        if not _should_explain(query) or self.server_side:
+            return None
+        try:
+            with self._raw_conn.cursor() as c:
+                c.execute("EXPLAIN " + query, args)
+                return c.fetchall()
+        except Exception as e:
+            return f"EXPLAIN 실패: {e}"
+
+
+class AsyncInstrumentedCursor:
+    """
+    aiomysql 커서 래퍼 (InstrumentedCursor와 같은 기록)
+        async with conn.cursor() as c:
+            await c.execute(sql, params)
+            rows = await c.fetchall()
+    """
+
+    def __init__(self, raw_conn, caller=None):
+        self._raw_conn = raw_conn
+        self._cursor = None
+        self.caller = caller
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    async def __aenter__(self):
+        self._cursor = await self._raw_conn.cursor()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._cursor.close()
+
+    async def execute(self, query, args=None):
+        caller = _count_query(self.caller, query)
+        if caller is None or not QUERY_STATS_ENABLED:
+            return await self._cursor.execute(query, args)
+
+        started = time.perf_counter()
+        try:
+            return await self._cursor.execute(query, args)
+        finally:
+            elapsed = time.perf_counter() - started
+            rows = _rows(self._cursor)
+            if _record(caller, query, elapsed, rows):
+                log_slow(caller, query, elapsed, rows, await self._explain(query, args))
+
+    async def _explain(self, query, args):
+        if not _should_explain(query):
+            return None
+        try:
+            async with self._raw_conn.cursor() as c:
+                await c.execute("EXPLAIN " + query, args)
+                return await c.fetchall()
+        except Exception as e:
+            return f"EXPLAIN 실패: {e}"
+
+
+def _count_query(caller, query):
+    """요청/테스트 카운터에 더함, 반환: 기록할 caller (통계도 카운터도 꺼져 있으면 None)"""
+    counter = _counter.get()
+    if not QUERY_STATS_ENABLED and counter is None:
+        return None
+
+    caller = caller or find_caller()
+    if counter is not None:
+        counter.add_query(caller, query)
+    return caller
+
+
+def _rows(cursor):
+    rowcount = getattr(cursor, "rowcount", -1)
+    # 서버 측 커서는 rowcount가 -1 또는 unsigned 최댓값
+    return rowcount if rowcount is not None and 0 <= rowcount < 2 ** 63 else None
+
+
+def _record(caller, query, elapsed, rows):
+    """통계 기록, 반환: 느린 쿼리 여부"""
+    record(caller, query, elapsed, rows)
+    return elapsed * 1000 >= QUERY_SLOW_MS
+
+
+def _should_explain(query):
+    return QUERY_EXPLAIN and query.lstrip().upper().startswith("SELECT")
@@ -22,3 +22,22 @@ def get_global_top_50():
 def bulk_import():
     return music_controller.bulk_import()
 
+
+@music_bp.route('/bulk-import/<job_id>', methods=['GET'])
+def get_bulk_import_job(job_id):
+    return music_controller.get_bulk_import_job(job_id)
+
+
+@music_bp.route('/playlists/<playlist_id>/import', methods=['POST'])
+def import_playlist(playlist_id):
+    return music_controller.import_playlist(playlist_id)
+
+
+@music_bp.route('/popularity-refresh', methods=['POST'])
+def refresh_popularity():
+    return music_controller.refresh_popularity()
+
+
+@music_bp.route('/popularity-refresh', methods=['GET'])
+def get_popularity_refresh_runs():
+    return music_controller.get_popularity_refresh_runs()
@@ -1,29 +1,40 @@
 # seed_music.py - Spotify API를 사용한 music 테이블 테스트 데이터 삽입
+#
+# 실행 예:
+#   python seed_music.py                       # 기본 70곡
+#   python seed_music.py --target 100000       # 부하 테스트용 대량 데이터
+#   python seed_music.py --target 100000 --fresh   # 체크포인트 무시하고 처음부터
+#
+# - 장르별로 동시에 검색 (검색어 하나당 최대 1000곡이라 "장르 year:연도" 검색어로 범위를 넓힘)
+# - 검색 결과를 모아서 multi-row INSERT (중복 체크는 묶음당 SELECT 1번)
+# - 묶음마다 체크포인트 저장 → 중간에 멈추면 다시 실행했을 때 이어서 수집
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import datetime
+import json
 import os
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
+import threading
 from dotenv import load_dotenv
-from db import connect_to_mysql
 
 load_dotenv()
 
-# Spotify 클라이언트 설정
-sp = spotipy.Spotify(auth_manager=SpotifyClientCredentials(
-    client_id=os.getenv('SPOTIFY_CLIENT_ID'),
-    client_secret=os.getenv('SPOTIFY_CLIENT_SECRET')
-))
-
-# DB 연결
-def get_conn():
-    return connect_to_mysql(
-        os.getenv("DB_HOST"),
-        int(os.getenv("DB_PORT")),
-        os.getenv("DB_USER"),
-        os.getenv("DB_PASSWORD"),
-        os.getenv("DB_DATABASE")
-    )
-
-# 장르별 검색 키워드 (다양한 음악 수집)
+from services.spotify import get_spotify_client, BACKGROUND
+from model import genre as genre_model
+from model import music as music_model
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 전체 목표 곡 수 / 동시에 수집할 장르 수 / 한 번에 INSERT할 곡 수
+SEED_TARGET = int(os.getenv("SEED_TARGET", 70))
+SEED_WORKERS = int(os.getenv("SEED_WORKERS", 4))
+SEED_BATCH_SIZE = int(os.getenv("SEED_BATCH_SIZE", 200))
+SEED_CHECKPOINT = os.getenv("SEED_CHECKPOINT", os.path.join(BASE_DIR, ".seed_checkpoint.json"))
+
+# Spotify 검색 페이지 크기 / 검색어당 최대 결과 수
+SEARCH_PAGE_LIMIT = 50
+SEARCH_MAX_RESULTS = 1000
+
+# 장르별 검색 키워드와 비율 (목표 곡 수를 이 비율로 나눔, 합계 70 → 기본값 그대로면 장르당 아래 곡 수)
 SEARCH_QUERIES = [
     ("K-pop", 15),      # K-pop 15곡
     ("Pop", 15),        # Pop 15곡
@@ -34,25 +45,40 @@ SEARCH_QUERIES = [
     ("Electronic", 5),  # Electronic 5곡
 ]
 
-def get_or_create_genre(conn, genre_name):
+
+def get_or_create_genre(genre_name):
     """장르 번호 조회 (없으면 생성)"""
-    with conn.cursor() as c:
-        c.execute("SELECT genre_no FROM genre WHERE name = %s", (genre_name,))
-        row = c.fetchone()
-        if row:
-            return row['genre_no']
-        
-        # 장르 생성
-        c.execute("INSERT INTO genre (name) VALUES (%s)", (genre_name,))
-        conn.commit()
-        return c.lastrowid
-
-def fetch_tracks_from_spotify(query, limit):
-    """Spotify에서 트랙 검색"""
-    results = sp.search(q=query, type='track', limit=limit, market='KR')
+    return genre_model.find_genre_no_by_name(genre_name) or genre_model.insert_genre(genre_name)
+
+
+def genre_targets(target, genres=SEARCH_QUERIES):
+    """전체 목표 곡 수를 장르 비율대로 나눔 (나머지는 앞 장르부터 1곡씩)"""
+    weight_sum = sum(weight for _, weight in genres)
+    targets = {name: target * weight // weight_sum for name, weight in genres}
+    for name, _ in genres[:target - sum(targets.values())]:
+        targets[name] += 1
+    return targets
+
+
+def genre_search_queries(genre_name):
+    """장르 검색어 목록: 장르명 → 최근 연도부터 "장르 year:연도" """
+    this_year = datetime.date.today().year
+    return [genre_name] + [f"{genre_name} year:{year}" for year in range(this_year, 1959, -1)]
+
+
+def fetch_tracks_from_spotify(query, limit, offset=0):
+    """
+    Spotify에서 트랙 검색
+    - 반환: (tracks, total)
+    """
+    sp = get_spotify_client(BACKGROUND)
+    results = sp.search(q=query, type='track', limit=limit, offset=offset, market='KR')
+    page = results['tracks']
     tracks = []
-    
-    for item in results['tracks']['items']:
+
+    for item in page['items']:
+        if not item:
+            continue
         tracks.append({
             'track_name': item['name'],
             'artist_name': ', '.join([a['name'] for a in item['artists']]),
@@ -60,76 +86,145 @@ def fetch_tracks_from_spotify(query, limit):
             'album_image_url': item['album']['images'][0]['url'] if item['album']['images'] else None,
             'duration_ms': item['duration_ms'],
             'popularity': item['popularity'],
-            'spotify_url': item['external_urls']['spotify']
+            'spotify_url': item['external_urls']['spotify'],
+            'spotify_track_id': item.get('id'),
+            'preview_url': item.get('preview_url'),
         })
-    
-    return tracks
-
-def insert_music(conn, music_data, genre_no):
-    """음악 데이터 삽입 (중복 체크)"""
-    with conn.cursor() as c:
-        # 중복 체크
-        c.execute("SELECT music_no FROM music WHERE spotify_url = %s", (music_data['spotify_url'],))
-        if c.fetchone():
-            print(f"  ⏭️  중복 스킵: {music_data['track_name']}")
-            return False
-        
-        sql = """
-        INSERT INTO music 
-        (track_name, artist_name, album_name, album_image_url, duration_ms, popularity, spotify_url, genre_no)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        c.execute(sql, (
-            music_data['track_name'],
-            music_data['artist_name'],
-            music_data['album_name'],
-            music_data['album_image_url'],
-            music_data['duration_ms'],
-            music_data['popularity'],
-            music_data['spotify_url'],
-            genre_no
-        ))
-        conn.commit()
-        print(f"  ✅ 저장: {music_data['track_name']} - {music_data['artist_name']}")
-        return True
+
+    return tracks, page.get('total') or 0
+
+
+def insert_music_batch(musics, genre_no):
+    """
+    여러 곡을 한 번에 저장 (이미 있는 곡은 제외)
+    - 반환: 새로 저장된 곡 수
+    """
+    musics = list({m['spotify_url']: dict(m, genre_no=genre_no) for m in musics}.values())
+    existing = music_model.find_by_spotify_urls([m['spotify_url'] for m in musics])
+    new_musics = [m for m in musics if m['spotify_url'] not in existing]
+    if not new_musics:
+        return 0
+
+    saved, inserted = music_model.insert_music_bulk(new_musics)
+    if not saved:
+        raise RuntimeError(f"일괄 저장 실패 ({len(new_musics)}곡)")
+    return len(inserted)
+
+
+class Checkpoint:
+    """장르별 진행 상황 (검색어 위치, offset, 저장한 곡 수)을 JSON 파일에 저장"""
+
+    def __init__(self, path, fresh=False):
+        self.path = path
+        self.state = {}
+        self._lock = threading.Lock()
+        if path and not fresh and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.state = json.load(f)
+
+    def get(self, genre_name):
+        with self._lock:
+            return dict(self.state.get(genre_name) or {"query_index": 0, "offset": 0, "inserted": 0})
+
+    def save(self, genre_name, progress):
+        with self._lock:
+            self.state[genre_name] = dict(progress)
+            if not self.path:
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+def seed_genre(genre_name, target, checkpoint, query_suffix="", batch_size=SEED_BATCH_SIZE):
+    """
+    장르 하나 수집: 목표 곡 수가 될 때까지 검색어/페이지를 순서대로 진행
+    - 반환: 이 장르에 저장된 곡 수 (이전 실행 포함)
+    """
+    progress = checkpoint.get(genre_name)
+    if progress["inserted"] >= target:
+        return progress["inserted"]
+
+    genre_no = get_or_create_genre(genre_name)
+    queries = genre_search_queries(genre_name)
+    pending = []
+
+    def flush(next_position):
+        if pending:
+            progress["inserted"] += insert_music_batch(pending, genre_no)
+            pending.clear()
+        progress["query_index"], progress["offset"] = next_position
+        checkpoint.save(genre_name, progress)
+
+    while progress["query_index"] < len(queries):
+        query = f"{queries[progress['query_index']]} {query_suffix}".strip()
+        offset = progress["offset"]
+        remaining = target - progress["inserted"] - len(pending)
+        limit = min(SEARCH_PAGE_LIMIT, SEARCH_MAX_RESULTS - offset, max(remaining, 1))
+
+        tracks, total = fetch_tracks_from_spotify(query, limit, offset)
+        pending.extend(tracks)
+
+        offset += limit
+        if not tracks or offset >= min(total, SEARCH_MAX_RESULTS):
+            next_position = (progress["query_index"] + 1, 0)
+        else:
+            next_position = (progress["query_index"], offset)
+
+        # 묶음이 찼거나 목표에 닿을 만큼 모였으면 저장 (중복이 빠지므로 목표는 저장 후 다시 확인)
+        if len(pending) >= batch_size or progress["inserted"] + len(pending) >= target:
+            flush(next_position)
+            if progress["inserted"] >= target:
+                break
+        else:
+            progress["query_index"], progress["offset"] = next_position
+
+    flush((progress["query_index"], progress["offset"]))
+    return progress["inserted"]
+
+
+def seed(target=SEED_TARGET, workers=SEED_WORKERS, checkpoint_path=SEED_CHECKPOINT,
+         fresh=False, query_suffix="", genres=SEARCH_QUERIES):
+    """장르별로 동시에 수집, 반환: {장르명: 저장된 곡 수}"""
+    checkpoint = Checkpoint(checkpoint_path, fresh)
+    targets = genre_targets(target, genres)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="seed") as executor:
+        futures = {
+            name: executor.submit(seed_genre, name, targets[name], checkpoint, query_suffix)
+            for name, _ in genres if targets[name] > 0
+        }
+
+    results = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result()
+            print(f"  📂 [{name}] {results[name]}/{targets[name]}곡")
+        except Exception as e:
+            results[name] = checkpoint.get(name)["inserted"]
+            print(f"  ❌ [{name}] 중단 ({results[name]}/{targets[name]}곡, 다시 실행하면 이어서 수집): {e}")
+    return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Spotify 검색 결과로 music 테이블 채우기")
+    parser.add_argument("--target", type=int, default=SEED_TARGET, help="전체 목표 곡 수 (SEED_TARGET)")
+    parser.add_argument("--workers", type=int, default=SEED_WORKERS, help="동시에 수집할 장르 수 (SEED_WORKERS)")
+    parser.add_argument("--checkpoint", default=SEED_CHECKPOINT, help="체크포인트 파일 (SEED_CHECKPOINT)")
+    parser.add_argument("--fresh", action="store_true", help="체크포인트를 무시하고 처음부터 수집")
+    return parser.parse_args()
+
 
 def main():
-    print("🎵 Spotify 음악 데이터 삽입 시작...")
+    args = parse_args()
+    print(f"🎵 Spotify 음악 데이터 삽입 시작... (목표 {args.target}곡)")
     print("=" * 50)
-    
-    conn = get_conn()
-    if not conn:
-        print("❌ DB 연결 실패")
-        return
-    
-    total_inserted = 0
-    
-    try:
-        for genre_name, count in SEARCH_QUERIES:
-            print(f"\n📂 [{genre_name}] {count}곡 수집 중...")
-            
-            # 장르 번호 가져오기/생성
-            genre_no = get_or_create_genre(conn, genre_name)
-            
-            # Spotify에서 트랙 가져오기
-            tracks = fetch_tracks_from_spotify(genre_name, count)
-            
-            for track in tracks:
-                if insert_music(conn, track, genre_no):
-                    total_inserted += 1
-                
-                # 70개 도달 시 종료
-                if total_inserted >= 70:
-                    break
-            
-            if total_inserted >= 70:
-                break
-    
-    finally:
-        conn.close()
-    
+
+    results = seed(args.target, args.workers, args.checkpoint, args.fresh)
+
     print("\n" + "=" * 50)
-    print(f"🎉 완료! 총 {total_inserted}개 음악 데이터 삽입됨")
+    print(f"🎉 완료! 총 {sum(results.values())}개 음악 데이터 삽입됨")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    크기 제한(LRU) + TTL 인메모리 캐시
+    - ttl 이내: 캐시 값 그대로 반환
+    - ttl ~ ttl + stale_ttl: 오래된 값을 바로 반환하고, 백그라운드에서 키당 1회만 갱신
+    - 그 이후: 만료로 보고 호출 스레드에서 다시 로드
+    """
+
+    def __init__(self, max_size=1000, ttl=60, stale_ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._data = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, loader):
+        """
+        반환: (value, hit)
+        - loader는 인자 없이 값을 반환하는 함수 (예외 발생 시 캐시하지 않음)
+        """
+        found, value, refresh = self.lookup(key)
+        if found:
+            if refresh:
+                threading.Thread(target=self._refresh, args=(key, loader), daemon=True).start()
+            return value, True
+
+        value = loader()
+        self.set(key, value)
+        return value, False
+
+    def lookup(self, key):
+        """
+        반환: (found, value, refresh)
+        - refresh=True: 오래된 값이라 호출한 쪽에서 갱신해야 함 (키당 한 곳에만 True)
+          갱신이 끝나면 성공/실패와 관계없이 end_refresh(key) 호출
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None, False
+            value, loaded_at = entry
+            age = now - loaded_at
+            if age >= self.ttl + self.stale_ttl:
+                del self._data[key]
+                return False, None, False
+            self._data.move_to_end(key)
+            refresh = age >= self.ttl and key not in self._refreshing
+            if refresh:
+                self._refreshing.add(key)
+            return True, value, refresh
+
+    def end_refresh(self, key):
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key=None):
+        """key 지정 시 해당 항목만, 없으면 전체 삭제"""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def _refresh(self, key, loader):
+        try:
+            self.set(key, loader())
+        except Exception as e:
+            print(f"  ❌ 캐시 갱신 실패: {key} - {e}")
+        finally:
+            self.end_refresh(key)
@@ -0,0 +1,122 @@
+from bisect import bisect_right
+import threading
+import time
+import os
+
+import db
+from model import music as music_model
+
+# 장르별 인기순 상위 N곡 (워커 메모리)
+# - 처음 조회할 때 인덱스 순서대로 N곡을 읽어오고, 이후 저장/인기도 변경 시 바로 반영
+# - 다른 워커에서 저장된 곡은 GENRE_RANKING_TTL초 후 다시 로드할 때 반영
+GENRE_RANKING_SIZE = int(os.getenv("GENRE_RANKING_SIZE", 200))
+GENRE_RANKING_TTL = int(os.getenv("GENRE_RANKING_TTL", 300))
+
+_rankings = {}
+_lock = threading.Lock()
+
+
+def _sort_key(row):
+    return (-(row.get("popularity") or 0), -row["music_no"])
+
+
+def _load(genre_no):
+    rows = music_model.find_page(genre_no, None, GENRE_RANKING_SIZE)
+    return {
+        "keys": [_sort_key(row) for row in rows],
+        "rows": rows,
+        # 장르 곡 수가 N보다 적으면 순위표가 장르 전체
+        "complete": len(rows) < GENRE_RANKING_SIZE,
+        "dirty": False,
+        "loaded_at": time.monotonic(),
+    }
+
+
+def _get(genre_no):
+    ranking = _rankings.get(genre_no)
+    if (ranking is None or ranking["dirty"]
+            or time.monotonic() - ranking["loaded_at"] > GENRE_RANKING_TTL):
+        ranking = _load(genre_no)
+        with _lock:
+            _rankings[genre_no] = ranking
+    return ranking
+
+
+def page(genre_no, after=None, limit=50):
+    """
+    순위표에서 한 페이지 조회 (정렬 없이 슬라이스)
+    - after: 이전 페이지 마지막 행의 (popularity, music_no)
+    - 반환: rows, 요청 범위가 순위표 밖이면 None (DB에서 조회)
+    """
+    ranking = _get(genre_no)
+    with _lock:
+        start = 0 if after is None else bisect_right(ranking["keys"], (-after[0], -after[1]))
+        rows = ranking["rows"][start:start + limit]
+        if len(rows) < limit and not ranking["complete"]:
+            return None
+        return [dict(row) for row in rows]
+
+
+def add(row):
+    """
+    새로 저장된 곡 반영 (순위표가 로드된 장르만)
+    - row: music 테이블 행 (_load와 같은 SELECT * 형태)
+    - 요청 트랜잭션 안이면 commit이 성공한 뒤에 반영 (rollback되면 반영하지 않음)
+    """
+    if row.get("genre_no") is None or row.get("music_no") is None:
+        return
+    db.after_commit(lambda: _add(dict(row)))
+
+
+def _add(row):
+    genre_no = row["genre_no"]
+    with _lock:
+        ranking = _rankings.get(genre_no)
+        if ranking is None:
+            return
+        _insert(ranking, row)
+
+
+def update_popularity(music_no, genre_no, popularity):
+    """인기도 변경 반영"""
+    with _lock:
+        ranking = _rankings.get(genre_no)
+        if ranking is None:
+            return
+
+        for i, row in enumerate(ranking["rows"]):
+            if row["music_no"] == music_no:
+                del ranking["keys"][i]
+                del ranking["rows"][i]
+                _insert(ranking, dict(row, popularity=popularity))
+                return
+
+        # 순위표 밖에 있던 곡이 순위권에 들어올 수 있으면 다시 로드
+        if not ranking["complete"] and ranking["keys"] and \
+                (-(popularity or 0), -music_no) < ranking["keys"][-1]:
+            ranking["dirty"] = True
+
+
+def _insert(ranking, row):
+    key = _sort_key(row)
+    if not ranking["complete"] and ranking["keys"] and key > ranking["keys"][-1]:
+        # 순위표 마지막보다 낮으면 그 사이에 DB에만 있는 곡이 있을 수 있으므로 넣지 않음
+        if len(ranking["rows"]) < GENRE_RANKING_SIZE:
+            ranking["dirty"] = True
+        return
+
+    index = bisect_right(ranking["keys"], key)
+    ranking["keys"].insert(index, key)
+    ranking["rows"].insert(index, row)
+    if len(ranking["rows"]) > GENRE_RANKING_SIZE:
+        ranking["keys"].pop()
+        ranking["rows"].pop()
+        ranking["complete"] = False
+
+
+def invalidate(genre_no=None):
+    with _lock:
+        if genre_no is None:
+            _rankings.clear()
+        else:
+            _rankings.pop(genre_no, None)
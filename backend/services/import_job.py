@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import uuid
+
+from model import import_job as import_job_model
+from services import music as music_service
+
+# 대량 가져오기 작업 설정 (동시 실행 작업 수, 작업당 최대 곡 수)
+IMPORT_JOB_WORKERS = int(os.getenv("IMPORT_JOB_WORKERS", 2))
+BULK_IMPORT_MAX_COUNT = int(os.getenv("BULK_IMPORT_MAX_COUNT", 5000))
+
+_executor = ThreadPoolExecutor(max_workers=IMPORT_JOB_WORKERS, thread_name_prefix="import-job")
+
+
+def submit_bulk_import(queries, count, pipelined=None):
+    """
+    대량 가져오기 작업 등록 후 바로 반환
+    - queries를 순서대로 검색해서 count곡이 모일 때까지 가져옴
+      (Spotify 검색은 검색어당 최대 1000곡)
+    - 반환: (job, error)
+    """
+    queries = [q for q in queries if q]
+    if not queries:
+        return None, "query(또는 queries)가 필요합니다."
+    if count < 1 or count > BULK_IMPORT_MAX_COUNT:
+        return None, f"count는 1 ~ {BULK_IMPORT_MAX_COUNT} 사이여야 합니다."
+
+    try:
+        job_id = uuid.uuid4().hex
+        import_job_model.insert_job(job_id, queries, count)
+        _executor.submit(_run_job, job_id, queries, count, pipelined)
+        return import_job_model.find_by_job_id(job_id), None
+    except Exception as e:
+        return None, str(e)
+
+
+def submit_playlist_import(playlist_id):
+    """플레이리스트 가져오기 작업 등록 후 바로 반환, 반환: (job, error)"""
+    if not playlist_id:
+        return None, "playlist_id가 필요합니다."
+
+    try:
+        job_id = uuid.uuid4().hex
+        import_job_model.insert_job(job_id, [f"playlist:{playlist_id}"], 0)
+        _executor.submit(_run_playlist_job, job_id, playlist_id)
+        return import_job_model.find_by_job_id(job_id), None
+    except Exception as e:
+        return None, str(e)
+
+
+def get_job(job_id):
+    """작업 진행 상황 조회"""
+    try:
+        job = import_job_model.find_by_job_id(job_id)
+        if not job:
+            return None, "존재하지 않는 작업입니다."
+        return job, None
+    except Exception as e:
+        return None, str(e)
+
+
+def _run_job(job_id, queries, count, pipelined):
+    import_job_model.update_status(job_id, "running")
+
+    imported = 0
+
+    def on_page(fetched, results):
+        new_count = sum(1 for _, is_new in results if is_new)
+        import_job_model.add_progress(job_id, fetched, new_count, len(results) - new_count)
+
+    try:
+        for query in queries:
+            if imported >= count:
+                break
+            musics, error = music_service.bulk_import_music(
+                query, count - imported, pipelined, on_page=on_page
+            )
+            if error:
+                import_job_model.add_error(job_id, f"{query}: {error}")
+            # 실패한 검색어도 그 전까지 저장한 곡은 반영
+            imported += len(musics or [])
+
+        job = import_job_model.find_by_job_id(job_id)
+        status = "failed" if job["errors"] and imported == 0 else "done"
+        import_job_model.update_status(job_id, status)
+
+    except Exception as e:
+        import_job_model.add_error(job_id, str(e))
+        import_job_model.update_status(job_id, "failed")
+
+
+def _run_playlist_job(job_id, playlist_id):
+    import_job_model.update_status(job_id, "running")
+    try:
+        for page in music_service.import_playlist(playlist_id):
+            import_job_model.add_progress(job_id, page["fetched"], page["new"], page["duplicate"])
+        import_job_model.update_status(job_id, "done")
+    except Exception as e:
+        import_job_model.add_error(job_id, str(e))
+        import_job_model.update_status(job_id, "failed")
@@ -1,101 +1,116 @@
 from model import music as music_model
-from spotipy import Spotify
-from spotipy.oauth2 import SpotifyClientCredentials
+from model import genre as genre_model
+from services.spotify import get_spotify_client, SpotifyRateLimited, INTERACTIVE, BACKGROUND
+from services.pipeline import run_pipeline
+from services.singleflight import SingleFlight
+from services import genre_ranking
+from services.music_common import (
+    ARTISTS_BATCH_SIZE, artist_genre_cache, cache_artist_genres, filter_new_tracks, first_artist_id,
+    normalize_keyword, saved_results, search_cache, spotify_search_query, track_spotify_url,
+    tracks_to_musics, use_local, with_is_new,
+)
+import base64
+import json
+import threading
+import time
 import os
 
-GENRE_MAP = {
-    "k-pop": "K-Pop",
-    "korean pop": "K-Pop",
-    "dance pop": "Pop",
-    "pop": "Pop",
-    "hip hop": "Hip-Hop",
-    "hip-hop": "Hip-Hop",
-    "r&b": "R&B",
-    "jazz": "Jazz",
-    "electronic": "Electronic",
-    "edm": "Electronic",
-    "rock": "Rock",
-    "metal": "Metal",
-    "indie": "Indie",
-}
-
 # Spotify 글로벌 Top 50 플레이리스트 ID
 GLOBAL_TOP_50_PLAYLIST_ID = "37i9dQZEVXbMDoHDwVN2tF"
 
+# Spotify 검색 페이지 크기 / 최대 offset
+SEARCH_PAGE_LIMIT = 50
+SEARCH_MAX_OFFSET = 1000
 
-def get_spotify_client():
-    # ✅ app.py와 동일한 환경변수 이름으로 통일
-    client_id = os.getenv("SPOTIPY_CLIENT_ID")
-    client_secret = os.getenv("SPOTIPY_CLIENT_SECRET")
+# 대량 가져오기 파이프라인 설정 (단계별 동시 작업 수, 단계 사이 대기열 크기)
+BULK_IMPORT_PIPELINED = os.getenv("BULK_IMPORT_PIPELINED", "true").lower() == "true"
+BULK_IMPORT_FETCH_WORKERS = int(os.getenv("BULK_IMPORT_FETCH_WORKERS", 4))
+BULK_IMPORT_ENRICH_WORKERS = int(os.getenv("BULK_IMPORT_ENRICH_WORKERS", 2))
+BULK_IMPORT_PERSIST_WORKERS = int(os.getenv("BULK_IMPORT_PERSIST_WORKERS", 2))
+BULK_IMPORT_QUEUE_SIZE = int(os.getenv("BULK_IMPORT_QUEUE_SIZE", 4))
 
-    if not client_id or not client_secret:
-        raise RuntimeError("Spotify 환경변수(SPOTIPY_CLIENT_ID/SECRET)가 설정되지 않았습니다.")
 
-    return Spotify(
-        auth_manager=SpotifyClientCredentials(
-            client_id=client_id,
-            client_secret=client_secret
-        )
-    )
+def resolve_artist_genres(sp, artist_ids):
+    """
+    artist_id 목록 → {artist_id: genre_no}
+    - 캐시에 있는 아티스트는 Spotify 호출 없이 반환
+    - 나머지는 sp.artists()로 50개씩 묶어서 조회
+    - 조회 실패한 아티스트는 캐시하지 않고 None 반환 (다음 요청에서 재시도)
+    """
+    resolved, missing = artist_genre_cache.lookup(artist_ids)
+
+    for i in range(0, len(missing), ARTISTS_BATCH_SIZE):
+        chunk = missing[i:i + ARTISTS_BATCH_SIZE]
+        try:
+            artists = sp.artists(chunk).get("artists") or []
+        except Exception:
+            artists = []
+        cache_artist_genres(artists, chunk, resolved)
+
+    return resolved
 
 
 def extract_genre_no(sp, artist_id):
     """Spotify artist → genres → 우리 DB genre_no"""
-    try:
-        artist = sp.artist(artist_id)
-        spotify_genres = artist.get("genres", [])
-    except Exception:
-        spotify_genres = []
+    return resolve_artist_genres(sp, [artist_id]).get(artist_id)
+
+
+def prepare_tracks(sp, tracks):
+    """
+    저장 전 단계: 기존 곡 확인 + 신규 곡 장르 조회
+    - spotify_url IN (...) 한 번으로 기존 곡 확인
+    - 신규 곡의 아티스트 장르만 한 번에 조회
+    - 반환: (tracks, existing, new_musics)
+    """
+    tracks = [t for t in tracks if t and track_spotify_url(t)]
+    existing = music_model.find_by_spotify_urls([track_spotify_url(t) for t in tracks])
+
+    new_tracks = filter_new_tracks(tracks, existing)
+    artist_genres = resolve_artist_genres(sp, [first_artist_id(t) for t in new_tracks])
+    return tracks, existing, tracks_to_musics(new_tracks, artist_genres)
 
-    for g in spotify_genres:
-        key = (g or "").lower()
-        if key in GENRE_MAP:
-            genre_name = GENRE_MAP[key]
-            return music_model.find_genre_no_by_name(genre_name)
 
-    return None
+def persist_tracks(prepared):
+    """
+    저장 단계: prepare_tracks() 결과의 신규 곡을 multi-row INSERT 한 번으로 저장
+    - 반환: [(music, is_new), ...] (트랙 순서 유지, 저장 실패한 트랙은 제외)
+    """
+    tracks, existing, new_musics = prepared
+    saved, inserted = music_model.insert_music_bulk(new_musics.values())
+    return saved_results(tracks, existing, saved, inserted)
+
+
+def save_tracks(sp, tracks):
+    """한 페이지의 트랙 목록 저장, 반환: [(music, is_new), ...]"""
+    return persist_tracks(prepare_tracks(sp, tracks))
 
 
 def save_track_if_not_exists(sp, track):
-    """트랙이 DB에 없으면 저장, 있으면 기존 데이터 반환"""
-    spotify_url = track.get("external_urls", {}).get("spotify")
-    if not spotify_url:
-        return None, False
-
-    # 중복 체크
-    existing = music_model.find_by_spotify_url(spotify_url)
-    if existing:
-        return existing, False  # 이미 존재
-
-    # 새로 저장
-    artists = track.get("artists") or []
-    artist_id = artists[0].get("id") if artists else None
-    artist_name = artists[0].get("name") if artists else ""
-
-    genre_no = extract_genre_no(sp, artist_id) if artist_id else None
-
-    album = track.get("album") or {}
-    images = album.get("images") or []
-    album_image_url = images[0].get("url") if images else None
-
-    music = {
-        "track_name": track.get("name") or "",
-        "artist_name": artist_name,
-        "album_name": album.get("name") or "",
-        "album_image_url": album_image_url,
-        "duration_ms": track.get("duration_ms") or 0,
-        "popularity": track.get("popularity") or 0,
-        "spotify_url": spotify_url,
-        "genre_no": genre_no,
-        "preview_url": track.get("preview_url")  # 30초 미리듣기 URL
-    }
+    """트랙이 DB에 없으면 저장, 있으면 기존 데이터 반환, 반환: (music, is_new)"""
+    results = save_tracks(sp, [track])
+    return results[0] if results else (None, False)
+
+
+# 같은 Spotify 조회가 동시에 여러 번 나가지 않도록 합침 (검색, Top 50)
+# - 대량/플레이리스트 가져오기는 합치지 않음: 같은 곡 동시 저장은 UNIQUE 인덱스가 막고,
+#   insert_music_bulk가 실제로 새로 저장한 곡만 is_new로 알려줌
+_spotify_flight = SingleFlight()
 
-    music_no = music_model.insert_music(music)
-    if music_no:
-        music["music_no"] = music_no
-        return music, True
+def _search_spotify_and_save(keyword, category, page, size):
+    """Spotify 검색 + DB 저장, 반환: (musics, total) (실패 시 예외)"""
+    sp = get_spotify_client()
+    results = sp.search(
+        q=spotify_search_query(keyword, category),
+        type="track",
+        limit=size,
+        offset=(page - 1) * size,
+        market="KR"
+    )
 
-    return None, False
+    tracks_obj = results.get("tracks") or {}
+    total = tracks_obj.get("total") or 0
+    items = tracks_obj.get("items") or []
+    return with_is_new(save_tracks(sp, items)), total
 
 
 def search_and_save_music(keyword, category, page, size):
@@ -103,61 +118,92 @@ def search_and_save_music(keyword, category, page, size):
     ✅ /music/search?q=...&category=...&page=1&size=12
     - Spotify에서 track 검색
     - DB에 저장(중복 제외)
-    - 반환: (musics, total, error)
+    - 같은 검색 조건은 캐시에서 반환 (만료 직후에는 이전 결과 반환 + 백그라운드 갱신)
+    - 반환: (musics, total, error), 요청 한도 초과 시 error는 SpotifyRateLimited
     """
     try:
-        sp = get_spotify_client()
-
         # page/size 안전 처리
         page = max(int(page or 1), 1)
         size = max(int(size or 12), 1)
-        offset = (page - 1) * size
-
-        # category 처리(원하는 방식으로 확장 가능)
-        # - category=artist: artist 필드 중심으로 검색되게 쿼리 강화
-        if category == "artist":
-            q = f"artist:{keyword}"
-        else:
-            q = keyword
+        keyword = normalize_keyword(keyword)
 
-        results = sp.search(
-            q=q,
-            type="track",
-            limit=size,
-            offset=offset,
-            market="KR"
-        )
+        # 캐시 미스가 동시에 나도 Spotify 검색은 한 번만 (나머지는 결과 공유)
+        key = (keyword, category or "", page, size)
+        shared = False
 
-        tracks_obj = results.get("tracks") or {}
-        total = tracks_obj.get("total") or 0
-        items = tracks_obj.get("items") or []
+        def load():
+            nonlocal shared
+            value, shared = _spotify_flight.do_shared(
+                ("search",) + key, lambda: _search_spotify_and_save(keyword, category, page, size)
+            )
+            return value
 
-        musics = []
-        for track in items:
-            music, is_new = save_track_if_not_exists(sp, track)
-            if music:
-                music["is_new"] = is_new
-                musics.append(music)
+        (musics, total), hit = search_cache.get_or_load(key, load)
 
+        # 캐시 원본이 바뀌지 않도록 복사
+        # 캐시 적중 / 다른 요청의 검색 결과를 받은 경우에는 이 요청이 새로 저장한 곡이 없음
+        fresh = not hit and not shared
+        musics = [dict(m, is_new=m.get("is_new", False) and fresh) for m in musics]
         return musics, total, None
 
+    except SpotifyRateLimited as e:
+        # 요청 한도 초과는 예외 그대로 반환 (controller에서 429로 구분)
+        return None, 0, e
     except Exception as e:
         return None, 0, str(e)
 
 
-def bulk_import_music(query, total_count=100):
-    """대량 음악 데이터 가져오기"""
-    sp = get_spotify_client()
+def search_music(keyword, category, page, size, source="auto"):
+    """
+    ✅ /music/search?q=...&category=...&page=1&size=12&source=auto|local|spotify
+    - auto: DB(music 테이블)에서 먼저 검색, 전체 결과가 부족할 때만 Spotify 검색 (페이지와 관계없이 같은 출처)
+    - local: DB만 검색 / spotify: 항상 Spotify 검색
+    - 반환: (musics, total, source, error)
+    """
+    if source != "spotify":
+        try:
+            page = max(int(page or 1), 1)
+            size = max(int(size or 12), 1)
+            rows, total = music_model.search_local(
+                normalize_keyword(keyword), category, limit=size, offset=(page - 1) * size
+            )
+        except Exception as e:
+            return None, 0, "local", str(e)
+
+        if source == "local" or use_local(total, size):
+            musics = [dict(row, is_new=False) for row in rows]
+            return musics, total, "local", None
+
+    musics, total, error = search_and_save_music(keyword, category, page, size)
+    return musics, total, "spotify", error
+
+
+def bulk_import_music(query, total_count=100, pipelined=None, on_page=None):
+    """
+    대량 음악 데이터 가져오기
+    - pipelined=True: 페이지 조회 / 장르 조회 / DB 저장을 단계별로 동시에 처리
+    - pipelined=None이면 BULK_IMPORT_PIPELINED 설정을 따름
+    - on_page(fetched, results): 페이지 저장이 끝날 때마다 호출 (진행 상황 보고용)
+    - Spotify 검색은 offset 1000까지만 지원하므로 검색어당 최대 1000곡
+    - 반환: (musics, error), 중간에 실패하면 그때까지 저장한 곡과 error를 같이 반환
+    """
+    if pipelined is None:
+        pipelined = BULK_IMPORT_PIPELINED
+
+    sp = get_spotify_client(BACKGROUND)
+    if pipelined:
+        return _bulk_import_pipelined(sp, query, total_count, on_page)
+
     all_tracks = []
-    limit = 50
+    max_count = min(total_count, SEARCH_MAX_OFFSET)
     offset = 0
 
     try:
-        while len(all_tracks) < total_count:
+        while len(all_tracks) < max_count and offset < max_count:
             results = sp.search(
                 q=query,
                 type='track',
-                limit=limit,
+                limit=min(SEARCH_PAGE_LIMIT, max_count - offset),
                 offset=offset,
                 market='KR'
             )
@@ -165,46 +211,276 @@ def bulk_import_music(query, total_count=100):
             if not tracks:
                 break
 
-            for track in tracks:
-                if len(all_tracks) >= total_count:
-                    break
-
-                music, is_new = save_track_if_not_exists(sp, track)
-                if music:
-                    music['is_new'] = is_new
-                    all_tracks.append(music)
+            # 목표 개수를 넘는 트랙은 장르 조회/저장 대상에서 제외
+            tracks = tracks[:max_count - len(all_tracks)]
+            results = save_tracks(sp, tracks)
+            if on_page:
+                on_page(len(tracks), results)
+            for music, is_new in results:
+                music['is_new'] = is_new
+                all_tracks.append(music)
 
-            offset += limit
+            offset += SEARCH_PAGE_LIMIT
 
         return all_tracks, None
 
+    except Exception as e:
+        # 이미 저장한 페이지는 DB에 남아 있으므로 같이 반환
+        return all_tracks, str(e)
+
+
+def _bulk_import_pipelined(sp, query, total_count, on_page=None):
+    """
+    페이지 offset을 차례로 넘겨서 파이프라인으로 처리
+    - Spotify 검색은 offset 1000까지만 지원하므로 검색어당 최대 1000곡
+    - 빈 페이지(검색 결과 끝)가 나오면 다음 offset부터는 넣지 않음
+    - 중간에 실패해도 저장이 끝난 페이지는 (offset 순서로) 같이 반환
+    """
+    max_count = min(total_count, SEARCH_MAX_OFFSET)
+    exhausted = threading.Event()
+    saved = {}
+    saved_lock = threading.Lock()
+
+    def offsets():
+        for offset in range(0, max_count, SEARCH_PAGE_LIMIT):
+            if exhausted.is_set():
+                return
+            yield offset
+
+    def fetch(offset):
+        limit = min(SEARCH_PAGE_LIMIT, max_count - offset)
+        results = sp.search(
+            q=query,
+            type='track',
+            limit=limit,
+            offset=offset,
+            market='KR'
+        )
+        tracks = (results.get('tracks') or {}).get('items') or []
+        if not tracks:
+            exhausted.set()
+        return offset, tracks
+
+    def prepare(page):
+        offset, tracks = page
+        return offset, prepare_tracks(sp, tracks)
+
+    def persist(page):
+        offset, prepared = page
+        results = persist_tracks(prepared)
+        with saved_lock:
+            saved[offset] = results
+        if on_page:
+            on_page(len(prepared[0]), results)
+
+    error = None
+    try:
+        run_pipeline(
+            offsets(),
+            [
+                (fetch, BULK_IMPORT_FETCH_WORKERS),
+                (prepare, BULK_IMPORT_ENRICH_WORKERS),
+                (persist, BULK_IMPORT_PERSIST_WORKERS),
+            ],
+            queue_size=BULK_IMPORT_QUEUE_SIZE,
+        )
+    except Exception as e:
+        # 이미 저장한 페이지는 DB에 남아 있으므로 같이 반환
+        error = str(e)
+
+    all_tracks = []
+    for offset in sorted(saved):
+        for music, is_new in saved[offset]:
+            music['is_new'] = is_new
+            all_tracks.append(music)
+    return all_tracks, error
+
+
+# 글로벌 Top 50 스냅샷 (스케줄러가 주기적으로 갱신, 요청은 메모리에서 응답)
+TOP50_REFRESH_INTERVAL = int(os.getenv("TOP50_REFRESH_INTERVAL", 3600))
+_top50_snapshot = None
+_top50_scheduler = None
+
+
+def _fetch_global_top_50(sp, force):
+    global _top50_snapshot
+    snapshot_id = sp.playlist(GLOBAL_TOP_50_PLAYLIST_ID, fields="snapshot_id").get("snapshot_id")
+    if not force and _top50_snapshot and _top50_snapshot["snapshot_id"] == snapshot_id:
+        return _top50_snapshot
+
+    playlist = sp.playlist_tracks(GLOBAL_TOP_50_PLAYLIST_ID, limit=50)
+    items = playlist.get('items') or []
+
+    tracks = [item.get('track') for item in items if item.get('track')]
+
+    saved = with_is_new(save_tracks(sp, tracks))
+
+    # 보관하는 스냅샷은 is_new=False (이후 요청에서 "신규 N곡"이 반복되지 않도록)
+    # 이번 조회에서 새로 저장한 곡 표시는 반환값에만
+    _top50_snapshot = {
+        "snapshot_id": snapshot_id,
+        "musics": [dict(music, is_new=False) for music in saved],
+        "refreshed_at": time.time(),
+    }
+    return dict(_top50_snapshot, musics=saved)
+
+
+def refresh_global_top_50(force=False, priority=BACKGROUND):
+    """
+    Spotify 글로벌 Top 50 스냅샷 갱신
+    - 플레이리스트 snapshot_id가 그대로면 트랙 조회/저장 생략
+    - 동시에 들어온 갱신 요청(스케줄러 + 첫 요청들)은 한 번만 실행하고 결과 공유
+      (force=True 요청은 force 요청끼리만 합침, 결과를 공유받은 쪽은 is_new=False)
+    - 반환: (snapshot, error)
+    """
+    try:
+        sp = get_spotify_client(priority)
+        snapshot, shared = _spotify_flight.do_shared(
+            ("top50", GLOBAL_TOP_50_PLAYLIST_ID, force), lambda: _fetch_global_top_50(sp, force)
+        )
+        if shared:
+            snapshot = dict(snapshot, musics=[dict(music, is_new=False) for music in snapshot["musics"]])
+        return snapshot, None
+    except SpotifyRateLimited as e:
+        return None, e
     except Exception as e:
         return None, str(e)
 
 
+def _top50_scheduler_loop():
+    while True:
+        _, error = refresh_global_top_50()
+        if error:
+            print(f"❌ Top 50 갱신 실패: {error}")
+        time.sleep(TOP50_REFRESH_INTERVAL)
+
+
+def start_top50_scheduler():
+    """Top 50 스냅샷 주기 갱신 스레드 시작 (워커당 1개)"""
+    global _top50_scheduler
+    if _top50_scheduler is None:
+        _top50_scheduler = threading.Thread(target=_top50_scheduler_loop, daemon=True)
+        _top50_scheduler.start()
+
+
 def get_global_top_50():
-    """Spotify 글로벌 Top 50 가져와서 저장"""
-    sp = get_spotify_client()
+    """
+    Spotify 글로벌 Top 50 스냅샷 반환
+    - 아직 스냅샷이 없으면 이 요청에서 가져와서 저장
+    - 반환: (snapshot, error)
+    """
+    snapshot = _top50_snapshot
+    if snapshot:
+        return snapshot, None
+    return refresh_global_top_50(priority=INTERACTIVE)
+
+
+# 플레이리스트 페이지 크기 (playlist_items 최대 100)
+PLAYLIST_PAGE_LIMIT = 100
 
+
+def iter_playlist_pages(sp, playlist_id, page_size=PLAYLIST_PAGE_LIMIT):
+    """
+    플레이리스트 트랙을 페이지 단위로 가져오는 generator
+    - 한 번에 한 페이지만 메모리에 올림
+    - yield: (offset, tracks, fetch_ms) (에피소드/삭제된 트랙 제외)
+    """
+    offset = 0
+    while True:
+        started = time.perf_counter()
+        page = sp.playlist_items(
+            playlist_id, limit=page_size, offset=offset, additional_types=("track",)
+        )
+        fetch_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        items = page.get("items") or []
+        tracks = [
+            item["track"] for item in items
+            if item.get("track") and item["track"].get("type", "track") == "track"
+        ]
+        yield offset, tracks, fetch_ms
+
+        offset += len(items)
+        if not items or not page.get("next"):
+            break
+
+
+def import_playlist(playlist_id):
+    """
+    Spotify 플레이리스트 전체를 페이지 단위로 저장하는 generator
+    - 페이지를 받는 즉시 저장하고 다음 페이지 요청 (곡 목록을 쌓아두지 않음)
+    - yield: 페이지별 {page, offset, fetched, new, duplicate, fetch_ms, save_ms}
+    """
+    sp = get_spotify_client(BACKGROUND)
+    pages = iter_playlist_pages(sp, playlist_id)
+    for page_no, (offset, tracks, fetch_ms) in enumerate(pages, 1):
+        started = time.perf_counter()
+        results = save_tracks(sp, tracks)
+        save_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        new_count = sum(1 for _, is_new in results if is_new)
+        yield {
+            "page": page_no,
+            "offset": offset,
+            "fetched": len(tracks),
+            "new": new_count,
+            "duplicate": len(results) - new_count,
+            "fetch_ms": fetch_ms,
+            "save_ms": save_ms,
+        }
+
+
+# /music 페이지 크기
+MUSIC_PAGE_DEFAULT_LIMIT = int(os.getenv("MUSIC_PAGE_DEFAULT_LIMIT", 50))
+MUSIC_PAGE_MAX_LIMIT = int(os.getenv("MUSIC_PAGE_MAX_LIMIT", 100))
+
+
+def _encode_cursor(row):
+    # popularity NULL(마이그레이션 6 이전 데이터)은 0으로
+    raw = json.dumps([row["popularity"] or 0, row["music_no"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    popularity, music_no = json.loads(raw)
+    return int(popularity or 0), int(music_no)
+
+
+def get_music_list(category=None, value=None, cursor=None, limit=None):
+    """
+    ✅ /music?category=genre&value=...&limit=50&cursor=...
+    - 인기순 keyset 페이지네이션, 다음 페이지는 응답의 next cursor로 요청
+    - 반환: (musics, next_cursor, error)
+    """
     try:
-        playlist = sp.playlist_tracks(GLOBAL_TOP_50_PLAYLIST_ID, limit=50)
-        items = playlist.get('items') or []
-
-        saved = []
-        for item in items:
-            track = item.get('track')
-            if not track:
-                continue
-            music, is_new = save_track_if_not_exists(sp, track)
-            if music:
-                music['is_new'] = is_new
-                saved.append(music)
+        limit = min(max(int(limit or MUSIC_PAGE_DEFAULT_LIMIT), 1), MUSIC_PAGE_MAX_LIMIT)
+    except (TypeError, ValueError):
+        return None, None, "limit은 숫자여야 합니다."
 
-        return saved, None
+    try:
+        after = _decode_cursor(cursor) if cursor else None
+    except Exception:
+        return None, None, "잘못된 cursor입니다."
 
-    except Exception as e:
-        return None, str(e)
+    genre_no = None
+    if category == "genre":
+        genre_no = genre_model.find_genre_no_by_name(value)
+        if genre_no is None:
+            return [], None, None
 
+    # 한 건 더 조회해서 다음 페이지 존재 여부 확인
+    # 장르 목록은 메모리 순위표에서 먼저 찾고, 순위표 범위를 벗어나면 DB 조회
+    rows = genre_ranking.page(genre_no, after, limit + 1) if genre_no is not None else None
+    if rows is None:
+        rows = music_model.find_page(genre_no, after, limit + 1)
+    next_cursor = _encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor, None
 
-def get_music_list(category=None, value=None):
-    return music_model.find_all(category, value), None
+
+def iter_music_list(category=None, value=None):
+    """
+    ✅ /music?stream=json|ndjson&category=genre&value=...
+    - 페이지네이션 없이 전체 목록을 서버 측 커서로 한 행씩 반환
+    """
+    return music_model.iter_all(category, value)
@@ -0,0 +1,147 @@
+# services.music 검색의 async 버전 (ASGI 모드 /music/search)
+# - DB는 model.music_async(aiomysql), Spotify는 services.spotify_async(httpx)
+# - 트랙 변환 등 공통 함수와 검색 결과 캐시 / 아티스트 장르 캐시는 services.music_common을 동기 버전과 공유
+#   (장르 순위표 services.genre_ranking도 같은 객체)
+# - 장르 사전(model.genre)은 메모리에서 조회 (GENRE_RELOAD_INTERVAL마다 한 번 동기 쿼리로 다시 로드)
+import asyncio
+
+from model import music_async as music_model
+from services.music_common import (
+    ARTISTS_BATCH_SIZE, artist_genre_cache, cache_artist_genres, filter_new_tracks, first_artist_id,
+    normalize_keyword, saved_results, search_cache, spotify_search_query, track_spotify_url,
+    tracks_to_musics, use_local, with_is_new,
+)
+from services.singleflight import AsyncSingleFlight
+from services.spotify import SpotifyRateLimited
+from services.spotify_async import get_async_spotify_client
+
+# 같은 Spotify 검색이 동시에 여러 번 나가지 않도록 합침 (이벤트 루프 안에서)
+_spotify_flight = AsyncSingleFlight()
+
+# 캐시 갱신 task (끝나기 전에 GC되지 않도록 보관)
+_refresh_tasks = set()
+
+
+async def _fetch_artist_genres(sp, chunk):
+    try:
+        return (await sp.artists(chunk)).get("artists") or []
+    except Exception:
+        return []
+
+
+async def resolve_artist_genres(sp, artist_ids):
+    """
+    artist_id 목록 → {artist_id: genre_no} (services.music.resolve_artist_genres와 같은 캐시 사용)
+    - 캐시에 없는 아티스트는 50개씩 묶어서 동시에 조회
+    """
+    resolved, missing = artist_genre_cache.lookup(artist_ids)
+
+    chunks = [missing[i:i + ARTISTS_BATCH_SIZE] for i in range(0, len(missing), ARTISTS_BATCH_SIZE)]
+    results = await asyncio.gather(*(_fetch_artist_genres(sp, chunk) for chunk in chunks))
+    for chunk, artists in zip(chunks, results):
+        cache_artist_genres(artists, chunk, resolved)
+
+    return resolved
+
+
+async def save_tracks(sp, tracks):
+    """한 페이지의 트랙 목록 저장, 반환: [(music, is_new), ...]"""
+    tracks = [t for t in tracks if t and track_spotify_url(t)]
+    existing = await music_model.find_by_spotify_urls([track_spotify_url(t) for t in tracks])
+
+    new_tracks = filter_new_tracks(tracks, existing)
+    artist_genres = await resolve_artist_genres(sp, [first_artist_id(t) for t in new_tracks])
+    new_musics = tracks_to_musics(new_tracks, artist_genres)
+
+    saved, inserted = await music_model.insert_music_bulk(new_musics.values())
+    return saved_results(tracks, existing, saved, inserted)
+
+
+async def _search_spotify_and_save(keyword, category, page, size):
+    """Spotify 검색 + DB 저장, 반환: (musics, total) (실패 시 예외)"""
+    sp = get_async_spotify_client()
+    results = await sp.search(
+        q=spotify_search_query(keyword, category),
+        type="track",
+        limit=size,
+        offset=(page - 1) * size,
+        market="KR"
+    )
+
+    tracks_obj = results.get("tracks") or {}
+    total = tracks_obj.get("total") or 0
+    items = tracks_obj.get("items") or []
+    return with_is_new(await save_tracks(sp, items)), total
+
+
+async def _refresh(key, load):
+    try:
+        search_cache.set(key, await load())
+    except Exception as e:
+        print(f"  ❌ 캐시 갱신 실패: {key} - {e}")
+    finally:
+        search_cache.end_refresh(key)
+
+
+async def search_and_save_music(keyword, category, page, size):
+    """
+    services.music.search_and_save_music의 async 버전
+    - 반환: (musics, total, error)
+    """
+    try:
+        page = max(int(page or 1), 1)
+        size = max(int(size or 12), 1)
+        keyword = normalize_keyword(keyword)
+
+        key = (keyword, category or "", page, size)
+        shared = False
+
+        async def load():
+            nonlocal shared
+            value, shared = await _spotify_flight.do_shared(
+                ("search",) + key, lambda: _search_spotify_and_save(keyword, category, page, size)
+            )
+            return value
+
+        # 만료 직후에는 이전 결과를 바로 반환하고 백그라운드에서 갱신
+        hit, value, refresh = search_cache.lookup(key)
+        if refresh:
+            task = asyncio.ensure_future(_refresh(key, load))
+            _refresh_tasks.add(task)
+            task.add_done_callback(_refresh_tasks.discard)
+        if not hit:
+            value = await load()
+            search_cache.set(key, value)
+
+        musics, total = value
+        fresh = not hit and not shared
+        musics = [dict(m, is_new=m.get("is_new", False) and fresh) for m in musics]
+        return musics, total, None
+
+    except SpotifyRateLimited as e:
+        return None, 0, e
+    except Exception as e:
+        return None, 0, str(e)
+
+
+async def search_music(keyword, category, page, size, source="auto"):
+    """
+    services.music.search_music의 async 버전 (auto: DB 먼저, 전체 결과가 부족할 때만 Spotify)
+    - 반환: (musics, total, source, error)
+    """
+    if source != "spotify":
+        try:
+            page = max(int(page or 1), 1)
+            size = max(int(size or 12), 1)
+            rows, total = await music_model.search_local(
+                normalize_keyword(keyword), category, limit=size, offset=(page - 1) * size
+            )
+        except Exception as e:
+            return None, 0, "local", str(e)
+
+        if source == "local" or use_local(total, size):
+            musics = [dict(row, is_new=False) for row in rows]
+            return musics, total, "local", None
+
+    musics, total, error = await search_and_save_music(keyword, category, page, size)
+    return musics, total, "spotify", error
@@ -0,0 +1,205 @@
+# services.music(동기)와 services.music_async(ASGI 모드 검색)가 같이 쓰는 함수 / 상태
+# - Spotify 트랙 → music 행 변환, 검색어 정규화, 검색 출처 결정 등 I/O 없는 함수
+# - 아티스트 장르 캐시 / 검색 결과 캐시는 두 버전이 일부러 공유
+#   (ASGI 모드에서는 같은 프로세스의 Flask 스레드와 이벤트 루프가 같은 캐시를 사용, 둘 다 스레드 안전)
+from collections import OrderedDict
+import os
+import threading
+import unicodedata
+
+from model import music as music_model
+from services import genre_ranking
+from services.cache import TTLCache
+
+GENRE_MAP = {
+    "k-pop": "K-Pop",
+    "korean pop": "K-Pop",
+    "dance pop": "Pop",
+    "pop": "Pop",
+    "hip hop": "Hip-Hop",
+    "hip-hop": "Hip-Hop",
+    "r&b": "R&B",
+    "jazz": "Jazz",
+    "electronic": "Electronic",
+    "edm": "Electronic",
+    "rock": "Rock",
+    "metal": "Metal",
+    "indie": "Indie",
+}
+
+# sp.artists()가 한 번에 받는 최대 ID 개수
+ARTISTS_BATCH_SIZE = 50
+
+# 로컬 검색 결과가 전체 이 개수(또는 요청 size) 이상이면 Spotify를 호출하지 않음
+LOCAL_SEARCH_MIN_RESULTS = int(os.getenv("LOCAL_SEARCH_MIN_RESULTS", 12))
+
+
+class ArtistGenreCache:
+    """artist_id → genre_no LRU 캐시 (장르 매핑이 없는 아티스트는 None으로 저장)"""
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, artist_ids):
+        """반환: ({artist_id: genre_no} 캐시에 있는 것, 캐시에 없는 artist_id 목록) (중복/빈 ID 제외)"""
+        resolved = {}
+        missing = []
+        with self._lock:
+            for artist_id in dict.fromkeys(a for a in artist_ids if a):
+                if artist_id in self._data:
+                    self._data.move_to_end(artist_id)
+                    resolved[artist_id] = self._data[artist_id]
+                else:
+                    missing.append(artist_id)
+        return resolved, missing
+
+    def set(self, artist_id, genre_no):
+        with self._lock:
+            self._data[artist_id] = genre_no
+            self._data.move_to_end(artist_id)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+artist_genre_cache = ArtistGenreCache(int(os.getenv("ARTIST_GENRE_CACHE_SIZE", 10000)))
+
+# /music/search 결과 캐시 (정규화된 검색어 + category + page + size 기준)
+search_cache = TTLCache(
+    max_size=int(os.getenv("SEARCH_CACHE_SIZE", 1000)),
+    ttl=int(os.getenv("SEARCH_CACHE_TTL", 60)),
+    stale_ttl=int(os.getenv("SEARCH_CACHE_STALE_TTL", 300)),
+)
+
+
+def genre_no_from_spotify_genres(spotify_genres):
+    """Spotify genres 목록 → 우리 DB genre_no"""
+    for g in spotify_genres or []:
+        key = (g or "").lower()
+        if key in GENRE_MAP:
+            genre_name = GENRE_MAP[key]
+            return music_model.find_genre_no_by_name(genre_name)
+
+    return None
+
+
+def cache_artist_genres(artists, chunk, resolved):
+    """
+    sp.artists() 결과 한 묶음을 캐시/결과에 반영
+    - 조회 실패한 아티스트(chunk에는 있는데 결과에 없음)는 캐시하지 않고 None (다음 요청에서 재시도)
+    """
+    for artist in artists:
+        if not artist or not artist.get("id"):
+            continue
+        genre_no = genre_no_from_spotify_genres(artist.get("genres"))
+        artist_genre_cache.set(artist["id"], genre_no)
+        resolved[artist["id"]] = genre_no
+
+    for artist_id in chunk:
+        resolved.setdefault(artist_id, None)
+
+
+def first_artist_id(track):
+    artists = (track or {}).get("artists") or []
+    return artists[0].get("id") if artists else None
+
+
+def track_spotify_url(track):
+    return (track or {}).get("external_urls", {}).get("spotify")
+
+
+def track_to_music(track, genre_no):
+    """Spotify track → music 테이블 row"""
+    artists = track.get("artists") or []
+    artist_name = artists[0].get("name") if artists else ""
+
+    album = track.get("album") or {}
+    images = album.get("images") or []
+    album_image_url = images[0].get("url") if images else None
+
+    return {
+        "track_name": track.get("name") or "",
+        "artist_name": artist_name,
+        "album_name": album.get("name") or "",
+        "album_image_url": album_image_url,
+        "duration_ms": track.get("duration_ms") or 0,
+        "popularity": track.get("popularity") or 0,
+        "spotify_url": track_spotify_url(track),
+        "spotify_track_id": track.get("id"),
+        "genre_no": genre_no,
+        "preview_url": track.get("preview_url")  # 30초 미리듣기 URL
+    }
+
+
+def filter_new_tracks(tracks, existing):
+    """DB에 없는 트랙 (spotify_url 기준 중복 제거, 순서 유지)"""
+    new_tracks = {}
+    for track in tracks:
+        spotify_url = track_spotify_url(track)
+        if spotify_url not in existing:
+            new_tracks.setdefault(spotify_url, track)
+    return list(new_tracks.values())
+
+
+def tracks_to_musics(new_tracks, artist_genres):
+    """반환: {spotify_url: music}"""
+    new_musics = {}
+    for track in new_tracks:
+        music = track_to_music(track, artist_genres.get(first_artist_id(track)))
+        new_musics[music["spotify_url"]] = music
+    return new_musics
+
+
+def saved_results(tracks, existing, saved, inserted):
+    """
+    트랙 순서대로 [(music, is_new), ...], 새로 저장된 곡은 장르 순위표에 반영
+    - saved: insert_music_bulk가 다시 조회한 행 (기존 곡과 같은 형태)
+    - 중복 확인 뒤 다른 요청이 먼저 저장한 곡(inserted에 없음)은 is_new=False
+    """
+    results = []
+    for track in tracks:
+        spotify_url = track_spotify_url(track)
+        if spotify_url in existing:
+            results.append((existing[spotify_url], False))
+        elif spotify_url in saved:
+            music = dict(saved[spotify_url])
+            is_new = spotify_url in inserted
+            if is_new:
+                genre_ranking.add(music)
+            results.append((music, is_new))
+    return results
+
+
+def with_is_new(saved):
+    musics = []
+    for music, is_new in saved:
+        music["is_new"] = is_new
+        musics.append(music)
+    return musics
+
+
+def normalize_keyword(keyword):
+    """검색어 정규화: Unicode NFC → casefold → 공백 정리 (한글 조합형/완성형 입력을 같은 키로)"""
+    keyword = unicodedata.normalize("NFC", keyword or "")
+    return " ".join(keyword.casefold().split())
+
+
+def spotify_search_query(keyword, category):
+    # category 처리(원하는 방식으로 확장 가능)
+    # - category=artist: artist 필드 중심으로 검색되게 쿼리 강화
+    if category == "artist":
+        return f"artist:{keyword}"
+    return keyword
+
+
+def use_local(total, size):
+    """
+    auto 모드의 검색 결과 출처 결정
+    - 현재 페이지 행 수가 아니라 전체 개수로 판단 (같은 검색어의 모든 페이지가 한 출처에서 나오도록)
+    """
+    return total >= min(size, LOCAL_SEARCH_MIN_RESULTS)
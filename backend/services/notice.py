@@ -41,6 +41,15 @@ def get_notice_list():
     except Exception as e:
         return None, str(e)
 
+# 공지사항 리스트 스트리밍 (한 행씩 날짜 변환해서 넘김)
+def iter_notice_list():
+    for n in notice_model.iter_all_with_user():
+        if n.get('created_at'):
+            n['created_at'] = n['created_at'].isoformat() if hasattr(n['created_at'], 'isoformat') else str(n['created_at'])
+        if n.get('updated_at'):
+            n['updated_at'] = n['updated_at'].isoformat() if hasattr(n['updated_at'], 'isoformat') else str(n['updated_at'])
+        yield n
+
 # 공지사항 상세 조회
 def get_notice_detail(notice_no):
     try:
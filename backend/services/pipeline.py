@@ -0,0 +1,75 @@
+import queue
+import threading
+
+_DONE = object()
+
+
+def run_pipeline(items, stages, queue_size=4):
+    """
+    items를 stages에 차례로 통과시키는 스레드 파이프라인
+    - stages: [(func, workers), ...] 각 단계는 workers개 스레드로 동시에 처리
+    - 단계 사이는 크기 queue_size인 Queue로 연결 (가득 차면 앞 단계가 대기 → backpressure)
+    - 반환: 마지막 단계 결과 목록 (입력 순서 유지)
+    - 한 단계에서 예외가 나면 남은 작업을 건너뛰고 그 예외를 다시 발생
+    """
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+    stop = threading.Event()
+    errors = []
+
+    def feed():
+        for index, item in enumerate(items):
+            if stop.is_set():
+                break
+            queues[0].put((index, item))
+        for _ in range(stages[0][1]):
+            queues[0].put(_DONE)
+
+    def make_worker(stage_no, func):
+        q_in, q_out = queues[stage_no], queues[stage_no + 1]
+        next_workers = stages[stage_no + 1][1] if stage_no + 1 < len(stages) else 1
+
+        def work():
+            while True:
+                entry = q_in.get()
+                if entry is _DONE:
+                    break
+                if stop.is_set():
+                    continue  # 에러 이후에는 큐만 비워서 앞 단계가 막히지 않게 함
+                index, item = entry
+                try:
+                    q_out.put((index, func(item)))
+                except Exception as e:
+                    errors.append(e)
+                    stop.set()
+
+            with finish_lock:
+                remaining[stage_no] -= 1
+                if remaining[stage_no] == 0:
+                    for _ in range(next_workers):
+                        q_out.put(_DONE)
+        return work
+
+    finish_lock = threading.Lock()
+    remaining = [workers for _, workers in stages]
+
+    threads = [threading.Thread(target=feed, daemon=True)]
+    for stage_no, (func, workers) in enumerate(stages):
+        for _ in range(workers):
+            threads.append(threading.Thread(target=make_worker(stage_no, func), daemon=True))
+    for t in threads:
+        t.start()
+
+    results = {}
+    while True:
+        entry = queues[-1].get()
+        if entry is _DONE:
+            break
+        index, result = entry
+        results[index] = result
+
+    for t in threads:
+        t.join()
+
+    if errors:
+        raise errors[0]
+    return [results[i] for i in sorted(results)]
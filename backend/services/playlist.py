@@ -60,6 +60,16 @@ def get_playlist_list():
         return None, str(e)
 
 
+def iter_playlist_list():
+    """전체 플레이리스트 목록 스트리밍 (한 행씩 날짜 변환해서 넘김)"""
+    for p in playlist_model.iter_all_with_user():
+        if p.get('created_at'):
+            p['created_at'] = p['created_at'].isoformat() if hasattr(p['created_at'], 'isoformat') else str(p['created_at'])
+        if p.get('updated_at'):
+            p['updated_at'] = p['updated_at'].isoformat() if hasattr(p['updated_at'], 'isoformat') else str(p['updated_at'])
+        yield p
+
+
 def get_user_playlist_list(user_no: int):
     """특정 유저의 플레이리스트 목록 조회"""
     try:
@@ -0,0 +1,134 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import os
+
+from model import music as music_model
+from model import popularity_refresh as refresh_model
+from services.spotify import get_spotify_client, BACKGROUND
+from services import genre_ranking
+
+# sp.tracks()가 한 번에 받는 최대 ID 개수
+TRACKS_BATCH_SIZE = 50
+
+# 주기 실행 간격(초), 0이면 요청할 때만 실행
+POPULARITY_REFRESH_INTERVAL = int(os.getenv("POPULARITY_REFRESH_INTERVAL", 0))
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="popularity-refresh")
+_scheduler = None
+
+
+def _track_id(row):
+    """spotify_track_id가 없는 예전 행은 spotify_url(.../track/<id>)에서 추출"""
+    if row.get("spotify_track_id"):
+        return row["spotify_track_id"]
+    url = (row.get("spotify_url") or "").split("?")[0].rstrip("/")
+    if "/track/" not in url:
+        return None
+    return url.rsplit("/", 1)[-1] or None
+
+
+def _refresh_batch(sp, rows):
+    """
+    묶음 하나 갱신: Spotify에서 인기도 조회 → 바뀐 곡만 UPDATE 한 번
+    - 반환: 바뀐 행 수
+    """
+    by_track_id = {}
+    for row in rows:
+        track_id = _track_id(row)
+        if track_id:
+            by_track_id.setdefault(track_id, []).append(row)
+    if not by_track_id:
+        return 0
+
+    result = sp.tracks(list(by_track_id), market="KR")
+    changes = []
+    for track in result.get("tracks") or []:
+        # 삭제된 트랙은 None으로 옴
+        if not track:
+            continue
+        popularity = track.get("popularity")
+        # market 지정 시 다른 지역 트랙으로 연결(relink)되면 요청한 ID는 linked_from.id에 있음
+        track_id = (track.get("linked_from") or {}).get("id") or track.get("id")
+        for row in by_track_id.get(track_id, []):
+            if popularity is not None and popularity != row["popularity"]:
+                changes.append((row, popularity))
+
+    if not changes:
+        return 0
+
+    changed = music_model.update_popularity_bulk(
+        [(row["music_no"], popularity) for row, popularity in changes]
+    )
+    for row, popularity in changes:
+        genre_ranking.update_popularity(row["music_no"], row["genre_no"], popularity)
+    return changed
+
+
+def refresh_popularity(resume=True, max_batches=None):
+    """
+    music 테이블 전체 인기도 갱신
+    - music_no 순서로 50곡씩 sp.tracks() 조회 (BACKGROUND 우선순위로 요청 한도 공유)
+    - 묶음마다 체크포인트 저장 → 중단되면 다음 실행이 이어서 처리
+    - max_batches: 이번 실행에서 처리할 최대 묶음 수 (끝나지 않으면 'paused'로 남기고 다음 실행이 이어서 처리)
+    - 반환: (run, error), 다른 곳에서 실행 중이면 error
+    """
+    try:
+        run = refresh_model.claim_run(resume)
+    except Exception as e:
+        return None, str(e)
+    if run is None:
+        return None, "인기도 갱신이 이미 실행 중입니다."
+
+    run_id = run["run_id"]
+    after = run["last_music_no"]
+    batches = 0
+    try:
+        sp = get_spotify_client(BACKGROUND)
+        while max_batches is None or batches < max_batches:
+            rows = music_model.find_batch_after(after, TRACKS_BATCH_SIZE)
+            if not rows:
+                break
+            changed = _refresh_batch(sp, rows)
+            after = rows[-1]["music_no"]
+            refresh_model.save_checkpoint(run_id, after, len(rows), changed)
+            batches += 1
+        else:
+            refresh_model.finish_run(run_id, "paused")
+            return refresh_model.find_by_run_id(run_id), None
+
+        refresh_model.finish_run(run_id, "done")
+        run = refresh_model.find_by_run_id(run_id)
+        print(f"✅ 인기도 갱신 완료: {run['scanned']}곡 중 {run['changed']}곡 변경")
+        return run, None
+    except Exception as e:
+        refresh_model.finish_run(run_id, "failed", str(e))
+        print(f"❌ 인기도 갱신 실패 (music_no {after}까지 반영): {e}")
+        return refresh_model.find_by_run_id(run_id), str(e)
+
+
+def submit_refresh(resume=True):
+    """인기도 갱신을 백그라운드로 실행, 반환: (run 목록, error)"""
+    _executor.submit(refresh_popularity, resume)
+    return get_runs()
+
+
+def get_runs(limit=10):
+    try:
+        return refresh_model.find_recent(limit), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _scheduler_loop():
+    while True:
+        time.sleep(POPULARITY_REFRESH_INTERVAL)
+        refresh_popularity()
+
+
+def start_scheduler():
+    """POPULARITY_REFRESH_INTERVAL마다 인기도 갱신 (0이면 시작하지 않음)"""
+    global _scheduler
+    if POPULARITY_REFRESH_INTERVAL > 0 and _scheduler is None:
+        _scheduler = threading.Thread(target=_scheduler_loop, daemon=True)
+        _scheduler.start()
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    같은 key로 동시에 들어온 호출을 하나로 합침
+    - 처음 호출한 스레드만 fn을 실행하고, 나머지는 끝날 때까지 기다렸다가 같은 결과(또는 예외)를 받음
+    - 결과를 저장하지는 않음 (끝난 뒤 들어온 호출은 다시 실행)
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        return self.do_shared(key, fn)[0]
+
+    def do_shared(self, key, fn):
+        """
+        반환: (value, shared)
+        - shared=True: 다른 호출이 실행한 결과를 받음 (이 호출이 직접 저장한 것이 아님)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = fn()
+            return call.value, False
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight의 asyncio 버전 (같은 이벤트 루프 안의 코루틴끼리 합침)
+    - fn은 인자 없이 코루틴을 반환하는 함수
+    - 기다리던 쪽이 취소되어도 실행 중인 작업은 취소하지 않음
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, fn):
+        return (await self.do_shared(key, fn))[0]
+
+    async def do_shared(self, key, fn):
+        """반환: (value, shared), SingleFlight.do_shared와 같음"""
+        task = self._calls.get(key)
+        shared = task is not None and not task.done()
+        if not shared:
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def in_flight(self):
+        return len(self._calls)
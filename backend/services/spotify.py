@@ -0,0 +1,365 @@
+import heapq
+import itertools
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from spotipy import Spotify
+from spotipy.cache_handler import CacheFileHandler
+from spotipy.exceptions import SpotifyException
+from spotipy.oauth2 import SpotifyClientCredentials
+from urllib3.util.retry import Retry
+
+try:
+    import fcntl
+except ImportError:  # Windows: 파일 백엔드 미지원
+    fcntl = None
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 토큰 파일 캐시 (같은 서버의 워커끼리 토큰 공유)
+TOKEN_CACHE_PATH = os.getenv("SPOTIFY_TOKEN_CACHE", os.path.join(BASE_DIR, ".cache"))
+# 만료 몇 초 전에 토큰을 미리 갱신할지
+TOKEN_REFRESH_MARGIN = int(os.getenv("SPOTIFY_TOKEN_REFRESH_MARGIN", 300))
+# keep-alive 커넥션 풀 크기
+HTTP_POOL_SIZE = int(os.getenv("SPOTIFY_HTTP_POOL_SIZE", 20))
+REQUESTS_TIMEOUT = int(os.getenv("SPOTIFY_REQUESTS_TIMEOUT", 5))
+# Spotify 대체 서버 주소 (fake_spotify.py 등, 없으면 실제 Spotify)
+API_URL = os.getenv("SPOTIFY_API_URL")
+TOKEN_URL = os.getenv("SPOTIFY_TOKEN_URL")
+
+# 요청 한도 (token bucket): 초당 요청 수 / 순간 최대 요청 수
+RATE_LIMIT = float(os.getenv("SPOTIFY_RATE_LIMIT", 10))
+RATE_BURST = int(os.getenv("SPOTIFY_RATE_BURST", 20))
+# 백그라운드 작업이 남겨둘 토큰 수 (다른 워커의 검색 요청용)
+RATE_INTERACTIVE_RESERVE = int(os.getenv("SPOTIFY_RATE_INTERACTIVE_RESERVE", 2))
+# memory: 워커별 한도 / file: 같은 서버의 워커끼리 한도 공유
+RATE_LIMIT_BACKEND = os.getenv("SPOTIFY_RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_FILE = os.getenv("SPOTIFY_RATE_LIMIT_FILE", os.path.join(BASE_DIR, ".spotify_rate_limit"))
+# 토큰을 기다리는 최대 시간(초) / 429 재시도 횟수 / 재시도 간격 기준(초)
+RATE_MAX_WAIT = float(os.getenv("SPOTIFY_RATE_MAX_WAIT", 30))
+RATE_MAX_RETRIES = int(os.getenv("SPOTIFY_RATE_MAX_RETRIES", 3))
+RATE_BACKOFF = float(os.getenv("SPOTIFY_RATE_BACKOFF", 1))
+
+# 요청 우선순위 (작을수록 먼저)
+INTERACTIVE = 0
+BACKGROUND = 1
+
+RATE_LIMITED_MESSAGE = "Spotify 요청 한도를 초과했습니다. 잠시 후 다시 시도해주세요."
+
+_clients = {}
+_client_lock = threading.Lock()
+
+
+class SpotifyRateLimited(Exception):
+    """토큰 대기 시간 초과 또는 429 재시도 횟수 초과"""
+
+    def __init__(self):
+        super().__init__(RATE_LIMITED_MESSAGE)
+
+
+class MemoryBucket:
+    """워커 메모리 token bucket"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._state = {"tokens": burst, "updated_at": time.time(), "blocked_until": 0}
+
+    def _update(self, fn):
+        return fn(self._state)
+
+    def try_acquire(self, reserve=0):
+        """토큰 1개 사용, 반환: 0(성공) 또는 다시 시도할 때까지 기다릴 시간(초)"""
+        def acquire(state):
+            now = time.time()
+            state["tokens"] = min(self.burst, state["tokens"] + (now - state["updated_at"]) * self.rate)
+            state["updated_at"] = now
+            if now < state["blocked_until"]:
+                return state["blocked_until"] - now
+            if state["tokens"] - 1 >= reserve:
+                state["tokens"] -= 1
+                return 0
+            return (1 + reserve - state["tokens"]) / self.rate
+        return self._update(acquire)
+
+    def block_until(self, until):
+        """Retry-After 동안 모든 요청 중지"""
+        def block(state):
+            state["blocked_until"] = max(state["blocked_until"], until)
+        self._update(block)
+
+    def stats(self):
+        def read(state):
+            return {
+                "tokens": round(state["tokens"], 2),
+                "blocked_for": round(max(state["blocked_until"] - time.time(), 0), 2),
+            }
+        return self._update(read)
+
+
+class FileBucket(MemoryBucket):
+    """파일 잠금(flock)으로 같은 서버의 워커끼리 공유하는 token bucket"""
+
+    def __init__(self, rate, burst, path):
+        super().__init__(rate, burst)
+        self.path = path
+
+    def _update(self, fn):
+        with open(self.path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                state = json.loads(raw) if raw else dict(self._state)
+                result = fn(state)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+                return result
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class RateLimiter:
+    """
+    Spotify 호출 공통 대기열
+    - 우선순위(INTERACTIVE > BACKGROUND) → 도착 순으로 토큰 배정
+    - BACKGROUND는 토큰을 RATE_INTERACTIVE_RESERVE개 남겨두고 사용
+    """
+
+    def __init__(self, bucket, reserve=0):
+        self.bucket = bucket
+        self.reserve = min(reserve, max(bucket.burst - 1, 0))
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._seq = itertools.count()
+
+    def acquire(self, priority=INTERACTIVE, timeout=RATE_MAX_WAIT):
+        ticket = (priority, next(self._seq))
+        reserve = self.reserve if priority == BACKGROUND else 0
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            self._cond.notify_all()
+            try:
+                while True:
+                    wait = None
+                    if self._waiting[0] == ticket:
+                        wait = self.bucket.try_acquire(reserve)
+                        if wait <= 0:
+                            return
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise SpotifyRateLimited()
+                    self._cond.wait(remaining if wait is None else min(wait, remaining))
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+    def try_acquire(self, priority=INTERACTIVE):
+        """기다리는 요청이 없고 남은 토큰이 있으면 바로 받음 (기다리지 않음), 반환: 성공 여부"""
+        reserve = self.reserve if priority == BACKGROUND else 0
+        with self._cond:
+            if self._waiting:
+                return False
+            return self.bucket.try_acquire(reserve) <= 0
+
+    def block_until(self, until):
+        self.bucket.block_until(until)
+
+    def stats(self):
+        with self._cond:
+            queued = {
+                "interactive": sum(1 for p, _ in self._waiting if p == INTERACTIVE),
+                "background": sum(1 for p, _ in self._waiting if p == BACKGROUND),
+            }
+        return dict(self.bucket.stats(), queued=queued, backend=type(self.bucket).__name__)
+
+
+def _build_rate_limiter():
+    if RATE_LIMIT_BACKEND == "file" and fcntl is not None:
+        bucket = FileBucket(RATE_LIMIT, RATE_BURST, RATE_LIMIT_FILE)
+    else:
+        if RATE_LIMIT_BACKEND == "file":
+            print("❌ 파일 기반 요청 한도는 이 OS에서 지원하지 않아 워커별 한도를 사용합니다.")
+        bucket = MemoryBucket(RATE_LIMIT, RATE_BURST)
+    return RateLimiter(bucket, RATE_INTERACTIVE_RESERVE)
+
+
+rate_limiter = _build_rate_limiter()
+
+
+def get_rate_limiter_stats():
+    """대기열 길이 / 남은 토큰 / Retry-After 남은 시간"""
+    return rate_limiter.stats()
+
+
+def _retry_after(e):
+    headers = getattr(e, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitedSpotify(Spotify):
+    """모든 API 호출 전에 rate_limiter 토큰을 받고, 429는 Retry-After만큼 쉬었다가 재시도"""
+
+    def __init__(self, *args, priority=INTERACTIVE, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.priority = priority
+
+    def _internal_call(self, method, url, payload, params):
+        for attempt in range(RATE_MAX_RETRIES + 1):
+            rate_limiter.acquire(self.priority)
+            try:
+                return super()._internal_call(method, url, payload, params)
+            except SpotifyException as e:
+                # 5xx 재시도가 끝난 경우에도 spotipy는 429("Max Retries", 응답 헤더 없음)를 올림 → 요청 한도 초과 아님
+                if e.http_status != 429 or not e.headers:
+                    raise
+                if attempt == RATE_MAX_RETRIES:
+                    raise SpotifyRateLimited() from e
+
+                backoff = RATE_BACKOFF * (2 ** attempt)
+                retry_after = _retry_after(e)
+                if retry_after:
+                    # Retry-After 동안 전체 요청 중지
+                    rate_limiter.block_until(time.time() + retry_after)
+                else:
+                    # Retry-After가 없으면 이 호출만 기다렸다가 재시도
+                    time.sleep(backoff)
+                # 호출마다 다른 지연(jitter)으로 몰림 방지
+                time.sleep(random.uniform(0, backoff))
+
+
+class RefreshAheadClientCredentials(SpotifyClientCredentials):
+    """
+    만료 refresh_margin초 전에 토큰을 미리 갱신하는 Client Credentials
+    - 토큰을 받을 때마다 갱신 타이머를 예약해서 요청 스레드가 토큰 발급을 기다리지 않게 함
+    - 파일 캐시에 다른 워커가 갱신한 토큰이 있으면 그대로 사용
+    """
+
+    def __init__(self, *args, refresh_margin=TOKEN_REFRESH_MARGIN, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.refresh_margin = refresh_margin
+        self._token_lock = threading.Lock()
+        self._timer = None
+        self._scheduled_expires_at = None
+        self._token_info = None
+
+    def is_token_expired(self, token_info):
+        return token_info["expires_at"] - time.time() < self.refresh_margin
+
+    def get_access_token(self, as_dict=True, check_cache=True):
+        with self._token_lock:
+            token_info = super().get_access_token(as_dict=True, check_cache=check_cache)
+            self._token_info = token_info
+            self._schedule_refresh(token_info)
+        return token_info if as_dict else token_info["access_token"]
+
+    def cached_access_token(self):
+        """메모리에 있는 토큰이 아직 유효하면 반환 (락/파일 캐시/네트워크 없음), 아니면 None"""
+        token_info = self._token_info
+        if token_info is None or self.is_token_expired(token_info):
+            return None
+        return token_info["access_token"]
+
+    def _schedule_refresh(self, token_info):
+        # 같은 토큰에 대해서는 타이머를 다시 만들지 않음
+        if token_info["expires_at"] == self._scheduled_expires_at:
+            return
+        self._scheduled_expires_at = token_info["expires_at"]
+        if self._timer is not None:
+            self._timer.cancel()
+        delay = max(token_info["expires_at"] - time.time() - self.refresh_margin, 1)
+        self._timer = threading.Timer(delay, self._refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh(self):
+        try:
+            self.get_access_token()
+        except Exception as e:
+            print(f"  ❌ Spotify 토큰 갱신 실패: {e}")
+
+
+def _build_session():
+    """keep-alive 커넥션 풀을 가진 requests 세션 (5xx는 spotipy 기본 재시도 정책 유지)"""
+    retry = Retry(
+        total=3,
+        connect=None,
+        read=False,
+        allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE"]),
+        status=3,
+        backoff_factor=0.3,
+        # 429는 RateLimitedSpotify에서 Retry-After를 보고 재시도
+        status_forcelist=(500, 502, 503, 504),
+        respect_retry_after_header=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _get_credentials():
+    # SPOTIPY_* (spotipy 기본) / SPOTIFY_* (기존 app.py, seed_music.py) 둘 다 지원
+    client_id = os.getenv("SPOTIPY_CLIENT_ID") or os.getenv("SPOTIFY_CLIENT_ID")
+    client_secret = os.getenv("SPOTIPY_CLIENT_SECRET") or os.getenv("SPOTIFY_CLIENT_SECRET")
+    return client_id, client_secret
+
+
+def is_configured():
+    client_id, client_secret = _get_credentials()
+    return bool(client_id and client_secret)
+
+
+def get_spotify_client(priority=INTERACTIVE):
+    """
+    프로세스(워커)당 하나의 Spotify 클라이언트 반환
+    - priority: INTERACTIVE(사용자 요청) / BACKGROUND(가져오기, 스케줄러 등)
+    - 우선순위별 클라이언트는 HTTP 세션과 토큰을 공유
+    """
+    client = _clients.get(priority)
+    if client is not None:
+        return client
+
+    with _client_lock:
+        if not _clients:
+            client_id, client_secret = _get_credentials()
+            if not client_id or not client_secret:
+                raise RuntimeError("Spotify 환경변수(SPOTIPY_CLIENT_ID/SECRET)가 설정되지 않았습니다.")
+
+            session = _build_session()
+            auth_manager = RefreshAheadClientCredentials(
+                client_id=client_id,
+                client_secret=client_secret,
+                requests_session=session,
+                cache_handler=CacheFileHandler(cache_path=TOKEN_CACHE_PATH),
+            )
+            if TOKEN_URL:
+                auth_manager.OAUTH_TOKEN_URL = TOKEN_URL
+            for p in (INTERACTIVE, BACKGROUND):
+                _clients[p] = RateLimitedSpotify(
+                    auth_manager=auth_manager,
+                    requests_session=session,
+                    requests_timeout=REQUESTS_TIMEOUT,
+                    priority=p,
+                )
+                if API_URL:
+                    _clients[p].prefix = API_URL
+    return _clients[priority]
@@ -0,0 +1,144 @@
+# services.spotify의 async 버전 (httpx, 선택 설치: requirements-async.txt)
+# - ASGI 모드(asgi.py)의 async 엔드포인트에서 사용
+# - 토큰(RefreshAheadClientCredentials)과 요청 한도(rate_limiter)는 동기 클라이언트와 공유
+# - 응답은 spotipy와 같은 dict, 오류도 같은 SpotifyException / SpotifyRateLimited
+import asyncio
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from spotipy.exceptions import SpotifyException
+
+from services.spotify import (
+    API_URL, HTTP_POOL_SIZE, INTERACTIVE, RATE_BACKOFF, RATE_MAX_RETRIES, REQUESTS_TIMEOUT,
+    SpotifyRateLimited, get_spotify_client, rate_limiter, _retry_after,
+)
+
+try:
+    import httpx
+except ImportError:  # 동기 모드만 사용
+    httpx = None
+
+DEFAULT_API_URL = "https://api.spotify.com/v1/"
+
+# 5xx 재시도 (동기 클라이언트의 urllib3 Retry와 같은 횟수/간격)
+SERVER_ERROR_STATUSES = (500, 502, 503, 504)
+SERVER_ERROR_RETRIES = 3
+SERVER_ERROR_BACKOFF = 0.3
+
+# 요청 한도 대기 / 토큰 발급처럼 스레드에서 기다려야 하는 작업 전용 스레드 수
+# (기본 executor를 쓰면 대기가 길어질 때 다른 to_thread 작업까지 밀림)
+LIMITER_THREADS = int(os.getenv("SPOTIFY_ASYNC_LIMITER_THREADS", 8))
+
+_http = None
+_clients = {}
+_executor = ThreadPoolExecutor(max_workers=LIMITER_THREADS, thread_name_prefix="spotify-async")
+
+
+def is_available():
+    return httpx is not None
+
+
+async def _run_blocking(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+
+
+async def _acquire(priority):
+    # 대기열(우선순위 → 도착 순)은 스레드 기반이라 바로 못 받을 때만 전용 스레드에서 기다림
+    if not rate_limiter.try_acquire(priority):
+        await _run_blocking(rate_limiter.acquire, priority)
+
+
+class AsyncSpotify:
+    """spotipy.Spotify에서 검색에 쓰는 API만 async로 (search, artists)"""
+
+    def __init__(self, http, auth_manager, priority=INTERACTIVE, prefix=None):
+        self._http = http
+        self._auth_manager = auth_manager
+        self.priority = priority
+        self.prefix = prefix or DEFAULT_API_URL
+
+    async def _token(self):
+        # 보통은 미리 갱신된 메모리 토큰을 바로 사용, 없거나 만료된 경우만 발급 요청(동기)을 스레드에서 실행
+        cached_access_token = getattr(self._auth_manager, "cached_access_token", None)
+        token = cached_access_token() if cached_access_token else None
+        if token:
+            return token
+        return await _run_blocking(self._auth_manager.get_access_token, False)
+
+    async def _get(self, path, params=None):
+        url = self.prefix + path
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+
+        for attempt in range(max(RATE_MAX_RETRIES, SERVER_ERROR_RETRIES) + 1):
+            await _acquire(self.priority)
+            response = await self._http.get(
+                url, params=params, headers={"Authorization": f"Bearer {await self._token()}"}
+            )
+
+            if response.status_code == 429:
+                if attempt >= RATE_MAX_RETRIES:
+                    raise SpotifyRateLimited()
+                backoff = RATE_BACKOFF * (2 ** attempt)
+                retry_after = _retry_after(response)
+                if retry_after:
+                    # Retry-After 동안 전체 요청 중지
+                    rate_limiter.block_until(time.time() + retry_after)
+                else:
+                    # Retry-After가 없으면 이 호출만 기다렸다가 재시도
+                    await asyncio.sleep(backoff)
+                # 호출마다 다른 지연(jitter)으로 몰림 방지
+                await asyncio.sleep(random.uniform(0, backoff))
+                continue
+            if response.status_code in SERVER_ERROR_STATUSES and attempt < SERVER_ERROR_RETRIES:
+                await asyncio.sleep(SERVER_ERROR_BACKOFF * (2 ** attempt))
+                continue
+            if response.status_code >= 400:
+                try:
+                    message = response.json()["error"]["message"]
+                except Exception:
+                    message = "error"
+                raise SpotifyException(
+                    response.status_code, -1, f"{response.url}:\n {message}", headers=dict(response.headers)
+                )
+            return response.json() if response.content else None
+
+    async def search(self, q, limit=10, offset=0, type="track", market=None):
+        return await self._get("search", {"q": q, "limit": limit, "offset": offset, "type": type, "market": market})
+
+    async def artists(self, artists):
+        return await self._get("artists", {"ids": ",".join(artists)})
+
+
+def get_async_spotify_client(priority=INTERACTIVE):
+    """
+    이벤트 루프(ASGI 프로세스)당 하나의 async Spotify 클라이언트 반환
+    - 우선순위별 클라이언트는 httpx 커넥션 풀을 공유
+    """
+    global _http
+    client = _clients.get(priority)
+    if client is not None:
+        return client
+    if httpx is None:
+        raise RuntimeError("httpx가 설치되지 않았습니다. (pip install -r requirements-async.txt)")
+
+    if _http is None:
+        _http = httpx.AsyncClient(
+            timeout=REQUESTS_TIMEOUT,
+            limits=httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE),
+        )
+    # 토큰 발급/갱신은 동기 클라이언트의 auth_manager를 그대로 사용 (파일 캐시, 미리 갱신 공유)
+    client = _clients[priority] = AsyncSpotify(
+        _http, get_spotify_client(priority).auth_manager, priority, API_URL
+    )
+    return client
+
+
+async def aclose():
+    """ASGI 종료 시 httpx 커넥션 정리"""
+    global _http
+    _clients.clear()
+    if _http is not None:
+        await _http.aclose()
+        _http = None
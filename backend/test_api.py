@@ -14,9 +14,15 @@ import json
 
 load_dotenv()
 
+import db
+import query_stats
+
 # Flask 앱 생성
 app = Flask(__name__)
 
+# 요청 단위 트랜잭션 / 쿼리 수 집계 (app.py와 동일)
+db.init_app(app)
+
 # Blueprint 등록
 from routes.playlist import playlist_bp
 from routes.music_list import music_list_bp
@@ -193,6 +199,32 @@ def test_error_cases(playlist_no, user_no=1):
     )
 
 
+def test_query_counts(playlist_no, user_no=1):
+    """요청당 DB 쿼리 수 / 연결 수 확인 (늘어나면 N+1 회귀)"""
+    print_header("🔢 쿼리 수 테스트")
+
+    checks = [
+        ("플레이리스트 목록 조회", lambda: client.get('/playlist'), 1),
+        (f"음악 목록 조회 (playlist={playlist_no})", lambda: client.get(f'/playlist/{playlist_no}/music'), 1),
+        (f"음악 추가 (playlist={playlist_no}, music=2)", lambda: client.post(f'/playlist/{playlist_no}/music',
+            headers={'X-User-No': str(user_no)},
+            json={'music_no': 2}
+        ), 3),
+    ]
+
+    failed = 0
+    for title, call, max_queries in checks:
+        try:
+            with query_stats.assert_max_queries(max_queries, max_checkouts=1) as counter:
+                response = call()
+            print(f"✅ {title}: status={response.status_code},"
+                  f" queries={counter.queries}, checkouts={counter.checkouts}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {title}: {e}")
+    return failed == 0
+
+
 def cleanup(playlist_no, user_no=1):
     """테스트 데이터 정리"""
     print_header("🧹 테스트 데이터 정리")
@@ -230,9 +262,17 @@ def main():
         # 3. 에러 케이스 테스트
         test_error_cases(playlist_no, test_user_no)
         
-        # 4. 정리
+        # 4. 쿼리 수 테스트
+        queries_ok = test_query_counts(playlist_no, test_user_no)
+
+        # 5. 정리
         cleanup(playlist_no, test_user_no)
-        
+
+        # 쿼리 수 예산 초과는 CI에서 실패로 보이도록 종료 코드 1
+        if not queries_ok:
+            print("\n❌ 쿼리 수 테스트 실패")
+            sys.exit(1)
+
         print("\n" + "="*60)
         print("  ✅ 모든 테스트 완료!")
         print("="*60 + "\n")
@@ -241,6 +281,7 @@ def main():
         print(f"\n❌ 테스트 실패: {e}")
         import traceback
         traceback.print_exc()
+        sys.exit(1)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+"""
+DB / Spotify 없이 돌아가는 단위 테스트
+(캐시, 파이프라인, single-flight, 요청 한도, 커서, 시드 체크포인트)
+실행: python test_units.py
+"""
+
+import sys
+import io
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+import asyncio
+import itertools
+import os
+import tempfile
+import threading
+import time
+
+from services.cache import TTLCache
+from services.pipeline import run_pipeline
+from services.singleflight import SingleFlight, AsyncSingleFlight
+from services.spotify import MemoryBucket, RateLimiter, SpotifyRateLimited, INTERACTIVE, BACKGROUND
+from services import genre_ranking
+from services.music import _encode_cursor, _decode_cursor
+from seed_music import Checkpoint, genre_targets, SEARCH_QUERIES
+
+
+def test_ttl_cache_stale_while_revalidate():
+    cache = TTLCache(max_size=10, ttl=0.05, stale_ttl=0.2)
+    cache.set("k", 1)
+    assert cache.lookup("k") == (True, 1, False)
+
+    # ttl이 지나면 이전 값을 반환하고, 갱신은 한 곳에만 맡김
+    time.sleep(0.06)
+    assert cache.lookup("k") == (True, 1, True)
+    assert cache.lookup("k") == (True, 1, False)
+    cache.end_refresh("k")
+
+    # get_or_load: 오래된 값을 바로 반환하고 백그라운드에서 갱신
+    loaded = threading.Event()
+
+    def loader():
+        loaded.set()
+        return 2
+
+    assert cache.get_or_load("k", loader) == (1, True)
+    assert loaded.wait(1)
+    time.sleep(0.01)
+    assert cache.lookup("k") == (True, 2, False)
+
+    # ttl + stale_ttl이 지나면 만료 → 호출한 쪽에서 다시 로드
+    time.sleep(0.26)
+    assert cache.lookup("k") == (False, None, False)
+    assert cache.get_or_load("k", lambda: 3) == (3, False)
+
+
+def test_ttl_cache_lru():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.lookup("a")
+    cache.set("c", 3)
+    assert cache.lookup("b")[0] is False
+    assert cache.lookup("a")[1] == 1 and cache.lookup("c")[1] == 3
+
+
+def test_pipeline_order():
+    stages = [(lambda x: x * 2, 3), (lambda x: x + 1, 2)]
+    assert run_pipeline(range(20), stages) == [x * 2 + 1 for x in range(20)]
+
+
+def test_pipeline_error():
+    # 무한 입력이어도 에러가 나면 입력을 더 읽지 않고 그 예외를 다시 발생
+    def stage(x):
+        if x == 3:
+            raise ValueError("boom")
+        return x
+
+    try:
+        run_pipeline(itertools.count(), [(stage, 2), (lambda x: x, 1)], queue_size=2)
+    except ValueError as e:
+        assert str(e) == "boom"
+    else:
+        raise AssertionError("예외가 발생하지 않음")
+
+
+def test_pipeline_backpressure():
+    pulled = []
+    release = threading.Event()
+
+    def items():
+        for i in range(50):
+            pulled.append(i)
+            yield i
+
+    def slow(x):
+        release.wait(2)
+        return x
+
+    result = []
+    t = threading.Thread(target=lambda: result.append(run_pipeline(items(), [(slow, 1)], queue_size=2)))
+    t.start()
+    time.sleep(0.2)
+    # 작업 중 1 + 큐 2 + put에서 대기 중 1
+    assert len(pulled) <= 4, f"pulled={len(pulled)}"
+    release.set()
+    t.join(5)
+    assert result == [list(range(50))]
+
+
+def test_single_flight():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return "value"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do_shared("k", fn)))
+    leader.start()
+    assert started.wait(1)
+    followers = [threading.Thread(target=lambda: results.append(flight.do_shared("k", fn))) for _ in range(3)]
+    for t in followers:
+        t.start()
+    time.sleep(0.05)
+    assert flight.in_flight() == 1
+    release.set()
+    for t in [leader] + followers:
+        t.join(2)
+
+    assert len(calls) == 1
+    assert sorted(results, key=lambda r: r[1]) == [("value", False)] + [("value", True)] * 3
+    assert flight.in_flight() == 0
+
+    # 끝난 뒤 들어온 호출은 다시 실행
+    assert flight.do("k", lambda: "again") == "again"
+
+
+def test_single_flight_error():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fn():
+        started.set()
+        release.wait(2)
+        raise ValueError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("k", fn)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call)]
+    threads[0].start()
+    assert started.wait(1)
+    threads.append(threading.Thread(target=call))
+    threads[1].start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join(2)
+    assert len(errors) == 2 and errors[0] is errors[1]
+
+
+def test_async_single_flight():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def main():
+        return await asyncio.gather(*(flight.do_shared("k", fn) for _ in range(3)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert results == [("value", False), ("value", True), ("value", True)]
+    assert flight.in_flight() == 0
+
+
+def test_memory_bucket():
+    bucket = MemoryBucket(rate=10, burst=2)
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert 0 < bucket.try_acquire() <= 0.1
+
+    # Retry-After 동안은 토큰이 있어도 기다림
+    bucket = MemoryBucket(rate=10, burst=2)
+    bucket.block_until(time.time() + 0.5)
+    assert 0.4 < bucket.try_acquire() <= 0.5
+
+
+def test_rate_limiter_reserve():
+    limiter = RateLimiter(MemoryBucket(rate=0.001, burst=3), reserve=2)
+    # BACKGROUND는 2개를 남겨두고 사용, INTERACTIVE는 남은 토큰까지 사용
+    assert limiter.try_acquire(BACKGROUND)
+    assert not limiter.try_acquire(BACKGROUND)
+    assert limiter.try_acquire(INTERACTIVE)
+    assert limiter.try_acquire(INTERACTIVE)
+    assert not limiter.try_acquire(INTERACTIVE)
+
+    try:
+        limiter.acquire(INTERACTIVE, timeout=0.05)
+    except SpotifyRateLimited:
+        pass
+    else:
+        raise AssertionError("SpotifyRateLimited가 발생하지 않음")
+
+
+def test_rate_limiter_priority():
+    limiter = RateLimiter(MemoryBucket(rate=10, burst=1))
+    limiter.acquire(INTERACTIVE)
+
+    order = []
+
+    def acquire(priority, name):
+        limiter.acquire(priority, timeout=2)
+        order.append(name)
+
+    # 먼저 기다리던 BACKGROUND보다 나중에 온 INTERACTIVE가 먼저 토큰을 받음
+    background = threading.Thread(target=acquire, args=(BACKGROUND, "background"))
+    background.start()
+    time.sleep(0.02)
+    interactive = threading.Thread(target=acquire, args=(INTERACTIVE, "interactive"))
+    interactive.start()
+    background.join(3)
+    interactive.join(3)
+    assert order == ["interactive", "background"], order
+
+
+def test_cursor():
+    cursor = _encode_cursor({"popularity": 87, "music_no": 1234})
+    assert "=" not in cursor
+    assert _decode_cursor(cursor) == (87, 1234)
+    # popularity NULL은 0으로
+    assert _decode_cursor(_encode_cursor({"popularity": None, "music_no": 5})) == (0, 5)
+
+
+def test_genre_ranking():
+    genre_ranking.invalidate()
+    rows = [
+        {"music_no": 3, "genre_no": 1, "popularity": 90},
+        {"music_no": 2, "genre_no": 1, "popularity": 50},
+        {"music_no": 1, "genre_no": 1, "popularity": 50},
+    ]
+    genre_ranking._rankings[1] = {
+        "keys": [genre_ranking._sort_key(r) for r in rows],
+        "rows": rows,
+        "complete": True,
+        "dirty": False,
+        "loaded_at": time.monotonic(),
+    }
+    try:
+        # 요청 밖에서는 바로 반영
+        genre_ranking.add({"music_no": 4, "genre_no": 1, "popularity": 60})
+        assert [r["music_no"] for r in genre_ranking.page(1, limit=10)] == [3, 4, 2, 1]
+        assert [r["music_no"] for r in genre_ranking.page(1, after=(60, 4), limit=10)] == [2, 1]
+
+        genre_ranking.update_popularity(1, 1, 95)
+        assert [r["music_no"] for r in genre_ranking.page(1, limit=2)] == [1, 3]
+    finally:
+        genre_ranking.invalidate()
+
+
+def test_genre_targets():
+    assert genre_targets(70) == dict(SEARCH_QUERIES)
+    for target in (0, 3, 71, 100000):
+        targets = genre_targets(target)
+        assert sum(targets.values()) == target
+        assert list(targets) == [name for name, _ in SEARCH_QUERIES]
+    # 나머지는 앞 장르부터 1곡씩
+    assert genre_targets(3) == {"K-pop": 1, "Pop": 1, "Hip hop": 1, "R&B": 0, "Rock": 0, "Jazz": 0, "Electronic": 0}
+
+
+def test_checkpoint():
+    path = os.path.join(tempfile.mkdtemp(), "checkpoint.json")
+    checkpoint = Checkpoint(path)
+    assert checkpoint.get("Pop") == {"query_index": 0, "offset": 0, "inserted": 0}
+
+    progress = {"query_index": 2, "offset": 150, "inserted": 120}
+    checkpoint.save("Pop", progress)
+    progress["offset"] = 999  # 저장한 뒤 바뀌어도 영향 없음
+    assert checkpoint.get("Pop")["offset"] == 150
+
+    # 다시 실행하면 이어서, --fresh면 처음부터
+    assert Checkpoint(path).get("Pop") == {"query_index": 2, "offset": 150, "inserted": 120}
+    assert Checkpoint(path, fresh=True).get("Pop")["offset"] == 0
+    assert not os.path.exists(f"{path}.tmp")
+
+    # 경로 없음: 메모리에만 저장
+    checkpoint = Checkpoint(None)
+    checkpoint.save("Pop", progress)
+    assert checkpoint.get("Pop")["offset"] == 999
+
+
+TESTS = [
+    test_ttl_cache_stale_while_revalidate,
+    test_ttl_cache_lru,
+    test_pipeline_order,
+    test_pipeline_error,
+    test_pipeline_backpressure,
+    test_single_flight,
+    test_single_flight_error,
+    test_async_single_flight,
+    test_memory_bucket,
+    test_rate_limiter_reserve,
+    test_rate_limiter_priority,
+    test_cursor,
+    test_genre_ranking,
+    test_genre_targets,
+    test_checkpoint,
+]
+
+
+def main():
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {type(e).__name__} {e}")
+
+    if failed:
+        print(f"\n❌ {failed}개 테스트 실패")
+        sys.exit(1)
+    print("\n✅ 모든 테스트 통과")
+
+
+if __name__ == '__main__':
+    main()
@@ -47,11 +47,36 @@ export const searchMusic = async (
   }
 };
 
+// /music 한 번에 받을 곡 수 (서버 최대 MUSIC_PAGE_MAX_LIMIT)
+const MUSIC_PAGE_LIMIT = 100;
+
+// /music 목록은 페이지(cursor) 단위로 오므로 next가 없을 때까지 이어서 요청
+const fetchAllPages = async (endpoint: string): Promise<ApiResponse<Music[]>> => {
+  const musics: Music[] = [];
+  const separator = endpoint.includes('?') ? '&' : '?';
+  let cursor: string | null = null;
+
+  do {
+    let url = `${endpoint}${separator}limit=${MUSIC_PAGE_LIMIT}`;
+    if (cursor) {
+      url += `&cursor=${encodeURIComponent(cursor)}`;
+    }
+    const res = await authFetch(url);
+    const page: ApiResponse<Music[]> & { next?: string | null } = await res.json();
+    if (!page.success) {
+      return page;
+    }
+    musics.push(...(page.data || []));
+    cursor = page.next ?? null;
+  } while (cursor);
+
+  return { success: true, data: musics };
+};
+
 // 📚 전체 음악 조회
 export const getAllMusic = async (): Promise<ApiResponse<Music[]>> => {
   try {
-    const res = await authFetch('/music');
-    return await res.json();
+    return await fetchAllPages('/music');
   } catch (e) {
     return { success: false, message: '음악 목록 조회 실패' };
   }
@@ -62,10 +87,9 @@ export const getMusicByGenre = async (
   genre: string
 ): Promise<ApiResponse<Music[]>> => {
   try {
-    const res = await authFetch(
+    return await fetchAllPages(
       `/music?category=genre&value=${encodeURIComponent(genre)}`
     );
-    return await res.json();
   } catch (e) {
     return { success: false, message: '장르 검색 실패' };
   }